@@ -0,0 +1,57 @@
+"""
+Benchmark: validation cost relative to file-based generation.
+
+    python -m benchmarks.bench_validation --rows 10000000
+
+Generates ``rows`` synthetic rows from a small in-memory source table with
+the FileGenerator statistical path, then times DataValidator.validate_data
+on the result. Target: validation under 5% of generation time.
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.core.engine import SyntheticDataEngine
+
+
+def build_source(n: int = 5000, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "age": rng.integers(18, 80, n),
+        "score": rng.normal(70, 12, n).round(2),
+        "grade": rng.choice(["A", "B", "C", "D", "F"], n),
+        "active": rng.random(n) < 0.7,
+    })
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    args = parser.parse_args()
+
+    engine = SyntheticDataEngine()
+    source = build_source()
+    schema = engine.schema_inference.infer_from_data(source)
+    for name in schema:
+        schema[name]["constraints"] = {}
+    schema["age"]["constraints"] = {"min": 0, "max": 120}
+    schema["grade"]["constraints"] = {"length": 1}
+
+    start = time.perf_counter()
+    data = engine._generate_with_statistics(source, schema, args.rows)
+    gen_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    result = engine.validator.validate_data(data, schema)
+    val_seconds = time.perf_counter() - start
+
+    print(f"rows:        {args.rows:,}")
+    print(f"generation:  {gen_seconds:8.3f} s")
+    print(f"validation:  {val_seconds:8.3f} s  ({100 * val_seconds / gen_seconds:.2f}% of generation)")
+    print(f"valid:       {result.is_valid} {result.errors}")
+
+
+if __name__ == "__main__":
+    main()
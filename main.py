@@ -8,6 +8,25 @@ from src.generators.mimesis_generator import MimesisGenerator
 from src.exporters.csv_exporter import CSVExporter
 from src.exporters.json_exporter import JSONExporter
 from src.exporters.excel_exporter import ExcelExporter
+from src.exporters.parquet_exporter import ParquetExporter
+from src.exporters.database_exporter import DatabaseExporter
+from src.exporters.partitioned import PartitionedExporter
+from src.core.pipeline import Pipeline
+
+EXPORTERS = {"csv": CSVExporter, "json": JSONExporter, "excel": ExcelExporter, "parquet": ParquetExporter}
+
+
+def exporter_for(fmt: str, **kwargs):
+    # The pipeline (or the single frame) already overlaps work; no extra writer thread per exporter
+    return EXPORTERS[fmt](background=False, **kwargs)
+
+
+def run_pipelined(engine: SyntheticDataEngine, chunks, consume):
+    """Generate and export concurrently through a bounded queue; report the pipeline metrics."""
+    pipeline = Pipeline(engine.config.pipeline_queue_size)
+    result = pipeline.run(chunks, consume)
+    click.echo(f"⏱️  {pipeline.stats}")
+    return result
 
 
 @click.group()
@@ -20,14 +39,15 @@ def cli():
 @click.option("--rows", "-r", default=1000)
 @click.option("--output", "-o", default="output.csv")
 @click.option("--format", "output_format", default="csv",
-              type=click.Choice(["csv", "json", "excel"]))
+              type=click.Choice(["csv", "json", "excel", "parquet"]))
 def prompt_based(prompt: str, rows: int, output: str, output_format: str):
     engine = SyntheticDataEngine()
     engine.register_generator("mimesis", MimesisGenerator())
-    exporter = {"csv": CSVExporter(), "json": JSONExporter(), "excel": ExcelExporter()}[output_format]
-    data = engine.generate_from_prompt(prompt, rows, output_format)
-    exporter.export(data, output)
-    click.echo(f"✅  Generated {rows} rows → {output}")
+    schema = engine.schema_inference.infer_from_field_list(prompt)
+    chunks = engine.generate_chunks(schema, rows, validate=engine.config.post_validate)
+    exporter = exporter_for(output_format)
+    written = run_pipelined(engine, chunks, lambda stream: exporter.export(stream, output))
+    click.echo(f"✅  Generated {written} rows → {output}")
 
 
 @cli.command()
@@ -35,14 +55,33 @@ def prompt_based(prompt: str, rows: int, output: str, output_format: str):
 @click.option("--rows", "-r", default=1000)
 @click.option("--output", "-o", default="synthetic.csv")
 @click.option("--format", "output_format", default="csv",
-              type=click.Choice(["csv", "json", "excel"]))
+              type=click.Choice(["csv", "json", "excel", "parquet"]))
 @click.option("--preserve-stats/--no-preserve-stats", default=True)
-def file_based(file: str, rows: int, output: str, output_format: str, preserve_stats: bool):
+@click.option("--optimize-dtypes", is_flag=True, help="Narrow output columns to compact dtypes (uint8, float32, category...)")
+@click.option("--memory-report", is_flag=True, help="Print bytes saved per column by --optimize-dtypes")
+@click.option("--fidelity", is_flag=True, help="Print real-vs-synthetic fidelity metrics")
+@click.option("--fidelity-report", default=None, help="Write real-vs-synthetic fidelity metrics to this JSON file")
+@click.option("--privacy-check", is_flag=True, help="Report synthetic rows that copy or nearly copy real records")
+@click.option("--privacy-reject", is_flag=True, help="Regenerate synthetic rows that copy real records")
+def file_based(file: str, rows: int, output: str, output_format: str, preserve_stats: bool, optimize_dtypes: bool,
+               memory_report: bool, fidelity: bool, fidelity_report: str, privacy_check: bool, privacy_reject: bool):
     engine = SyntheticDataEngine()
+    engine.config.optimize_dtypes = optimize_dtypes
     engine.register_generator("mimesis", MimesisGenerator())
-    exporter = {"csv": CSVExporter(), "json": JSONExporter(), "excel": ExcelExporter()}[output_format]
-    data = engine.generate_from_file(file, rows, preserve_stats, output_format)
+    exporter = exporter_for(output_format)
+    data = engine.generate_from_file(file, rows, preserve_stats, output_format,
+                                     fidelity=fidelity or bool(fidelity_report),
+                                     privacy_check=privacy_check, privacy_reject=privacy_reject)
     exporter.export(data, output)
+    if memory_report:
+        for stage, report in engine.memory_reports.items():
+            click.echo(f"\n📉  Memory ({stage}):\n{report}")
+    if engine.last_privacy is not None:
+        click.echo(f"\n🔒  {engine.last_privacy}")
+    if engine.last_fidelity is not None:
+        click.echo(f"\n📊  {engine.last_fidelity}")
+        if fidelity_report:
+            Path(fidelity_report).write_text(json.dumps(engine.last_fidelity.to_dict(), indent=2))
     click.echo(f"✅  Generated {rows} rows → {output}")
 
 
@@ -57,7 +96,14 @@ def batch_generate(config_file: str):
     out_dir.mkdir(exist_ok=True)
     for i, (req, df) in enumerate(zip(cfg["requests"], results)):
         fmt = req.get("output_format", "csv")
-        exporter = {"csv": CSVExporter(), "json": JSONExporter(), "excel": ExcelExporter()}[fmt]
+        if fmt == "database":
+            # Engines are pooled per URL, so every job reuses the same connections
+            DatabaseExporter(req["database_url"], if_exists=req.get("if_exists", "replace"),
+                             batch_size=engine.config.db_batch_size,
+                             transaction_rows=engine.config.db_transaction_rows
+                             ).export(df, req.get("table", f"dataset_{i+1}"))
+            continue
+        exporter = exporter_for(fmt)
         exporter.export(df, out_dir / f"dataset_{i+1}.{fmt}")
     click.echo(f"✅  Batch complete → {out_dir}")
 
@@ -69,7 +115,18 @@ def batch_generate(config_file: str):
 @click.option("--schema", "-s", required=True, help="JSON schema file")
 @click.option("--rows", "-r", default=10)
 @click.option("--output", "-o", default="direct.csv")
-def from_schema(schema: str, rows: int, output: str):
+@click.option("--chunk-size", default=None, type=int, help="Rows generated and written per chunk")
+@click.option("--compression", default="infer", type=click.Choice(["infer", "none", "gzip", "zstd"]),
+              help="Output compression (inferred from a .gz/.zst suffix by default)")
+@click.option("--partition-by", multiple=True, help="Split output into <column>=<value>/ folders (repeatable)")
+@click.option("--max-rows-per-file", default=None, type=int, help="Split output into files of at most N rows")
+@click.option("--target-file-mb", default=None, type=float, help="Split output into files of roughly this size")
+@click.option("--partition-format", default="parquet", type=click.Choice(["csv", "json", "parquet"]),
+              help="File format when writing a partitioned directory")
+@click.option("--seed", default=None, type=int, help="Make the output reproducible")
+def from_schema(schema: str, rows: int, output: str, chunk_size: int, compression: str,
+                partition_by: tuple, max_rows_per_file: int, target_file_mb: float, partition_format: str,
+                seed: int):
     """Generate from explicit JSON schema."""
     engine = SyntheticDataEngine()
     engine.register_generator("mimesis", MimesisGenerator())
@@ -77,9 +134,51 @@ def from_schema(schema: str, rows: int, output: str):
     with open(schema) as f:
         schema_dict = json.load(f)
 
-    data = engine._generate_from_schema(schema_dict, rows)
-    data.to_csv(output, index=False)
-    click.echo(f"✅  Generated {rows} rows → {output}")
+    chunks = engine.generate_chunks(schema_dict, rows, chunk_size=chunk_size,
+                                    validate=engine.config.post_validate, seed=seed)
+    if partition_by or max_rows_per_file or target_file_mb:
+        exporter = PartitionedExporter(
+            partition_format,
+            partition_by=list(partition_by),
+            max_rows_per_file=max_rows_per_file,
+            target_file_bytes=int(target_file_mb * 2 ** 20) if target_file_mb else None,
+            max_open_files=engine.config.partition_max_open_files,
+            compression=None if compression in ("infer", "none") else compression,
+        )
+        manifest = run_pipelined(engine, chunks, lambda stream: exporter.export(stream, output))
+        click.echo(f"✅  Generated {manifest['total_rows']} rows → {len(manifest['files'])} files in {output}")
+        return
+    exporter = exporter_for("csv", compression=compression,
+                            compression_threads=engine.config.export_compression_threads,
+                            buffer_size=engine.config.export_buffer_size)
+    written = run_pipelined(engine, chunks, lambda stream: exporter.export(stream, output))
+    click.echo(f"✅  Generated {written} rows → {output}")
+
+@cli.command()
+@click.option("--schema", "-s", required=True, help="JSON schema file")
+@click.option("--rows", "-r", default=1000)
+@click.option("--url", "-u", required=True, help="SQLAlchemy database URL, e.g. sqlite:///seed.db")
+@click.option("--table", "-t", required=True)
+@click.option("--if-exists", default="fail", type=click.Choice(["fail", "replace", "append"]))
+@click.option("--chunk-size", default=None, type=int, help="Rows generated and inserted per chunk")
+@click.option("--seed", default=None, type=int, help="Make the output reproducible")
+def to_database(schema: str, rows: int, url: str, table: str, if_exists: str, chunk_size: int, seed: int):
+    """Generate from a JSON schema straight into a database table."""
+    engine = SyntheticDataEngine()
+    engine.register_generator("mimesis", MimesisGenerator())
+
+    with open(schema) as f:
+        schema_dict = json.load(f)
+
+    chunks = engine.generate_chunks(schema_dict, rows, chunk_size=chunk_size,
+                                    validate=engine.config.post_validate, seed=seed)
+    exporter = DatabaseExporter(url, schema=schema_dict, if_exists=if_exists,
+                                batch_size=engine.config.db_batch_size,
+                                transaction_rows=engine.config.db_transaction_rows,
+                                background=False)
+    written = run_pipelined(engine, chunks, lambda stream: exporter.export(stream, table))
+    click.echo(f"✅  Loaded {written} rows → {table} "
+               f"({exporter.last_stats['rows_per_second']:,.0f} rows/s)")
 
 @cli.command()
 def interactive():
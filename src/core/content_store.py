@@ -0,0 +1,271 @@
+"""
+Content-addressed file store for uploads, generated outputs and reports.
+
+Objects live under ``root/objects/<2 hex>/<key>``. Uploads and outputs are
+keyed by the SHA-256 of their content plus a suffix, so identical files are
+stored once and a re-upload finds the existing copy; derived objects (e.g.
+an EDA report of an upload) use a key built from their inputs' hashes.
+A SQLite index tracks sizes and last access. Objects idle for longer than
+``ttl_seconds`` are removed, and when the store exceeds ``max_bytes`` the
+least recently used objects are evicted. Files are written to a temporary
+name and renamed into place, so readers never see partial objects; objects
+pinned by a running request are never evicted. Aliases give stored objects
+additional names, e.g. the fingerprint of the request that produced them.
+"""
+import hashlib
+import os
+import re
+import shutil
+import sqlite3
+import tempfile
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Iterator, Optional, Union
+
+from .file_loader import file_digest, file_suffix
+from ..utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+_KEY = re.compile(r"[\w.\-]+")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS objects (
+    key TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS aliases (
+    name TEXT PRIMARY KEY,
+    key TEXT NOT NULL
+)
+"""
+
+
+class ContentStore:
+    """
+    Deduplicating file store with a disk quota and LRU/TTL eviction.
+
+    Args:
+        root: Store directory
+        max_bytes: Disk quota; least recently used objects are evicted above it
+        ttl_seconds: Objects not accessed for this long are removed (None: keep)
+        sweep_interval: Minimum seconds between TTL sweeps
+    """
+
+    def __init__(
+        self,
+        root: Union[str, Path],
+        max_bytes: int = 2 << 30,
+        ttl_seconds: Optional[float] = 7 * 24 * 3600,
+        sweep_interval: float = 60.0
+    ):
+        self.root = Path(root)
+        self.objects = self.root / 'objects'
+        self.tmp = self.root / 'tmp'
+        self.objects.mkdir(parents=True, exist_ok=True)
+        self.tmp.mkdir(parents=True, exist_ok=True)
+        # Leftovers of writes interrupted by a crash
+        for stale in self.tmp.iterdir():
+            stale.unlink(missing_ok=True)
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.sweep_interval = sweep_interval
+        self._db = sqlite3.connect(str(self.root / 'index.sqlite3'), check_same_thread=False)
+        self._lock = threading.RLock()
+        self._pins: Counter = Counter()
+        self._last_sweep = 0.0
+        with self._lock, self._db:
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.executescript(_SCHEMA)
+
+    @staticmethod
+    def content_key(digest: str, suffix: str = '') -> str:
+        return f"{digest}{suffix.lower()}"
+
+    def object_path(self, key: str) -> Path:
+        if not _KEY.fullmatch(key):
+            raise ValueError(f"Invalid store key: {key!r}")
+        return self.objects / key[:2] / key
+
+    # -- writing -----------------------------------------------------------
+
+    def put_stream(self, stream: BinaryIO, suffix: str = '', kind: str = 'upload',
+                   block_size: int = 1 << 20) -> str:
+        """Store a binary stream (e.g. an upload), hashing it while it is copied; returns its key."""
+        digest = hashlib.sha256()
+        fd, tmp_path = tempfile.mkstemp(dir=self.tmp)
+        try:
+            with os.fdopen(fd, 'wb') as out:
+                for block in iter(lambda: stream.read(block_size), b''):
+                    digest.update(block)
+                    out.write(block)
+            return self._commit(Path(tmp_path), self.content_key(digest.hexdigest(), suffix), kind)
+        finally:
+            Path(tmp_path).unlink(missing_ok=True)
+
+    def put_file(self, path: Union[str, Path], key: Optional[str] = None, kind: str = 'output') -> str:
+        """
+        Move a finished file into the store; returns its key.
+
+        Args:
+            path: File to move (removed from its old place)
+            key: Explicit key for derived objects; default is the content hash plus the file suffix
+            kind: Free-form label ('upload', 'output', 'report', ...)
+        """
+        path = Path(path)
+        if key is None:
+            key = self.content_key(file_digest(path), file_suffix(path))
+        try:
+            return self._commit(path, key, kind)
+        finally:
+            path.unlink(missing_ok=True)
+
+    def _commit(self, tmp_path: Path, key: str, kind: str) -> str:
+        target = self.object_path(key)
+        target.parent.mkdir(exist_ok=True)
+        now = time.time()
+        with self._lock:
+            if target.exists():
+                logger.info(f"Store hit for {key}; duplicate discarded")
+            else:
+                os.replace(tmp_path, target)
+            with self._db:
+                self._db.execute(
+                    "INSERT INTO objects (key, kind, size, created_at, accessed_at) VALUES (?, ?, ?, ?, ?) "
+                    "ON CONFLICT(key) DO UPDATE SET accessed_at = excluded.accessed_at",
+                    (key, kind, target.stat().st_size, now, now)
+                )
+            self.evict(keep=key)
+        return key
+
+    # -- reading -----------------------------------------------------------
+
+    def path(self, key: str) -> Optional[Path]:
+        """Path of a stored object (marking it recently used), or None if absent."""
+        target = self.object_path(key)
+        with self._lock:
+            if not target.exists():
+                self._forget(key)
+                return None
+            with self._db:
+                self._db.execute("UPDATE objects SET accessed_at = ? WHERE key = ?", (time.time(), key))
+        return target
+
+    def __contains__(self, key: str) -> bool:
+        return self.object_path(key).exists()
+
+    @contextmanager
+    def pinned(self, key: str) -> Iterator[Optional[Path]]:
+        """Path of ``key`` that is not evicted while the block runs (None if absent)."""
+        with self._lock:
+            self._pins[key] += 1
+        try:
+            yield self.path(key)
+        finally:
+            with self._lock:
+                self._pins[key] -= 1
+                if self._pins[key] <= 0:
+                    del self._pins[key]
+
+    def link(self, key: str, destination: Union[str, Path]) -> Path:
+        """
+        Hard-link (or copy, across filesystems) an object to ``destination``.
+        The link outlives eviction, e.g. for a queued job's input.
+        """
+        destination = Path(destination)
+        with self.pinned(key) as source:
+            if source is None:
+                raise FileNotFoundError(f"{key} is not in the store")
+            destination.parent.mkdir(parents=True, exist_ok=True)
+            try:
+                os.link(source, destination)
+            except OSError:
+                shutil.copyfile(source, destination)
+        return destination
+
+    # -- aliases -----------------------------------------------------------
+
+    def set_alias(self, name: str, key: str) -> None:
+        """Point ``name`` (e.g. a request fingerprint) at a stored object."""
+        with self._lock, self._db:
+            self._db.execute("INSERT OR REPLACE INTO aliases (name, key) VALUES (?, ?)", (name, key))
+
+    def resolve(self, name: str) -> Optional[str]:
+        """Key an alias points at, or None if unknown or the object was evicted."""
+        with self._lock:
+            row = self._db.execute("SELECT key FROM aliases WHERE name = ?", (name,)).fetchone()
+            if row is None:
+                return None
+            if row[0] not in self:
+                with self._db:
+                    self._db.execute("DELETE FROM aliases WHERE name = ?", (name,))
+                return None
+        return row[0]
+
+    # -- eviction ----------------------------------------------------------
+
+    def discard(self, key: str) -> bool:
+        """
+        Remove an object that its owner no longer needs; returns whether it was removed.
+
+        Objects that are pinned or still named by an alias are kept (eviction
+        will reclaim them once they are unused).
+        """
+        with self._lock:
+            if key in self._pins:
+                return False
+            if self._db.execute("SELECT 1 FROM aliases WHERE key = ? LIMIT 1", (key,)).fetchone():
+                return False
+            self._remove(key)
+        return True
+
+    def _forget(self, key: str) -> None:
+        with self._db:
+            self._db.execute("DELETE FROM objects WHERE key = ?", (key,))
+
+    def _remove(self, key: str) -> None:
+        self.object_path(key).unlink(missing_ok=True)
+        self._forget(key)
+
+    def total_bytes(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COALESCE(SUM(size), 0) FROM objects").fetchone()[0]
+
+    def evict(self, keep: Optional[str] = None) -> int:
+        """Remove expired objects, then least recently used ones until under quota; returns bytes freed."""
+        freed = 0
+        with self._lock:
+            now = time.time()
+            if self.ttl_seconds is not None and now - self._last_sweep >= self.sweep_interval:
+                self._last_sweep = now
+                expired = self._db.execute(
+                    "SELECT key, size FROM objects WHERE accessed_at < ?", (now - self.ttl_seconds,)
+                ).fetchall()
+                for key, size in expired:
+                    if key not in self._pins and key != keep:
+                        self._remove(key)
+                        freed += size
+            excess = self.total_bytes() - self.max_bytes
+            if excess > 0:
+                for key, size in self._db.execute("SELECT key, size FROM objects ORDER BY accessed_at").fetchall():
+                    if excess <= 0:
+                        break
+                    if key in self._pins or key == keep:
+                        continue
+                    self._remove(key)
+                    excess -= size
+                    freed += size
+        if freed:
+            logger.info(f"Evicted {freed:,} bytes from the store")
+        return freed
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            count, size = self._db.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM objects").fetchone()
+        return {'objects': count, 'bytes': size, 'max_bytes': self.max_bytes}
@@ -0,0 +1,456 @@
+"""
+Cross-column constraints declared in a schema.
+
+A schema may carry a ``"__constraints__"`` list next to its column specs:
+
+    "__constraints__": [
+        {"rule": "compare", "left": "ship_date", "op": ">=", "right": "order_date"},
+        {"rule": "formula", "column": "total", "expression": "price * quantity"},
+        {"rule": "conditional", "if": "status == 'Cancelled'",
+         "then": {"delivered_date": null}}
+    ]
+
+Rules are resolved with vectorized DataFrame operations. Columns are ordered
+topologically by their rule dependencies, and each rule runs once its inputs
+are final. Schemas come from untrusted clients, so expressions are not
+handed to ``DataFrame.eval``: they are parsed into a whitelisted AST (column
+names, literals, arithmetic, comparisons and boolean logic) and evaluated
+on the columns directly; anything else is rejected with a ValueError.
+Arithmetic only accepts numeric (or datetime) operands, and exponents must
+be small numeric literals, so no expression can build huge strings or numbers.
+"""
+import ast
+import operator
+import re
+from typing import Any, Callable, Dict, List, Optional, Set
+
+import numpy as np
+import pandas as pd
+
+from ..utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+CONSTRAINTS_KEY = "__constraints__"
+
+_BACKTICKED = re.compile(r"`([^`]+)`")
+_UNSET = object()
+_OPERATORS = {
+    '>=': np.greater_equal,
+    '>': np.greater,
+    '<=': np.less_equal,
+    '<': np.less,
+}
+_BINARY: Dict[type, Callable[[Any, Any], Any]] = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+    ast.FloorDiv: operator.floordiv,
+    ast.Mod: operator.mod,
+    ast.Pow: operator.pow,
+    ast.BitAnd: operator.and_,
+    ast.BitOr: operator.or_,
+}
+_UNARY: Dict[type, Callable[[Any], Any]] = {
+    ast.USub: operator.neg,
+    ast.UAdd: operator.pos,
+    ast.Not: operator.invert,
+    ast.Invert: operator.invert,
+}
+_COMPARE: Dict[type, Callable[[Any, Any], Any]] = {
+    ast.Eq: operator.eq,
+    ast.NotEq: operator.ne,
+    ast.Lt: operator.lt,
+    ast.LtE: operator.le,
+    ast.Gt: operator.gt,
+    ast.GtE: operator.ge,
+}
+_ARITHMETIC = (ast.Add, ast.Sub, ast.Mult, ast.Div, ast.FloorDiv, ast.Mod, ast.Pow)
+_MAX_EXPRESSION_LENGTH = 1000
+_MAX_EXPONENT = 16
+
+
+def column_specs(schema: Dict[str, Any]) -> Dict[str, Any]:
+    """Return the per-column specs of a schema without the constraint section."""
+    return {name: spec for name, spec in schema.items() if name != CONSTRAINTS_KEY}
+
+
+class Expression:
+    """
+    A rule expression restricted to a safe subset of pandas ``eval`` syntax.
+
+    Allowed: column names (bare, or in backticks when they are not
+    identifiers), numeric/string/boolean/None literals, ``+ - * / // % **``,
+    comparisons (chained too), ``and``/``or``/``not`` and ``& | ~``.
+    Attribute access, calls, subscripts, lambdas and every other construct
+    raise ValueError when the expression is parsed. Arithmetic takes numeric
+    literals and numeric/datetime columns only (string and object columns
+    raise ValueError when evaluated), and ``**`` needs a literal exponent of
+    at most 16 in absolute value.
+    """
+
+    def __init__(self, source: Any):
+        if not isinstance(source, str) or not source.strip():
+            raise ValueError(f"Expression must be a non-empty string: {source!r}")
+        if len(source) > _MAX_EXPRESSION_LENGTH:
+            raise ValueError(f"Expression longer than {_MAX_EXPRESSION_LENGTH} characters")
+        self.source = source
+        self._quoted: Dict[str, str] = {}
+
+        def placeholder(match: "re.Match") -> str:
+            name = f"__column_{len(self._quoted)}__"
+            self._quoted[name] = match.group(1)
+            return name
+
+        try:
+            self._tree = ast.parse(_BACKTICKED.sub(placeholder, source).strip(), mode='eval').body
+        except SyntaxError as e:
+            raise ValueError(f"Invalid expression {source!r}: {e.msg}") from None
+        self.names: Set[str] = set()
+        self._check(self._tree)
+
+    def _check(self, node: ast.AST) -> None:
+        if isinstance(node, ast.Name):
+            self.names.add(self._quoted.get(node.id, node.id))
+        elif isinstance(node, ast.Constant):
+            if not isinstance(node.value, (int, float, str, bool, type(None))):
+                self._reject(node)
+        elif isinstance(node, ast.BinOp) and type(node.op) in _BINARY:
+            if isinstance(node.op, _ARITHMETIC):
+                for operand in (node.left, node.right):
+                    if isinstance(operand, ast.Constant) and not isinstance(operand.value, (int, float)):
+                        raise ValueError(f"Arithmetic on a non-numeric literal in expression {self.source!r}")
+            if isinstance(node.op, ast.Pow):
+                exponent = _literal_number(node.right)
+                if exponent is None or abs(exponent) > _MAX_EXPONENT:
+                    raise ValueError(
+                        f"Exponent must be a numeric literal between -{_MAX_EXPONENT} and {_MAX_EXPONENT} in {self.source!r}"
+                    )
+            self._check(node.left)
+            self._check(node.right)
+        elif isinstance(node, ast.UnaryOp) and type(node.op) in _UNARY:
+            self._check(node.operand)
+        elif isinstance(node, ast.BoolOp):
+            for value in node.values:
+                self._check(value)
+        elif isinstance(node, ast.Compare) and all(type(op) in _COMPARE for op in node.ops):
+            for child in [node.left, *node.comparators]:
+                self._check(child)
+        else:
+            self._reject(node)
+
+    def _reject(self, node: ast.AST) -> None:
+        raise ValueError(f"Unsupported syntax in expression {self.source!r}: {type(node).__name__}")
+
+    def evaluate(self, data: pd.DataFrame) -> Any:
+        """Evaluate on ``data`` (a Series, or a scalar if no column is referenced)."""
+        return self._evaluate(self._tree, data)
+
+    def _evaluate(self, node: ast.AST, data: pd.DataFrame) -> Any:
+        if isinstance(node, ast.Name):
+            name = self._quoted.get(node.id, node.id)
+            if name not in data.columns:
+                raise ValueError(f"Unknown column {name!r} in expression {self.source!r}")
+            return data[name]
+        if isinstance(node, ast.Constant):
+            value = node.value
+            # NumPy scalars, so constant arithmetic cannot grow unbounded Python integers
+            if isinstance(value, (bool, str)) or value is None:
+                return value
+            if isinstance(value, int):
+                if not -2 ** 63 <= value < 2 ** 63:
+                    raise ValueError(f"Integer literal out of range in {self.source!r}")
+                return np.int64(value)
+            return np.float64(value)
+        if isinstance(node, ast.BinOp):
+            left, right = self._evaluate(node.left, data), self._evaluate(node.right, data)
+            if isinstance(node.op, _ARITHMETIC):
+                for operand in (left, right):
+                    self._require_numeric(operand)
+            return _BINARY[type(node.op)](left, right)
+        if isinstance(node, ast.UnaryOp):
+            operand = self._evaluate(node.operand, data)
+            if isinstance(node.op, (ast.USub, ast.UAdd)):
+                self._require_numeric(operand)
+            return _UNARY[type(node.op)](operand)
+        if isinstance(node, ast.BoolOp):
+            combine = operator.and_ if isinstance(node.op, ast.And) else operator.or_
+            result = self._evaluate(node.values[0], data)
+            for value in node.values[1:]:
+                result = combine(result, self._evaluate(value, data))
+            return result
+        # Compare: a < b < c means (a < b) & (b < c)
+        result = None
+        left = self._evaluate(node.left, data)
+        for op, comparator in zip(node.ops, node.comparators):
+            right = self._evaluate(comparator, data)
+            step = _COMPARE[type(op)](left, right)
+            result = step if result is None else result & step
+            left = right
+        return result
+
+    def _require_numeric(self, value: Any) -> None:
+        if isinstance(value, pd.Series):
+            dtype = value.dtype
+            if (pd.api.types.is_numeric_dtype(dtype) or pd.api.types.is_datetime64_any_dtype(dtype)
+                    or pd.api.types.is_timedelta64_dtype(dtype)):
+                return
+            raise ValueError(f"Arithmetic on non-numeric column {value.name!r} ({dtype}) in {self.source!r}")
+        if isinstance(value, str) or value is None:
+            raise ValueError(f"Arithmetic on a non-numeric value in expression {self.source!r}")
+
+    def __str__(self) -> str:
+        return self.source
+
+
+def _literal_number(node: ast.AST) -> Optional[float]:
+    """Value of a (signed) numeric literal node, or None for anything else."""
+    sign = 1
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.USub, ast.UAdd)):
+        sign = -1 if isinstance(node.op, ast.USub) else 1
+        node = node.operand
+    if isinstance(node, ast.Constant) and isinstance(node.value, (int, float)) and not isinstance(node.value, bool):
+        return sign * node.value
+    return None
+
+
+def _as_comparable(series: pd.Series):
+    """Return (values, restore) where values support ordering and restore converts back."""
+    if pd.api.types.is_numeric_dtype(series) or pd.api.types.is_datetime64_any_dtype(series):
+        return series, lambda values: values
+    parsed = pd.to_datetime(series, errors='coerce')
+    has_time = (parsed.dropna().dt.normalize() != parsed.dropna()).any()
+    fmt = "%Y-%m-%d %H:%M:%S" if has_time else "%Y-%m-%d"
+    return parsed, lambda values: values.dt.strftime(fmt).where(values.notna(), None)
+
+
+class CrossColumnRule:
+    """Base class for a rule that fixes ``target`` from other columns."""
+
+    def __init__(self, spec: Dict[str, Any], target: str):
+        self.spec = spec
+        self.target = target
+
+    def dependencies(self, known: Set[str]) -> Set[str]:
+        """Columns that must be final before this rule runs."""
+        raise NotImplementedError
+
+    def apply(self, data: pd.DataFrame) -> None:
+        """Resolve the rule in place."""
+        raise NotImplementedError
+
+    def violations(self, data: pd.DataFrame) -> pd.Series:
+        """Boolean mask of rows breaking the rule."""
+        raise NotImplementedError
+
+    def describe(self) -> str:
+        return str(self.spec)
+
+
+class CompareRule(CrossColumnRule):
+    """``left <op> right`` – violating rows are shifted or clipped onto the valid side."""
+
+    def __init__(self, spec: Dict[str, Any]):
+        super().__init__(spec, spec['left'])
+        self.right = spec['right']
+        self.op = spec.get('op', '>=')
+        if self.op not in _OPERATORS:
+            raise ValueError(f"Unsupported comparison operator: {self.op}")
+        self.strategy = spec.get('strategy', 'shift')
+        if self.strategy not in ('shift', 'clip'):
+            raise ValueError(f"Unsupported compare strategy: {self.strategy}")
+
+    def dependencies(self, known: Set[str]) -> Set[str]:
+        return {self.right}
+
+    def violations(self, data: pd.DataFrame) -> pd.Series:
+        left, _ = _as_comparable(data[self.target])
+        right, _ = _as_comparable(data[self.right])
+        ok = _OPERATORS[self.op](left, right)
+        return ~ok & left.notna() & right.notna()
+
+    def apply(self, data: pd.DataFrame) -> None:
+        left, restore = _as_comparable(data[self.target])
+        right, _ = _as_comparable(data[self.right])
+        bad = self.violations(data)
+        if not bad.any():
+            return
+
+        gap = (left[bad] - right[bad]).abs()
+        if self.strategy == 'clip':
+            gap = gap * 0
+        sign = 1 if self.op.startswith('>') else -1
+        fixed = right[bad] + sign * gap
+        if len(self.op) == 1:
+            # Strict comparison: step off the boundary by the smallest unit
+            on_boundary = fixed == right[bad]
+            fixed[on_boundary] = fixed[on_boundary] + sign * self._step(right)
+
+        if pd.api.types.is_integer_dtype(left):
+            fixed = fixed.astype(left.dtype)
+        data.loc[bad, self.target] = restore(fixed)
+
+    @staticmethod
+    def _step(values: pd.Series):
+        if pd.api.types.is_datetime64_any_dtype(values):
+            return pd.Timedelta(days=1)
+        if pd.api.types.is_integer_dtype(values):
+            return 1
+        return np.finfo(np.float64).eps * max(1.0, float(values.abs().max()))
+
+
+class FormulaRule(CrossColumnRule):
+    """``column = expression`` (a safe ``Expression``)."""
+
+    def __init__(self, spec: Dict[str, Any]):
+        super().__init__(spec, spec['column'])
+        self.expression = Expression(spec['expression'])
+
+    def dependencies(self, known: Set[str]) -> Set[str]:
+        return self.expression.names - {self.target}
+
+    def violations(self, data: pd.DataFrame) -> pd.Series:
+        expected = self.expression.evaluate(data)
+        actual = data[self.target]
+        if pd.api.types.is_float_dtype(expected):
+            return ~np.isclose(actual, expected, equal_nan=True)
+        return actual.ne(expected) & ~(actual.isna() & expected.isna())
+
+    def apply(self, data: pd.DataFrame) -> None:
+        data[self.target] = self.expression.evaluate(data)
+
+
+class ConditionalRule(CrossColumnRule):
+    """``if <condition> then {column: value}`` with optional ``else``."""
+
+    def __init__(self, spec: Dict[str, Any], target: str):
+        super().__init__(spec, target)
+        self.condition = Expression(spec['if'])
+        self.then_value = self._parse(spec.get('then', {}).get(target, _UNSET))
+        self.else_value = self._parse(spec.get('else', {}).get(target, _UNSET))
+
+    @staticmethod
+    def _parse(value: Any) -> Any:
+        if isinstance(value, dict) and 'expression' in value:
+            return Expression(value['expression'])
+        return value
+
+    @classmethod
+    def expand(cls, spec: Dict[str, Any]) -> List["ConditionalRule"]:
+        """One rule per target column named in ``then``/``else``."""
+        targets = list(spec.get('then', {})) + [c for c in spec.get('else', {}) if c not in spec.get('then', {})]
+        return [cls(spec, target) for target in targets]
+
+    def dependencies(self, known: Set[str]) -> Set[str]:
+        deps = set(self.condition.names)
+        for value in (self.then_value, self.else_value):
+            if isinstance(value, Expression):
+                deps |= value.names
+        return deps - {self.target}
+
+    def _mask(self, data: pd.DataFrame) -> pd.Series:
+        mask = self.condition.evaluate(data)
+        if not isinstance(mask, pd.Series):
+            mask = pd.Series(mask, index=data.index)
+        return mask.fillna(False).astype(bool)
+
+    def _value(self, data: pd.DataFrame, value: Any, mask: pd.Series):
+        if isinstance(value, Expression):
+            result = value.evaluate(data)
+            return result[mask] if isinstance(result, pd.Series) else result
+        return value
+
+    def violations(self, data: pd.DataFrame) -> pd.Series:
+        mask = self._mask(data)
+        bad = pd.Series(False, index=data.index)
+        for branch, value in ((mask, self.then_value), (~mask, self.else_value)):
+            if value is _UNSET:
+                continue
+            actual = data.loc[branch, self.target]
+            if value is None:
+                bad[branch] = actual.notna()
+            else:
+                expected = self._value(data, value, branch)
+                bad[branch] = actual.ne(expected)
+        return bad
+
+    def apply(self, data: pd.DataFrame) -> None:
+        mask = self._mask(data)
+        for branch, value in ((mask, self.then_value), (~mask, self.else_value)):
+            if value is _UNSET or not branch.any():
+                continue
+            if value is None and pd.api.types.is_integer_dtype(data[self.target]):
+                data[self.target] = data[self.target].astype('float64')
+            data.loc[branch, self.target] = self._value(data, value, branch)
+
+
+_RULES = {
+    'compare': lambda spec: [CompareRule(spec)],
+    'formula': lambda spec: [FormulaRule(spec)],
+    'conditional': ConditionalRule.expand,
+}
+
+
+class CrossColumnPlan:
+    """Topologically ordered generation plan for a schema with cross-column rules."""
+
+    def __init__(self, schema: Dict[str, Any]):
+        self.columns = column_specs(schema)
+        self.rules: List[CrossColumnRule] = []
+        for spec in schema.get(CONSTRAINTS_KEY, []):
+            kind = spec.get('rule')
+            if kind not in _RULES:
+                raise ValueError(f"Unknown cross-column rule: {kind}")
+            self.rules.extend(_RULES[kind](spec))
+
+        self.all_columns = list(self.columns) + [
+            rule.target for rule in self.rules if rule.target not in self.columns
+        ]
+        self.all_columns = list(dict.fromkeys(self.all_columns))
+        known = set(self.all_columns)
+        self.dependencies: Dict[str, Set[str]] = {name: set() for name in self.all_columns}
+        for rule in self.rules:
+            missing = rule.dependencies(known | {rule.target}) - known
+            if missing:
+                raise ValueError(f"Rule {rule.describe()} references unknown columns: {missing}")
+            self.dependencies[rule.target] |= rule.dependencies(known)
+
+    @property
+    def has_rules(self) -> bool:
+        return bool(self.rules)
+
+    def levels(self) -> List[List[str]]:
+        """Group columns into levels; columns within a level are independent (Kahn's algorithm)."""
+        remaining = {name: set(deps) for name, deps in self.dependencies.items()}
+        levels = []
+        while remaining:
+            ready = [name for name in self.all_columns if name in remaining and not remaining[name]]
+            if not ready:
+                raise ValueError(f"Cyclic cross-column constraints between: {sorted(remaining)}")
+            levels.append(ready)
+            for name in ready:
+                del remaining[name]
+            for deps in remaining.values():
+                deps.difference_update(ready)
+        return levels
+
+    def rules_for(self, column: str) -> List[CrossColumnRule]:
+        return [rule for rule in self.rules if rule.target == column]
+
+    def apply(self, data: pd.DataFrame, columns: Optional[List[str]] = None) -> None:
+        """Resolve the rules targeting ``columns`` (all columns by default) in place."""
+        for column in columns if columns is not None else self.all_columns:
+            for rule in self.rules_for(column):
+                rule.apply(data)
+
+    def violations(self, data: pd.DataFrame) -> Dict[str, int]:
+        """Count violating rows per rule."""
+        counts = {}
+        for rule in self.rules:
+            try:
+                counts[rule.describe()] = int(rule.violations(data).sum())
+            except Exception as e:
+                logger.warning(f"Could not check rule {rule.describe()}: {e}")
+                counts[rule.describe()] = len(data)
+        return counts
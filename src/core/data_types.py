@@ -1,20 +1,86 @@
 """
 Data type manager for synthetic data generation.
-Handles type inference, validation, and conversion.
+Handles type inference, validation, conversion and compact dtypes.
 """
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 import pandas as pd
 import numpy as np
 from datetime import datetime
 
+try:
+    import pyarrow  # noqa: F401
+    ARROW_STRINGS = True
+except ImportError:
+    ARROW_STRINGS = False
+
+
+class MemoryReport:
+    """Per-column memory usage before and after dtype optimization."""
+
+    def __init__(self):
+        self.columns: Dict[str, Dict[str, Any]] = {}
+
+    def add(self, column: str, before_dtype: str, after_dtype: str, before_bytes: int, after_bytes: int) -> None:
+        self.columns[column] = {
+            'before_dtype': before_dtype,
+            'after_dtype': after_dtype,
+            'before_bytes': int(before_bytes),
+            'after_bytes': int(after_bytes),
+            'saved_bytes': int(before_bytes - after_bytes)
+        }
+
+    @property
+    def before_bytes(self) -> int:
+        return sum(c['before_bytes'] for c in self.columns.values())
+
+    @property
+    def after_bytes(self) -> int:
+        return sum(c['after_bytes'] for c in self.columns.values())
+
+    @property
+    def saved_bytes(self) -> int:
+        return self.before_bytes - self.after_bytes
+
+    def to_frame(self) -> pd.DataFrame:
+        """Return the report as a DataFrame indexed by column name."""
+        return pd.DataFrame.from_dict(self.columns, orient='index')
+
+    def __str__(self) -> str:
+        ratio = self.before_bytes / self.after_bytes if self.after_bytes else 1.0
+        lines = [f"{'column':<30} {'before':>12} {'after':>12} {'saved':>12}  dtype"]
+        for name, c in self.columns.items():
+            lines.append(
+                f"{str(name)[:30]:<30} {c['before_bytes']:>12,} {c['after_bytes']:>12,} "
+                f"{c['saved_bytes']:>12,}  {c['before_dtype']} -> {c['after_dtype']}"
+            )
+        lines.append(
+            f"{'TOTAL':<30} {self.before_bytes:>12,} {self.after_bytes:>12,} "
+            f"{self.saved_bytes:>12,}  ({ratio:.1f}x smaller)"
+        )
+        return "\n".join(lines)
+
+
 class DataTypeManager:
     """Manages data type inference and conversion."""
     
     def __init__(self):
+        # Order matters: the first key contained in the dtype name wins
         self.type_mapping = {
+            'int8': 'integer',
+            'int16': 'integer',
+            'int32': 'integer',
             'int64': 'integer',
+            'Int8': 'integer',
+            'Int16': 'integer',
+            'Int32': 'integer',
+            'Int64': 'integer',
+            'float16': 'float',
+            'float32': 'float',
             'float64': 'float',
+            'Float32': 'float',
+            'Float64': 'float',
             'object': 'string',
+            'string': 'string',
             'bool': 'boolean',
             'datetime64': 'datetime',
             'timedelta64': 'timedelta',
@@ -24,11 +90,11 @@ class DataTypeManager:
     def infer_type(self, data: pd.Series) -> str:
         """Infer data type from pandas series."""
         dtype = str(data.dtype)
-        
+    
         for pandas_type, string_type in self.type_mapping.items():
             if pandas_type in dtype:
                 return string_type
-        
+    
         return 'string'
     
     def convert_type(self, data: List[Any], target_type: str) -> List[Any]:
@@ -54,4 +120,72 @@ class DataTypeManager:
             'datetime': 'default.datetime',
             'categorical': 'default.categorical'
         }
-        return hints.get(data_type, 'default.string')
\ No newline at end of file
+        return hints.get(data_type, 'default.string')
+    
+    def optimize_dtypes(
+        self,
+        data: pd.DataFrame,
+        categorical_threshold: float = 0.5,
+        float_rtol: float = 1e-6,
+        arrow_strings: bool = True
+    ) -> Tuple[pd.DataFrame, MemoryReport]:
+        """
+        Convert columns to the narrowest dtype that preserves their values.
+    
+        Args:
+            data: DataFrame to optimize
+            categorical_threshold: Maximum unique/non-null ratio for string columns to become category
+            float_rtol: Relative tolerance allowed when narrowing float64 to float32
+            arrow_strings: Store remaining string columns as Arrow-backed strings (needs pyarrow)
+    
+        Returns:
+            Tuple of (optimized DataFrame, per-column MemoryReport)
+        """
+        report = MemoryReport()
+        optimized = {}
+        for column in data.columns:
+            series = data[column]
+            before = series.memory_usage(index=False, deep=True)
+            narrowed = self._narrow_series(series, categorical_threshold, float_rtol, arrow_strings)
+            after = narrowed.memory_usage(index=False, deep=True)
+            if after >= before:
+                narrowed, after = series, before
+            report.add(column, str(series.dtype), str(narrowed.dtype), before, after)
+            optimized[column] = narrowed
+        result = pd.DataFrame(optimized, index=data.index)
+        result.columns = data.columns
+        return result, report
+    
+    def _narrow_series(
+        self,
+        series: pd.Series,
+        categorical_threshold: float,
+        float_rtol: float,
+        arrow_strings: bool
+    ) -> pd.Series:
+        """Return the most compact safe representation of a single column."""
+        if pd.api.types.is_bool_dtype(series) or pd.api.types.is_datetime64_any_dtype(series):
+            return series
+        if pd.api.types.is_integer_dtype(series):
+            if series.empty:
+                return series
+            if series.min() >= 0:
+                return pd.to_numeric(series, downcast='unsigned')
+            return pd.to_numeric(series, downcast='integer')
+        if pd.api.types.is_float_dtype(series):
+            if series.dtype == np.float64:
+                values = series.to_numpy()
+                narrowed = values.astype(np.float32)
+                with np.errstate(over='ignore', invalid='ignore'):
+                    if np.allclose(narrowed, values, rtol=float_rtol, atol=0, equal_nan=True):
+                        return pd.Series(narrowed, index=series.index, name=series.name)
+            return series
+        if series.dtype == object or pd.api.types.is_string_dtype(series):
+            if pd.api.types.infer_dtype(series, skipna=True) != 'string':
+                return series
+            non_null = series.count()
+            if non_null and series.nunique(dropna=True) / non_null <= categorical_threshold:
+                return series.astype('category')
+            if arrow_strings and ARROW_STRINGS and series.dtype == object:
+                return series.astype('string[pyarrow]')
+        return series
@@ -4,8 +4,9 @@ Dynamic, modular, and independent system for generating synthetic data.
 """
 import pandas as pd
 import numpy as np
-from typing import Dict, Any, List, Optional, Union
+from typing import Dict, Any, Iterator, List, Optional, Tuple, Union
 from datetime import datetime
+import copy
 import json
 import logging
 from concurrent.futures import ThreadPoolExecutor
@@ -13,10 +14,19 @@ import threading
 
 from .schema_inference import SchemaInference
 from .data_types import DataTypeManager
+from .file_loader import iter_file_chunks, load_file
+from .sketches import RowSample
+from .cross_constraints import CrossColumnPlan
 from ..generators.base_generator import BaseGenerator
-from ..validators.data_validator import DataValidator
+from ..generators.constraints import ConstraintLayer
+from ..generators.pattern_generator import PatternGenerator
+from ..generators.pseudonymizer import PseudonymGenerator
+from ..validators.data_validator import DataValidator, ValidationFailed, ValidationResult
+from ..validators.fidelity import FidelityReport, compute_fidelity
+from ..validators.privacy import PrivacyReport, check_privacy, row_hashes
 from ..utils.logger import get_logger
 from ..utils.config import Config
+from ..utils.random_state import run_rng
 from src.generators.file_generator import FileGenerator
 
 logger = get_logger(__name__)
@@ -33,12 +43,37 @@ class SyntheticDataEngine:
         self.schema_inference = SchemaInference()
         self.data_type_manager = DataTypeManager()
         self.validator = DataValidator()
+        self.constraints = ConstraintLayer()
         self.generators: Dict[str, BaseGenerator] = {}
         self._lock = threading.Lock()
-        self.register_generator("file", FileGenerator())  
+        self.memory_reports: Dict[str, Any] = {}
+        self.last_validation: Optional[ValidationResult] = None
+        self.last_fidelity: Optional[FidelityReport] = None
+        self.last_privacy: Optional[PrivacyReport] = None
+        self.register_generator("file", FileGenerator(self.config.model_cache_size))
+        self.register_generator("pseudonym", PseudonymGenerator(self.config.pseudonym_key))
+        self.register_generator("pattern", PatternGenerator())
+        self.schema_inference.identifier_ratio = (
+            self.config.identifier_unique_ratio if self.config.pseudonymize_identifiers else None
+        )
+        self.schema_inference.prompt_cache.max_size = self.config.schema_cache_size
         
         logger.info("SyntheticDataEngine initialized")
     
+    def fork(self) -> "SyntheticDataEngine":
+        """
+        Cheap engine sharing this one's config, generators, schema inference and caches.
+        
+        Only per-run results (last_validation, last_fidelity, ...) are separate,
+        so concurrent requests can each use their own fork.
+        """
+        engine = copy.copy(self)
+        engine.memory_reports = {}
+        engine.last_validation = None
+        engine.last_fidelity = None
+        engine.last_privacy = None
+        return engine
+    
     def register_generator(self, name: str, generator: BaseGenerator) -> None:
         """Register a new generator."""
         with self._lock:
@@ -72,10 +107,11 @@ class SyntheticDataEngine:
         # Generate data based on schema
         data = self._generate_from_schema(schema, num_rows, **kwargs)
         
-        # Validate generated data
-        validation_result = self.validator.validate_data(data, schema)
-        if not validation_result.is_valid:
-            logger.warning(f"Data validation failed: {validation_result.errors}")
+        # Constraints are enforced during generation; a full second pass is opt-in
+        if self.config.post_validate:
+            validation_result = self.validator.validate_data(data, schema)
+            if not validation_result.is_valid:
+                logger.warning(f"Data validation failed: {validation_result.errors}")
         
         return self._format_output(data, output_format)
     
@@ -89,44 +125,263 @@ class SyntheticDataEngine:
     ) -> Union[pd.DataFrame, Dict[str, Any]]:
         """Generate synthetic data from existing file – preserves stats."""
         logger.info(f"Analysing file: {file_path}")
-        original_df = self._load_file(file_path)
+        original_df, schema, real_hashes = self._scan_file(
+            file_path,
+            columns=kwargs.pop("columns", None),
+            approximate=kwargs.pop("approximate_inference", None)
+        )
+        fidelity = kwargs.pop("fidelity", self.config.compute_fidelity)
+        privacy = kwargs.pop("privacy_check", self.config.privacy_check)
+        reject = kwargs.pop("privacy_reject", self.config.privacy_reject)
+        kwargs["rng"] = run_rng(kwargs.pop("seed", None))
 
         if preserve_statistical_properties:
-            schema = self.schema_inference.infer_from_data(original_df)
-            data = self._generate_with_statistics(original_df, schema, num_rows)
+            data = self._generate_with_statistics(original_df, schema, num_rows, rng=kwargs["rng"])
         else:
-            schema = self.schema_inference.infer_from_data(original_df)
             data = self._generate_from_schema(schema, num_rows, **kwargs)
 
-        validation = self.validator.validate_data(data, schema)
-        if not validation.is_valid:
-            logger.warning(f"Validation issues: {validation.errors}")
+        if privacy or reject:
+            data = self._enforce_privacy(original_df, schema, data, reject, preserve_statistical_properties,
+                                         real_hashes=real_hashes, **kwargs)
+
+        if self.config.post_validate:
+            validation = self.validator.validate_data(data, schema)
+            if not validation.is_valid:
+                logger.warning(f"Validation issues: {validation.errors}")
+
+        if fidelity:
+            self.last_fidelity = compute_fidelity(
+                original_df, data, sample_size=self.config.fidelity_sample_size,
+                exclude=[name for name, spec in schema.items() if spec.get('identifier')]
+            )
 
         return self._format_output(data, output_format)
     
-    def _generate_from_schema(self, schema: Dict[str, Any], num_rows: int, **kwargs) -> pd.DataFrame:
-        """Always returns DataFrame – exporters handle conversion."""
-        data = {}
-        for column_name, column_spec in schema.items():
-            generator_name = column_spec.get("generator", "default")
-            if generator_name not in self.generators:
-                generator_name = "mimesis"
-            generator = self.generators[generator_name]
-            data[column_name] = generator.generate(column_spec, num_rows, **kwargs)
-        return pd.DataFrame(data)
-    
-    def _generate_with_statistics(self, original_df: pd.DataFrame, schema: Dict[str, Any], num_rows: int) -> pd.DataFrame:
-        """Column-by-column statistical synthesis."""
+    def _enforce_privacy(
+        self,
+        original_df: pd.DataFrame,
+        schema: Dict[str, Any],
+        data: pd.DataFrame,
+        reject: bool,
+        preserve_statistical_properties: bool,
+        real_hashes: Optional[np.ndarray] = None,
+        **kwargs
+    ) -> pd.DataFrame:
+        """Check synthetic rows against the source; optionally regenerate offending rows in batches."""
+        threshold = self.config.privacy_dcr_threshold
+        report = check_privacy(original_df, data, dcr_threshold=threshold, real_hashes=real_hashes)
+        rounds = 0
+        # Replacement rows continue the row positions after everything drawn so far,
+        # so identifier pseudonyms never repeat keys already in ``data``
+        row_offset = len(data)
+        while reject and report.offending_count and rounds < self.config.privacy_max_rounds:
+            bad = report.offending
+            n_bad = int(bad.sum())
+            if preserve_statistical_properties:
+                fresh = self._generate_with_statistics(original_df, schema, n_bad, rng=kwargs.get("rng"),
+                                                       row_offset=row_offset)
+            else:
+                fresh = self._generate_from_schema(schema, n_bad, **kwargs)
+            row_offset += n_bad
+            fresh.index = data.index[bad]
+            data.loc[bad, fresh.columns] = fresh
+            # Only the replaced rows need re-checking between rounds
+            recheck = check_privacy(original_df, data.loc[bad], dcr_threshold=threshold, real_hashes=real_hashes)
+            offending = np.zeros(len(data), dtype=bool)
+            offending[np.flatnonzero(bad)[recheck.offending]] = True
+            report = PrivacyReport(report.exact_match_rate, report.dcr, offending)
+            rounds += 1
+        if rounds:
+            # Report rates of the data actually returned, not of the first draw
+            report = check_privacy(original_df, data, dcr_threshold=threshold, real_hashes=real_hashes)
+        if reject and report.offending_count:
+            logger.warning(f"{report.offending_count} rows still match real records after {rounds} rounds")
+        self.last_privacy = report
+        return data
+    
+    def _generate_from_schema(
+        self,
+        schema: Dict[str, Any],
+        num_rows: int,
+        **kwargs
+    ) -> pd.DataFrame:
+        """Always returns DataFrame – exporters handle conversion.
+        
+        Columns are generated level by level in topological order of the
+        schema's cross-column rules, then rules targeting them are resolved.
+        Columns are generated one after another: the per-row Mimesis loops
+        hold the GIL, so a thread pool only added start-up overhead.
+        """
+        plan = CrossColumnPlan(schema)
+        data = pd.DataFrame(index=pd.RangeIndex(num_rows))
+        for level in plan.levels():
+            for name in level:
+                if name in plan.columns:
+                    data[name] = self._generate_column(name, plan.columns[name], num_rows, **kwargs)
+            plan.apply(data, level)
+        return data[plan.all_columns]
+    
+    def _generate_column(self, column_name: str, column_spec: Dict[str, Any], num_rows: int, **kwargs) -> Any:
+        """Generate one column and enforce its single-column constraints."""
+        default = "pattern" if column_spec.get("type") == "pattern" else "default"
+        generator_name = column_spec.get("generator", default)
+        if generator_name not in self.generators:
+            generator_name = "mimesis"
+        generator = self.generators[generator_name]
+        values = generator.generate(column_spec, num_rows, **kwargs)
+        return self.constraints.apply(
+            values, column_spec,
+            regenerate=lambda k: generator.generate(column_spec, k, **kwargs),
+            rng=kwargs.get("rng")
+        )
+    
+    def generate_chunks(
+        self,
+        schema: Dict[str, Any],
+        num_rows: int,
+        chunk_size: Optional[int] = None,
+        validate: bool = True,
+        fail_fast: bool = True,
+        sample_fraction: Optional[float] = None,
+        seed: Optional[int] = None,
+        **kwargs
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Generate data from a schema chunk by chunk, validating as chunks are produced.
+        
+        Args:
+            schema: Column specifications
+            num_rows: Total number of rows to generate
+            chunk_size: Rows per chunk (defaults to Config.chunk_size)
+            validate: Validate each chunk incrementally
+            fail_fast: Stop with ValidationFailed on the first hard failure
+            sample_fraction: Fraction of rows to validate (defaults to Config.validation_sample_fraction)
+            seed: Make the output reproducible
+            **kwargs: Additional generator parameters
+            
+        Yields:
+            DataFrame chunks with a continuous RangeIndex
+        """
+        chunk_size = chunk_size or self.config.chunk_size
+        streaming = None
+        if validate:
+            streaming = self.validator.stream(
+                schema,
+                fail_fast=fail_fast,
+                sample_fraction=sample_fraction or self.config.validation_sample_fraction
+            )
+        
+        rng = run_rng(seed)
+        for start in range(0, num_rows, chunk_size):
+            rows = min(chunk_size, num_rows - start)
+            chunk = self._generate_from_schema(schema, rows, rng=rng, **kwargs)
+            chunk.index = pd.RangeIndex(start, start + rows)
+            if streaming is not None and not streaming.update(chunk):
+                self.last_validation = streaming.result()
+                raise ValidationFailed(self.last_validation)
+            yield chunk
+        
+        if streaming is not None:
+            self.last_validation = streaming.result()
+            if not self.last_validation.is_valid:
+                logger.warning(f"Data validation failed: {self.last_validation.errors}")
+    
+    def generate_chunks_from_file(
+        self,
+        file_path: str,
+        num_rows: int,
+        preserve_statistical_properties: bool = True,
+        chunk_size: Optional[int] = None,
+        seed: Optional[int] = None,
+        **kwargs
+    ) -> Iterator[pd.DataFrame]:
+        """
+        File-based generation chunk by chunk, for outputs too large to build in memory.
+        
+        The file is scanned and its schema inferred once; fitted models are
+        cached, so only the first chunk pays for fitting. Chunks keep the
+        generators' dtypes (no per-chunk downcast, so every chunk has the same
+        schema), and the opt-in privacy and fidelity passes, which need the
+        whole output, are not run.
+        
+        Yields:
+            DataFrame chunks with a continuous RangeIndex
+        """
+        original_df, schema, _ = self._scan_file(
+            file_path,
+            columns=kwargs.pop("columns", None),
+            approximate=kwargs.pop("approximate_inference", None)
+        )
+        chunk_size = chunk_size or self.config.chunk_size
+        rng = run_rng(seed)
+        for start in range(0, num_rows, chunk_size):
+            rows = min(chunk_size, num_rows - start)
+            if preserve_statistical_properties:
+                # Identifier generators need the offset to keep keys unique across chunks
+                chunk = self._generate_with_statistics(original_df, schema, rows, rng=rng, row_offset=start)
+            else:
+                chunk = self._generate_from_schema(schema, rows, rng=rng, **kwargs)
+            chunk.index = pd.RangeIndex(start, start + rows)
+            yield chunk
+    
+    def preview(self, schema: Dict[str, Any], num_rows: int = 10, seed: Optional[int] = None) -> pd.DataFrame:
+        """
+        A few rows from a schema on the low-latency path: one pass, no
+        chunking or validation.
+        """
+        return self._generate_from_schema(schema, num_rows, rng=run_rng(seed))
+    
+    def preview_from_file(
+        self,
+        file_path: str,
+        num_rows: int = 10,
+        sample_rows: Optional[int] = None,
+        seed: Optional[int] = None
+    ) -> pd.DataFrame:
+        """
+        A few statistically similar rows, fitted on the first rows of the file
+        (Config.preview_sample_rows). Only that head of CSV, Parquet and Arrow
+        inputs is read, so latency does not grow with the file. Fidelity, privacy and validation passes are skipped; the head is
+        fixed, so repeated previews reuse the cached fitted models.
+        """
+        sample_rows = sample_rows or self.config.preview_sample_rows
+        chunks = iter_file_chunks(file_path, chunk_size=sample_rows)
+        try:
+            original_df = next(chunks, None)
+        finally:
+            chunks.close()
+        if original_df is None:
+            original_df = self._load_file(file_path)
+        original_df = original_df.reset_index(drop=True)
+        schema = self.schema_inference.infer_from_data(original_df)
+        return self._generate_with_statistics(original_df, schema, num_rows, rng=run_rng(seed))
+    
+    def _generate_with_statistics(
+        self,
+        original_df: pd.DataFrame,
+        schema: Dict[str, Any],
+        num_rows: int,
+        **kwargs
+    ) -> pd.DataFrame:
+        """Column-by-column statistical synthesis (``kwargs`` are passed to the generators)."""
         synthetic = {}
         for col_name, col_spec in schema.items():
             original_series = original_df[col_name]
             generator_name = col_spec.get("statistical_generator", "file")
             if generator_name in self.generators:
                 generator = self.generators[generator_name]
-                synthetic[col_name] = generator.generate(col_spec, num_rows, original_series=original_series)
+                values = generator.generate(col_spec, num_rows, original_series=original_series, **kwargs)
+                synthetic[col_name] = self.constraints.apply(
+                    values, col_spec,
+                    regenerate=lambda k, g=generator, spec=col_spec, orig=original_series:
+                        g.generate(spec, k, original_series=orig, **kwargs),
+                    rng=kwargs.get("rng")
+                )
             else:
                 # fallback – sample with replacement
-                synthetic[col_name] = original_series.sample(n=num_rows, replace=True).tolist()
+                synthetic[col_name] = original_series.sample(
+                    n=num_rows, replace=True, random_state=kwargs.get("rng")
+                ).tolist()
         return pd.DataFrame(synthetic)
     
     def _generate_default_data(
@@ -171,16 +426,71 @@ class SyntheticDataEngine:
             std = original_series.std()
             return np.random.normal(mean, std, num_rows).tolist()
     
-    def _load_file(self, file_path: str) -> pd.DataFrame:
-        """Load data from file."""
-        if file_path.endswith('.csv'):
-            return pd.read_csv(file_path)
-        elif file_path.endswith('.json'):
-            return pd.read_json(file_path)
-        elif file_path.endswith('.xlsx') or file_path.endswith('.xls'):
-            return pd.read_excel(file_path)
+    def _scan_file(
+        self,
+        file_path: str,
+        columns: Optional[List[str]] = None,
+        approximate: Optional[bool] = None
+    ) -> Tuple[pd.DataFrame, Dict[str, Any], Optional[np.ndarray]]:
+        """
+        Read a file for file-based generation and infer its schema.
+        
+        The file is read chunk by chunk. Inputs of up to
+        Config.approximate_inference_rows rows are kept whole and profiled
+        exactly; larger inputs (or ``approximate=True``) are streamed into
+        sketches instead, keeping only a uniform sample of
+        Config.approximate_sample_rows rows for fitting the generators and
+        one hash per real row for the exact-match privacy check, so the full
+        file is never held in memory.
+        
+        Returns:
+            (rows the generators learn from, schema, real row hashes or None)
+        """
+        if approximate is False:
+            data = self._load_file(file_path, columns=columns)
+            return data, self.schema_inference.infer_from_data(data), None
+        
+        limit = 0 if approximate else self.config.approximate_inference_rows
+        chunks = iter_file_chunks(file_path, self.config.chunk_size, columns,
+                                  self.config.columnar_cache_dir, self.config.columnar_cache_max_bytes)
+        head: List[pd.DataFrame] = []
+        rows = 0
+        for chunk in chunks:
+            head.append(chunk)
+            rows += len(chunk)
+            if rows > limit:
+                break
         else:
-            raise ValueError(f"Unsupported file format: {file_path}")
+            data = pd.concat(head, ignore_index=True) if head else self._load_file(file_path, columns=columns)
+            return data, self.schema_inference.infer_from_data(data), None
+        
+        logger.info(f"Large input: approximate inference, fitting on a {self.config.approximate_sample_rows:,}-row sample")
+        sample = RowSample(self.config.approximate_sample_rows)
+        hashes: List[np.ndarray] = []
+        
+        def observed() -> Iterator[pd.DataFrame]:
+            while True:
+                chunk = head.pop(0) if head else next(chunks, None)
+                if chunk is None:
+                    return
+                sample.update(chunk)
+                hashes.append(row_hashes(chunk, list(chunk.columns)))
+                yield chunk
+        
+        schema = self.schema_inference.infer_from_chunks(
+            observed(), accuracy=self.config.inference_accuracy
+        )
+        return sample.sample(), schema, np.concatenate(hashes)
+    
+    def _load_file(self, file_path: str, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """Load data from file (CSV, compressed CSV, JSON, Excel, Parquet, Feather)."""
+        return load_file(
+            file_path,
+            columns=columns,
+            memory_map=True,
+            cache_dir=self.config.columnar_cache_dir,
+            cache_max_bytes=self.config.columnar_cache_max_bytes
+        )
     
     # def _format_output(
     #     self,
@@ -199,6 +509,20 @@ class SyntheticDataEngine:
     #         return json.loads(data.to_json(orient="records"))
     #     raise ValueError(f"Unsupported output format: {output_format}")
 
+    def _optimize_memory(self, data: pd.DataFrame, stage: str) -> pd.DataFrame:
+        """Downcast a frame to compact dtypes and keep the per-column report."""
+        if not self.config.optimize_dtypes:
+            return data
+        data, report = self.data_type_manager.optimize_dtypes(
+            data, categorical_threshold=self.config.categorical_threshold
+        )
+        self.memory_reports[stage] = report
+        logger.info(
+            f"Optimized {stage} dtypes: {report.before_bytes:,} → {report.after_bytes:,} bytes "
+            f"({report.saved_bytes:,} saved)"
+        )
+        return data
+
     def _format_output(self, data: pd.DataFrame, output_format: str) -> pd.DataFrame:
         """Always return DataFrame – exporters will convert if needed."""
-        return data
\ No newline at end of file
+        return self._optimize_memory(data, "output")
\ No newline at end of file
@@ -0,0 +1,286 @@
+"""
+Input file loading for file-based generation and EDA.
+Supports text (CSV, compressed CSV, JSON), Excel and columnar (Parquet,
+Feather/Arrow IPC) inputs with column projection and memory-mapped reads.
+Slow-to-parse inputs can be converted once into a cached Feather copy; the
+cache directory is kept under a size limit by evicting least recently used
+copies. CSV inputs are converted batch by batch, so caching never loads a
+large file whole; inputs whose columns Arrow cannot represent faithfully
+(mixed-type JSON/Excel columns, CSV columns whose type changes mid-file)
+are not cached and are read from the original file instead.
+"""
+import hashlib
+import os
+import tempfile
+from pathlib import Path
+from typing import Iterator, List, Optional, Union
+
+import pandas as pd
+
+from ..utils.cache import LRUCache
+from ..utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# (path, size, mtime) -> SHA-256, so unchanged files are not re-hashed on every load
+_DIGESTS = LRUCache(1024)
+# Content hashes of inputs that cannot be cached, so the conversion is not retried on every load
+_UNCACHEABLE = LRUCache(1024)
+
+CSV_SUFFIXES = ('.csv', '.csv.gz', '.csv.gzip', '.csv.zst', '.csv.zstd')
+CSV_COMPRESSION = {'.csv': None, '.csv.gz': 'gzip', '.csv.gzip': 'gzip', '.csv.zst': 'zstd', '.csv.zstd': 'zstd'}
+JSON_SUFFIXES = ('.json',)
+EXCEL_SUFFIXES = ('.xlsx', '.xls')
+PARQUET_SUFFIXES = ('.parquet', '.pq')
+ARROW_SUFFIXES = ('.feather', '.arrow', '.ipc')
+
+SUPPORTED_SUFFIXES = CSV_SUFFIXES + JSON_SUFFIXES + EXCEL_SUFFIXES + PARQUET_SUFFIXES + ARROW_SUFFIXES
+
+# Formats that are worth converting to a columnar cache copy
+CACHEABLE_SUFFIXES = CSV_SUFFIXES + JSON_SUFFIXES + EXCEL_SUFFIXES
+
+
+def file_suffix(file_path: Union[str, Path]) -> str:
+    """Return the (possibly compound, e.g. ``.csv.gz``) lower-case suffix of a path."""
+    name = Path(file_path).name.lower()
+    for suffix in sorted(SUPPORTED_SUFFIXES, key=len, reverse=True):
+        if name.endswith(suffix):
+            return suffix
+    return Path(name).suffix
+
+
+def is_supported(file_path: Union[str, Path]) -> bool:
+    """Check whether a file can be loaded."""
+    return file_suffix(file_path) in SUPPORTED_SUFFIXES
+
+
+def load_file(
+    file_path: Union[str, Path],
+    columns: Optional[List[str]] = None,
+    memory_map: bool = True,
+    cache_dir: Optional[Union[str, Path]] = None,
+    cache_max_bytes: Optional[int] = None
+) -> pd.DataFrame:
+    """
+    Load a tabular file into a DataFrame.
+
+    Args:
+        file_path: Path to the input file
+        columns: Only load these columns (projection pushdown where supported)
+        memory_map: Memory-map uncompressed and columnar inputs
+        cache_dir: If set, CSV/JSON/Excel inputs are read from (and written to)
+            a Feather cache in this directory keyed by file content
+        cache_max_bytes: Size limit of ``cache_dir`` (None: unbounded)
+
+    Returns:
+        Loaded DataFrame
+    """
+    suffix = file_suffix(file_path)
+    if suffix not in SUPPORTED_SUFFIXES:
+        raise ValueError(f"Unsupported file format: {file_path}")
+
+    if cache_dir is not None and suffix in CACHEABLE_SUFFIXES:
+        cached = columnar_cache_copy(file_path, cache_dir, cache_max_bytes)
+        if cached is not None:
+            file_path, suffix = cached, '.feather'
+
+    file_path = str(file_path)
+    if suffix in CSV_SUFFIXES:
+        compressed = suffix != '.csv'
+        return pd.read_csv(
+            file_path,
+            usecols=columns,
+            compression='infer',
+            memory_map=memory_map and not compressed
+        )
+    if suffix in JSON_SUFFIXES:
+        df = pd.read_json(file_path)
+        return df[columns] if columns else df
+    if suffix in EXCEL_SUFFIXES:
+        return pd.read_excel(file_path, usecols=columns)
+    if suffix in PARQUET_SUFFIXES:
+        return pd.read_parquet(file_path, columns=columns, memory_map=memory_map)
+    return _read_arrow_ipc(file_path, columns, memory_map)
+
+
+def _read_arrow_ipc(file_path: str, columns: Optional[List[str]], memory_map: bool) -> pd.DataFrame:
+    """Read a Feather v2 / Arrow IPC file, memory-mapped when possible."""
+    from pyarrow import feather
+
+    table = feather.read_table(file_path, columns=columns, memory_map=memory_map)
+    return table.to_pandas()
+
+
+def iter_file_chunks(
+    file_path: Union[str, Path],
+    chunk_size: int = 100_000,
+    columns: Optional[List[str]] = None,
+    cache_dir: Optional[Union[str, Path]] = None,
+    cache_max_bytes: Optional[int] = None
+) -> Iterator[pd.DataFrame]:
+    """
+    Read a tabular file as a stream of DataFrame chunks.
+
+    CSV is parsed incrementally, Parquet row group batch by batch and
+    Feather/Arrow IPC batch by batch from a memory map, so only one chunk is
+    materialized at a time. JSON and Excel have no incremental reader and
+    are loaded once, then sliced (use ``cache_dir`` to read them from their
+    Feather copy instead).
+    """
+    suffix = file_suffix(file_path)
+    if suffix not in SUPPORTED_SUFFIXES:
+        raise ValueError(f"Unsupported file format: {file_path}")
+
+    if cache_dir is not None and suffix in CACHEABLE_SUFFIXES:
+        cached = columnar_cache_copy(file_path, cache_dir, cache_max_bytes)
+        if cached is not None:
+            file_path, suffix = cached, '.feather'
+
+    file_path = str(file_path)
+    if suffix in CSV_SUFFIXES:
+        with pd.read_csv(file_path, usecols=columns, compression='infer', chunksize=chunk_size) as reader:
+            yield from reader
+    elif suffix in PARQUET_SUFFIXES:
+        import pyarrow.parquet as pq
+
+        parquet = pq.ParquetFile(file_path, memory_map=True)
+        for batch in parquet.iter_batches(batch_size=chunk_size, columns=columns):
+            yield batch.to_pandas()
+    elif suffix in ARROW_SUFFIXES:
+        from pyarrow import feather
+
+        table = feather.read_table(file_path, columns=columns, memory_map=True)
+        for batch in table.to_batches(max_chunksize=chunk_size):
+            yield batch.to_pandas()
+    else:
+        df = load_file(file_path, columns=columns, memory_map=False)
+        for start in range(0, len(df), chunk_size):
+            yield df.iloc[start:start + chunk_size]
+
+
+def file_digest(file_path: Union[str, Path], block_size: int = 1 << 20) -> str:
+    """Return the SHA-256 hex digest of a file's content."""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def cached_file_digest(file_path: Union[str, Path]) -> str:
+    """``file_digest`` memoized on (path, size, mtime), so unchanged files are hashed once."""
+    path = Path(file_path).resolve()
+    stat = path.stat()
+    key = (str(path), stat.st_size, stat.st_mtime_ns)
+    return _DIGESTS.get_or_create(key, lambda: file_digest(path))
+
+
+def columnar_cache_copy(
+    file_path: Union[str, Path],
+    cache_dir: Union[str, Path],
+    max_bytes: Optional[int] = None
+) -> Optional[Path]:
+    """
+    Return a Feather copy of ``file_path`` in ``cache_dir``, creating it on first use.
+
+    The cache key is the file content hash, so re-uploads of the same data
+    under another name hit the same copy. Hits mark a copy as recently used;
+    after a new copy is written, least recently used copies are removed until
+    the directory is within ``max_bytes``. Returns None (read the original
+    instead) when the content cannot be stored without changing values.
+    """
+    cache_dir = Path(cache_dir)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    digest = cached_file_digest(file_path)
+    if _UNCACHEABLE.get(digest):
+        return None
+    cached = cache_dir / f"{digest}.feather"
+    if cached.exists():
+        logger.info(f"Using cached columnar copy {cached.name} for {file_path}")
+        try:
+            os.utime(cached)
+            return cached
+        except FileNotFoundError:
+            pass  # evicted in the meantime; write it again
+
+    import pyarrow as pa
+    from pyarrow import feather
+
+    # Write to a private temp file and rename so concurrent readers never see a partial copy
+    fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix='.feather.tmp')
+    os.close(fd)
+    try:
+        if file_suffix(file_path) in CSV_SUFFIXES:
+            _write_csv_as_feather(file_path, tmp_path)
+        else:
+            df = load_file(file_path, memory_map=False)
+            df.columns = df.columns.astype(str)
+            # Mixed-type object columns raise here instead of being rewritten as text
+            table = pa.Table.from_pandas(df.reset_index(drop=True), preserve_index=False)
+            feather.write_feather(table, tmp_path)
+        os.replace(tmp_path, cached)
+    except (pa.ArrowInvalid, pa.ArrowTypeError) as e:
+        logger.info(f"Not caching {file_path}: {e}")
+        _UNCACHEABLE.put(digest, True)
+        return None
+    finally:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+    logger.info(f"Wrote columnar cache copy {cached.name} for {file_path}")
+    if max_bytes is not None:
+        evict_columnar_cache(cache_dir, max_bytes, keep=cached)
+    return cached
+
+
+def _write_csv_as_feather(file_path: Union[str, Path], target: Union[str, Path]) -> None:
+    """
+    Convert a (possibly compressed) CSV into a Feather file one record batch at a time.
+
+    Types follow ``pandas.read_csv``: empty fields are null, and date/time
+    columns stay text. Arrow infers each column's type from the first block;
+    a later value that does not fit raises ArrowInvalid.
+    """
+    import pyarrow as pa
+    from pyarrow import csv
+
+    def open_reader(column_types=None):
+        return csv.open_csv(
+            pa.input_stream(str(file_path), compression=CSV_COMPRESSION[file_suffix(file_path)]),
+            convert_options=csv.ConvertOptions(strings_can_be_null=True, column_types=column_types or {})
+        )
+
+    reader = open_reader()
+    temporal = {field.name: pa.string() for field in reader.schema if pa.types.is_temporal(field.type)}
+    if temporal:
+        reader.close()
+        reader = open_reader(temporal)
+    with reader, pa.OSFile(str(target), 'wb') as sink:
+        # LZ4 like DataFrame.to_feather, so copies stay small
+        options = pa.ipc.IpcWriteOptions(compression='lz4')
+        with pa.ipc.new_file(sink, reader.schema, options=options) as writer:
+            for batch in reader:
+                writer.write_batch(batch)
+
+
+def evict_columnar_cache(cache_dir: Union[str, Path], max_bytes: int, keep: Optional[Path] = None) -> int:
+    """Remove least recently used Feather copies until ``cache_dir`` is within ``max_bytes``; returns bytes freed."""
+    entries = []
+    for path in Path(cache_dir).glob('*.feather'):
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            continue
+        entries.append((stat.st_mtime, stat.st_size, path))
+    excess = sum(size for _, size, _ in entries) - max_bytes
+    freed = 0
+    for _, size, path in sorted(entries, key=lambda entry: entry[0]):
+        if excess <= 0:
+            break
+        if path == keep:
+            continue
+        path.unlink(missing_ok=True)
+        excess -= size
+        freed += size
+    if freed:
+        logger.info(f"Evicted {freed:,} bytes of columnar cache copies")
+    return freed
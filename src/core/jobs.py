@@ -0,0 +1,254 @@
+"""
+Asynchronous generation jobs for the web app (local, in-process backend).
+
+Jobs are persisted in a SQLite file, so queued and interrupted jobs are
+picked up again after a restart, and run on a bounded thread pool. A job
+is a ``kind`` (e.g. 'prompt', 'schema', 'file') plus JSON parameters; the
+handler registered for its kind writes the artifact into the job's own
+directory and reports progress (rows done) through a callback, from which
+the rate and ETA are derived. Progress is kept in memory and written to
+SQLite at most once per ``progress_interval`` seconds. With a content
+store, finished artifacts are moved into it (deduplicated, quota-bounded)
+and the job directory is removed. One process owns a
+job directory; several processes sharing it would each re-run recovered jobs.
+"""
+import json
+import shutil
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Union
+
+import pandas as pd
+
+from .content_store import ContentStore
+from ..utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+QUEUED = 'queued'
+RUNNING = 'running'
+SUCCEEDED = 'succeeded'
+FAILED = 'failed'
+
+# handler(params, job_dir, progress) -> artifact path (inside job_dir)
+JobHandler = Callable[[Dict[str, Any], Path, Callable[[int], None]], Union[str, Path]]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    params TEXT NOT NULL,
+    status TEXT NOT NULL,
+    rows_total INTEGER,
+    rows_done INTEGER NOT NULL DEFAULT 0,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL,
+    artifact TEXT,
+    error TEXT
+)
+"""
+
+
+class JobQueueFull(RuntimeError):
+    """Raised when too many jobs are queued or running."""
+
+
+def track_progress(chunks: Iterable[pd.DataFrame], progress: Callable[[int], None]) -> Iterator[pd.DataFrame]:
+    """Pass chunks through, reporting the running row count after each one."""
+    done = 0
+    for chunk in chunks:
+        yield chunk
+        done += len(chunk)
+        progress(done)
+
+
+class JobManager:
+    """
+    Persistent job queue with a bounded worker pool.
+
+    Args:
+        root: Directory for the SQLite database and per-job artifact directories
+        handlers: Job kind -> handler
+        max_workers: Jobs running concurrently
+        max_queued: Queued plus running jobs accepted before ``submit`` raises JobQueueFull
+        progress_interval: Minimum seconds between progress writes to SQLite
+        recover: Re-queue jobs left unfinished by a previous process
+        store: ContentStore receiving finished artifacts (None: keep them in the job directory)
+    """
+
+    def __init__(
+        self,
+        root: Union[str, Path],
+        handlers: Dict[str, JobHandler],
+        max_workers: int = 2,
+        max_queued: int = 100,
+        progress_interval: float = 1.0,
+        recover: bool = True,
+        store: Optional[ContentStore] = None
+    ):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.handlers = handlers
+        self.max_queued = max_queued
+        self.progress_interval = progress_interval
+        self.store = store
+        self._db = sqlite3.connect(str(self.root / 'jobs.sqlite3'), check_same_thread=False)
+        self._db.row_factory = sqlite3.Row
+        self._db_lock = threading.Lock()
+        self._live: Dict[str, int] = {}
+        self._pending = set()
+        self._pending_lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="job-worker")
+        with self._db_lock, self._db:
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(_SCHEMA)
+        if recover:
+            self._recover()
+
+    # -- persistence -------------------------------------------------------
+
+    def _execute(self, sql: str, args: tuple = ()) -> List[sqlite3.Row]:
+        with self._db_lock, self._db:
+            return self._db.execute(sql, args).fetchall()
+
+    def _update(self, job_id: str, **fields: Any) -> None:
+        columns = ", ".join(f"{name} = ?" for name in fields)
+        self._execute(f"UPDATE jobs SET {columns} WHERE id = ?", (*fields.values(), job_id))
+
+    def _recover(self) -> None:
+        """Re-queue jobs that were queued or running when the process stopped."""
+        rows = self._execute("SELECT id FROM jobs WHERE status IN (?, ?) ORDER BY created_at", (QUEUED, RUNNING))
+        for row in rows:
+            self._update(row['id'], status=QUEUED, rows_done=0, started_at=None)
+            self._enqueue(row['id'])
+        if rows:
+            logger.info(f"Re-queued {len(rows)} unfinished jobs")
+
+    # -- lifecycle ---------------------------------------------------------
+
+    def job_dir(self, job_id: str) -> Path:
+        return self.root / job_id
+
+    def new_job_id(self) -> str:
+        """Id for a job about to be submitted (lets callers stage inputs in its directory first)."""
+        return uuid.uuid4().hex
+
+    def submit(
+        self,
+        kind: str,
+        params: Dict[str, Any],
+        rows_total: Optional[int] = None,
+        job_id: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Persist and enqueue a job; returns its status record."""
+        if kind not in self.handlers:
+            raise ValueError(f"Unknown job kind: {kind}")
+        with self._pending_lock:
+            if len(self._pending) >= self.max_queued:
+                raise JobQueueFull(f"Too many pending jobs (limit {self.max_queued})")
+            job_id = job_id or self.new_job_id()
+            self._execute(
+                "INSERT INTO jobs (id, kind, params, status, rows_total, created_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (job_id, kind, json.dumps(params), QUEUED, rows_total, time.time())
+            )
+            self._enqueue(job_id)
+        return self.get(job_id)
+
+    def _enqueue(self, job_id: str) -> None:
+        self._pending.add(job_id)
+        self._pool.submit(self._run, job_id)
+
+    def _run(self, job_id: str) -> None:
+        row = self._execute("SELECT kind, params FROM jobs WHERE id = ?", (job_id,))[0]
+        started = time.time()
+        self._update(job_id, status=RUNNING, started_at=started)
+        last_write = [started]
+
+        def progress(rows_done: int) -> None:
+            self._live[job_id] = rows_done
+            now = time.time()
+            if now - last_write[0] >= self.progress_interval:
+                last_write[0] = now
+                self._update(job_id, rows_done=rows_done)
+
+        directory = self.job_dir(job_id)
+        directory.mkdir(parents=True, exist_ok=True)
+        try:
+            artifact = Path(self.handlers[row['kind']](json.loads(row['params']), directory, progress))
+            name = self.store.put_file(artifact) if self.store is not None else artifact.name
+            self._update(job_id, status=SUCCEEDED, finished_at=time.time(),
+                         rows_done=self._live.get(job_id, 0), artifact=name)
+            logger.info(f"Job {job_id} finished: {name}")
+        except Exception as e:
+            logger.exception(f"Job {job_id} failed")
+            self._update(job_id, status=FAILED, finished_at=time.time(),
+                         rows_done=self._live.get(job_id, 0), error=str(e))
+        finally:
+            if self.store is not None:
+                shutil.rmtree(directory, ignore_errors=True)
+            self._live.pop(job_id, None)
+            with self._pending_lock:
+                self._pending.discard(job_id)
+
+    # -- queries -----------------------------------------------------------
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Status record with progress, rate (rows/s) and ETA, or None if unknown."""
+        rows = self._execute("SELECT * FROM jobs WHERE id = ?", (job_id,))
+        if not rows:
+            return None
+        job = dict(rows[0])
+        job.pop('params')
+        job['rows_done'] = self._live.get(job_id, job['rows_done'])
+        end = job['finished_at'] or time.time()
+        elapsed = end - job['started_at'] if job['started_at'] else 0.0
+        rate = job['rows_done'] / elapsed if elapsed > 0 else 0.0
+        total = job['rows_total']
+        job['progress'] = min(job['rows_done'] / total, 1.0) if total else None
+        job['rows_per_second'] = rate
+        job['eta_seconds'] = (
+            (total - job['rows_done']) / rate if job['status'] == RUNNING and total and rate > 0 else None
+        )
+        return job
+
+    def active(self, job_id: str) -> bool:
+        """Whether a job is queued or running in this process (no database access)."""
+        with self._pending_lock:
+            return job_id in self._pending
+
+    def artifact_path(self, job_id: str) -> Optional[Path]:
+        """Path of a finished job's artifact, or None (also once evicted from the store)."""
+        job = self.get(job_id)
+        if job is None or job['status'] != SUCCEEDED or not job['artifact']:
+            return None
+        if self.store is not None:
+            return self.store.path(job['artifact'])
+        path = self.job_dir(job_id) / job['artifact']
+        return path if path.exists() else None
+
+    def delete(self, job_id: str) -> bool:
+        """
+        Forget a finished job and remove its files (running jobs cannot be deleted).
+
+        A stored artifact is dropped too unless another job produced the same
+        content or an alias still names it.
+        """
+        job = self.get(job_id)
+        if job is None or job['status'] in (QUEUED, RUNNING):
+            return False
+        self._execute("DELETE FROM jobs WHERE id = ?", (job_id,))
+        shutil.rmtree(self.job_dir(job_id), ignore_errors=True)
+        if self.store is not None and job['artifact']:
+            shared = self._execute("SELECT 1 FROM jobs WHERE artifact = ? LIMIT 1", (job['artifact'],))
+            if not shared:
+                self.store.discard(job['artifact'])
+        return True
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._pool.shutdown(wait=wait)
+        self._db.close()
@@ -0,0 +1,210 @@
+"""
+Producer/consumer pipeline connecting chunk generation to export.
+
+Chunks are produced (generated) on a background thread and handed to the
+consumer (an exporter writing/compressing them) through a bounded queue.
+When the consumer falls behind the queue fills and the producer blocks, so
+memory stays at ``queue_size`` chunks (backpressure). Generation and
+I/O/compression overlap, so end-to-end time approaches the slower of the two
+stages instead of their sum. NumPy, pandas, zlib/zstd and pyarrow release the
+GIL for their heavy lifting, which is what makes threads sufficient here.
+
+Queue depth and the time each side spends blocked are recorded:
+- producer stall: generation waiting on a full queue (export is the bottleneck)
+- consumer stall: export waiting on an empty queue (generation is the bottleneck)
+"""
+import threading
+import time
+from queue import Empty, Full, Queue
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, Tuple
+
+import pandas as pd
+
+from ..utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+_DONE = object()
+
+
+class PipelineStats:
+    """Timing and queue metrics of one pipeline run."""
+
+    def __init__(self, queue_size: int):
+        self.queue_size = queue_size
+        self.chunks = 0
+        self.rows = 0
+        self.produce_seconds = 0.0
+        self.producer_stall_seconds = 0.0
+        self.consumer_stall_seconds = 0.0
+        self.wall_seconds = 0.0
+        self.max_queue_depth = 0
+        self._depth_total = 0
+
+    def record_depth(self, depth: int) -> None:
+        self.max_queue_depth = max(self.max_queue_depth, depth)
+        self._depth_total += depth
+
+    @property
+    def mean_queue_depth(self) -> float:
+        return self._depth_total / self.chunks if self.chunks else 0.0
+
+    @property
+    def consume_seconds(self) -> float:
+        """Time the consumer spent working (not waiting for chunks)."""
+        return max(self.wall_seconds - self.consumer_stall_seconds, 0.0)
+
+    @property
+    def bottleneck(self) -> str:
+        if self.producer_stall_seconds > self.consumer_stall_seconds:
+            return 'export'
+        return 'generation'
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'chunks': self.chunks,
+            'rows': self.rows,
+            'wall_seconds': self.wall_seconds,
+            'produce_seconds': self.produce_seconds,
+            'consume_seconds': self.consume_seconds,
+            'producer_stall_seconds': self.producer_stall_seconds,
+            'consumer_stall_seconds': self.consumer_stall_seconds,
+            'queue_size': self.queue_size,
+            'max_queue_depth': self.max_queue_depth,
+            'mean_queue_depth': self.mean_queue_depth,
+            'bottleneck': self.bottleneck,
+        }
+
+    def __str__(self) -> str:
+        rate = self.rows / self.wall_seconds if self.wall_seconds else 0.0
+        return (
+            f"{self.rows:,} rows in {self.chunks} chunks, {self.wall_seconds:.2f}s ({rate:,.0f} rows/s); "
+            f"generate {self.produce_seconds:.2f}s, export {self.consume_seconds:.2f}s; "
+            f"stalls: producer {self.producer_stall_seconds:.2f}s, consumer {self.consumer_stall_seconds:.2f}s; "
+            f"queue depth max {self.max_queue_depth}/{self.queue_size}, mean {self.mean_queue_depth:.1f}; "
+            f"bottleneck: {self.bottleneck}"
+        )
+
+
+class Pipeline:
+    """Runs a chunk producer and a consumer concurrently through a bounded queue."""
+
+    def __init__(self, queue_size: int = 4, poll_interval: float = 0.1):
+        self.queue_size = max(1, queue_size)
+        self.poll_interval = poll_interval
+        self.stats: Optional[PipelineStats] = None
+
+    def run(
+        self,
+        chunks: Iterable[pd.DataFrame],
+        consume: Callable[[Iterator[pd.DataFrame]], Any]
+    ) -> Any:
+        """
+        Produce ``chunks`` on a background thread while ``consume`` runs on this one.
+
+        Args:
+            chunks: Chunk iterable, e.g. ``SyntheticDataEngine.generate_chunks(...)``
+            consume: Callable taking an iterator of chunks, e.g.
+                ``lambda stream: exporter.export(stream, path)``
+
+        Returns:
+            Whatever ``consume`` returns; metrics are left in ``self.stats``
+        """
+        stream = self.iterate(chunks)
+        try:
+            return consume(stream)
+        finally:
+            stream.close()
+
+    def iterate(self, chunks: Iterable[pd.DataFrame]) -> Iterator[pd.DataFrame]:
+        """
+        Generator form of ``run``: yields ``chunks`` produced on a background thread.
+
+        The producer starts on the first ``next()`` and is stopped when the
+        generator is exhausted or closed (e.g. an HTTP client disconnecting);
+        metrics are then left in ``self.stats``.
+        """
+        stats = PipelineStats(self.queue_size)
+        queue: Queue = Queue(maxsize=self.queue_size)
+        stop = threading.Event()
+        failure = []
+
+        def put(item: Any) -> bool:
+            waited = time.perf_counter()
+            while not stop.is_set():
+                try:
+                    queue.put(item, timeout=self.poll_interval)
+                    stats.producer_stall_seconds += time.perf_counter() - waited
+                    return True
+                except Full:
+                    continue
+            return False
+
+        def produce() -> None:
+            iterator = iter(chunks)
+            try:
+                while not stop.is_set():
+                    started = time.perf_counter()
+                    try:
+                        chunk = next(iterator)
+                    except StopIteration:
+                        break
+                    stats.produce_seconds += time.perf_counter() - started
+                    if not put(chunk):
+                        break
+            except BaseException as e:
+                failure.append(e)
+            finally:
+                # A consumer that stops early leaves the source suspended; close it here,
+                # on the thread that iterates it, so its cleanup (finally blocks) runs
+                close = getattr(iterator, 'close', None)
+                if close is not None:
+                    try:
+                        close()
+                    except BaseException as e:
+                        failure.append(e)
+                put(_DONE)
+
+        def stream() -> Iterator[pd.DataFrame]:
+            while True:
+                waited = time.perf_counter()
+                while True:
+                    try:
+                        item = queue.get(timeout=self.poll_interval)
+                        break
+                    except Empty:
+                        if not producer.is_alive() and queue.empty():
+                            item = _DONE
+                            break
+                stats.consumer_stall_seconds += time.perf_counter() - waited
+                if item is _DONE:
+                    if failure:
+                        raise failure[0]
+                    return
+                stats.chunks += 1
+                stats.rows += len(item)
+                stats.record_depth(queue.qsize() + 1)
+                yield item
+
+        started = time.perf_counter()
+        producer = threading.Thread(target=produce, name="chunk-producer", daemon=True)
+        producer.start()
+        try:
+            yield from stream()
+        finally:
+            stop.set()
+            producer.join()
+            stats.wall_seconds = time.perf_counter() - started
+            self.stats = stats
+            logger.info(f"Pipeline: {stats}")
+
+
+def run_pipeline(
+    chunks: Iterable[pd.DataFrame],
+    consume: Callable[[Iterator[pd.DataFrame]], Any],
+    queue_size: int = 4
+) -> Tuple[Any, PipelineStats]:
+    """Convenience wrapper returning ``(result, stats)``."""
+    pipeline = Pipeline(queue_size)
+    result = pipeline.run(chunks, consume)
+    return result, pipeline.stats
@@ -4,13 +4,18 @@ Now powered by NVIDIA Nemotron for intelligent prompt understanding.
 """
 import pandas as pd
 import numpy as np
-from typing import Dict, Any, List, Union
+from typing import Dict, Any, Iterable, List, Optional, Union
+import copy
 import json
 import re
 from datetime import datetime
 
+from ..utils.cache import LRUCache
 from ..utils.logger import get_logger
 from .nemotron_parser import NemotronPromptParser
+from .sketches import ColumnSketch
+from .data_types import DataTypeManager
+from ..generators.pattern_generator import learn_pattern
 
 logger = get_logger(__name__)
 
@@ -18,18 +23,23 @@ logger = get_logger(__name__)
 class SchemaInference:
     """Infer schema from different input sources."""
     
+    # Non-null unique ratio at or above which a key-like column is treated as an identifier
+    # (None disables detection)
+    identifier_ratio: Optional[float] = 0.95
+    identifier_min_rows = 20
+    # Key-like columns named like references (``customer_id``, ``OrderID``) are foreign keys
+    # and are pseudonymized with the same mapping even when they repeat
+    _KEY_NAME = re.compile(r"(?i:(?:^|[_\-\s])(?:id|key))$|[a-z0-9](?:Id|ID|Key)$")
+    # String columns at least this unique are checked for a learnable pattern (None disables)
+    pattern_unique_ratio: Optional[float] = 0.5
+    _KEY_LIKE = r"[\w\-.:/#]+"
+    
     def __init__(self):
-        self.type_mapping = {
-            'int64': 'integer',
-            'float64': 'float',
-            'object': 'string',
-            'bool': 'boolean',
-            'datetime64': 'datetime',
-            'timedelta64': 'timedelta',
-            'category': 'categorical'
-        }
+        self.type_mapping = DataTypeManager().type_mapping
         # Initialize Nemotron parser
         self.nemotron = NemotronPromptParser()
+        # Parsed prompt -> schema, so repeated prompts skip the LLM round trip
+        self.prompt_cache = LRUCache(256)
     
     def infer_from_field_list(self, prompt: str) -> Dict[str, Any]:
         """
@@ -41,6 +51,12 @@ class SchemaInference:
         Returns:
             Schema dictionary mapping field names to specifications
         """
+        key = " ".join(prompt.split())
+        schema = self.prompt_cache.get_or_create(key, lambda: self._parse_prompt(key))
+        # Callers may edit the schema; the cached copy stays pristine
+        return copy.deepcopy(schema)
+    
+    def _parse_prompt(self, prompt: str) -> Dict[str, Any]:
         logger.info(f"Parsing prompt with Nemotron: {prompt[:100]}...")
         
         # Use Nemotron to parse the prompt
@@ -72,19 +88,92 @@ class SchemaInference:
         logger.info(f"Generated schema with {len(schema)} fields")
         return schema
     
-    def infer_from_data(self, data: Union[pd.DataFrame, Dict[str, Any]]) -> Dict[str, Any]:
-        """Infer schema from existing data."""
+    def infer_from_data(
+        self,
+        data: Union[pd.DataFrame, Dict[str, Any]],
+        approximate: bool = False,
+        accuracy: float = 0.01,
+        chunk_size: int = 100_000
+    ) -> Dict[str, Any]:
+        """
+        Infer schema from existing data.
+        
+        Args:
+            data: DataFrame or dict of columns
+            approximate: Use streaming sketches instead of exact statistics (the frame
+                is already in memory; stream large files through ``infer_from_chunks``)
+            accuracy: Target relative error of the sketches (approximate mode)
+            chunk_size: Rows fed to the sketches at a time (approximate mode)
+            
+        Returns:
+            Schema dictionary mapping column names to specifications
+        """
         logger.info("Inferring schema from data")
         
         if isinstance(data, dict):
             data = pd.DataFrame(data)
         
+        if approximate:
+            chunks = (data.iloc[start:start + chunk_size] for start in range(0, len(data), chunk_size))
+            return self.infer_from_chunks(chunks, accuracy=accuracy)
+        
         schema = {}
         for column in data.columns:
             schema[column] = self._analyze_column(data[column])
         
         return schema
     
+    def build_sketches(
+        self,
+        chunks: Iterable[pd.DataFrame],
+        accuracy: float = 0.01
+    ) -> Dict[str, ColumnSketch]:
+        """
+        Build mergeable per-column sketches from an iterable of chunks.
+        
+        Sketches built by parallel readers can be combined with
+        ``ColumnSketch.merge`` and passed to ``schema_from_sketches``.
+        """
+        sketches: Dict[str, ColumnSketch] = {}
+        for chunk in chunks:
+            for column in chunk.columns:
+                if column not in sketches:
+                    series = chunk[column]
+                    sketches[column] = ColumnSketch(
+                        numeric=pd.api.types.is_numeric_dtype(series),
+                        accuracy=accuracy,
+                        dtype=series.dtype
+                    )
+                sketches[column].update(chunk[column])
+        return sketches
+    
+    def schema_from_sketches(self, sketches: Dict[str, ColumnSketch]) -> Dict[str, Any]:
+        """Turn (possibly merged) column sketches into a schema."""
+        schema = {}
+        for column, sketch in sketches.items():
+            schema[column] = {
+                'type': self._pandas_dtype_to_string(sketch.dtype),
+                'generator': 'statistical',
+                'constraints': {},
+                'statistics': sketch.statistics(),
+                'approximate': True
+            }
+            sample = pd.Series(list(sketch.frequent.top(100))) if not sketch.numeric else None
+            if sample is not None:
+                self._mark_pattern(schema[column], sketch.count, sketch.distinct.estimate(), sample)
+            self._mark_identifier(schema[column], sketch.dtype, sketch.count,
+                                  sketch.distinct.estimate(), sample, column)
+        return schema
+    
+    def infer_from_chunks(
+        self,
+        chunks: Iterable[pd.DataFrame],
+        accuracy: float = 0.01
+    ) -> Dict[str, Any]:
+        """Infer an approximate schema from a stream of DataFrame chunks."""
+        sketches = self.build_sketches(chunks, accuracy=accuracy)
+        return self.schema_from_sketches(sketches)
+    
     def _analyze_column(self, series: pd.Series) -> Dict[str, Any]:
         """Analyze pandas series to determine schema."""
         spec = {
@@ -107,13 +196,97 @@ class SchemaInference:
                 'max': float(series.max()),
                 'median': float(series.median())
             })
-        elif pd.api.types.is_categorical_dtype(series) or series.dtype == 'object':
+        elif (pd.api.types.is_categorical_dtype(series) or series.dtype == 'object'
+              or pd.api.types.is_string_dtype(series)):
             value_counts = series.value_counts()
             spec['statistics']['unique_count'] = int(series.nunique())
             spec['statistics']['top_values'] = value_counts.head(10).to_dict()
         
+        if (self.identifier_ratio is not None or self.pattern_unique_ratio is not None) and (
+            pd.api.types.is_integer_dtype(series) or 'unique_count' in spec['statistics']
+        ):
+            unique = spec['statistics'].get('unique_count')
+            if unique is None:
+                unique = int(series.nunique())
+            sample = None
+            if 'unique_count' in spec['statistics']:
+                non_null = series.dropna()
+                sample = non_null.sample(n=min(len(non_null), 1000), random_state=0)
+            if sample is not None:
+                self._mark_pattern(spec, spec['statistics']['count'], unique, sample)
+            self._mark_identifier(spec, series.dtype, spec['statistics']['count'], unique, sample, series.name)
+        
         return spec
     
+    def _mark_pattern(self, spec: Dict[str, Any], count: int, unique: int, sample: pd.Series) -> None:
+        """Turn a high-cardinality code-like string column into a ``pattern`` column."""
+        if self.pattern_unique_ratio is None or not count or unique / count < self.pattern_unique_ratio:
+            return
+        if not self._is_code_like(sample):
+            return
+        pattern = learn_pattern(sample)
+        if pattern is None:
+            return
+        spec.update({
+            'type': 'pattern',
+            'pattern': pattern,
+            'generator': 'pattern',
+            'statistical_generator': 'pattern',
+        })
+    
+    @staticmethod
+    def _is_code_like(sample: pd.Series) -> bool:
+        """
+        Whether string values look like codes (``INV-0042``, ``AB12CD``).
+        
+        Every value must contain a digit, digits must not be outnumbered more
+        than two to one by letters, and lengths may vary by at most two
+        characters. Names, usernames and e-mail addresses fail these checks and
+        keep their categorical/semantic generation instead of a learned regex.
+        """
+        values = sample.dropna().astype(str)
+        if values.empty or values.str.contains('@', regex=False).any():
+            return False
+        digits = values.str.count(r"[0-9]")
+        letters = values.str.count(r"[A-Za-z]")
+        lengths = values.str.len()
+        return bool((digits > 0).all() and digits.sum() * 2 >= letters.sum()
+                    and lengths.max() - lengths.min() <= 2)
+    
+    def _mark_identifier(
+        self,
+        spec: Dict[str, Any],
+        dtype: Any,
+        count: int,
+        unique: int,
+        sample: Optional[pd.Series],
+        name: Any = None
+    ) -> None:
+        """
+        Flag key columns so they are pseudonymized instead of resampled.
+        
+        Near-unique columns are primary keys: integers qualify when their range
+        is dense (sequential or near-sequential keys, not measurements that
+        merely happen to be distinct), strings when they look like codes
+        rather than free text. Repeating key-like columns whose name marks them
+        as a reference are foreign keys.
+        """
+        if self.identifier_ratio is None or count < self.identifier_min_rows:
+            return
+        primary = unique / count >= self.identifier_ratio
+        if not primary and not self._KEY_NAME.search(str(name)):
+            return
+        if pd.api.types.is_integer_dtype(dtype):
+            stats = spec['statistics']
+            if primary and (stats.get('max') is None or stats['max'] - stats['min'] + 1 > 10 * count):
+                return
+        elif pd.api.types.is_numeric_dtype(dtype) or sample is None:
+            return
+        elif sample.empty or not sample.astype(str).str.fullmatch(self._KEY_LIKE).all():
+            return
+        spec['identifier'] = 'primary' if primary else 'foreign'
+        spec['statistical_generator'] = 'pseudonym'
+    
     def _pandas_dtype_to_string(self, dtype) -> str:
         """Convert pandas dtype to string type."""
         dtype_str = str(dtype)
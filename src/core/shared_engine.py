@@ -0,0 +1,52 @@
+"""
+Application-scoped engine for long-running servers.
+
+Building a ``SyntheticDataEngine`` loads the prompt parser (OpenAI client,
+``.env``), schema inference and generators. A server builds one base engine
+at startup and hands every request a ``fork()`` of it: forks are shallow
+copies sharing the generators, prompt→schema cache and fitted-model cache,
+but with their own per-run results (``last_fidelity`` etc.), so concurrent
+requests never see each other's reports. Forking costs microseconds, so no
+idle engines are pooled and requests never wait for one.
+"""
+from typing import Callable, Optional
+
+from .engine import SyntheticDataEngine
+from ..utils.config import Config
+from ..utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class SharedEngine:
+    """
+    One base engine handing out per-request forks.
+
+    Args:
+        config: Engine configuration
+        setup: Called once with the base engine, e.g. to register generators
+    """
+
+    def __init__(
+        self,
+        config: Optional[Config] = None,
+        setup: Optional[Callable[[SyntheticDataEngine], None]] = None
+    ):
+        self.base = SyntheticDataEngine(config)
+        if setup is not None:
+            setup(self.base)
+        logger.info("Shared engine ready")
+
+    @property
+    def config(self) -> Config:
+        return self.base.config
+
+    def engine(self) -> SyntheticDataEngine:
+        """Engine for one request (or job); discard it when done."""
+        return self.base.fork()
+
+    def cache_stats(self) -> dict:
+        return {
+            'prompt_schemas': self.base.schema_inference.prompt_cache.stats(),
+            'fitted_models': self.base.generators['file'].models.stats(),
+        }
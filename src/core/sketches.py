@@ -0,0 +1,316 @@
+"""
+Streaming, mergeable sketches for approximate schema inference.
+Each sketch consumes pandas chunks with vectorized updates and can be merged
+with another sketch of the same configuration, so parallel chunk readers can
+analyse parts of a file independently and combine the results.
+"""
+import math
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+# Powers of two used to compute bit lengths of uint64 hashes without floats
+_POWERS_OF_TWO = np.array([1 << i for i in range(64)], dtype=np.uint64)
+
+
+def _hash_values(values: pd.Series) -> np.ndarray:
+    """Hash a series to uint64 using pandas' vectorized SipHash."""
+    return pd.util.hash_pandas_object(values, index=False).to_numpy(dtype=np.uint64)
+
+
+class HyperLogLog:
+    """HyperLogLog distinct counter with 2**precision registers."""
+
+    def __init__(self, precision: int = 14):
+        if not 4 <= precision <= 18:
+            raise ValueError("HyperLogLog precision must be between 4 and 18")
+        self.precision = precision
+        self.num_registers = 1 << precision
+        self.registers = np.zeros(self.num_registers, dtype=np.uint8)
+
+    @classmethod
+    def from_error(cls, relative_error: float) -> "HyperLogLog":
+        """Create a sketch whose standard error is about ``relative_error``."""
+        precision = int(math.ceil(2 * math.log2(1.04 / relative_error)))
+        return cls(min(18, max(4, precision)))
+
+    def update(self, values: pd.Series) -> None:
+        """Add all non-null values of a series."""
+        values = values.dropna()
+        if values.empty:
+            return
+        hashes = _hash_values(values)
+        suffix_bits = 64 - self.precision
+        index = (hashes >> np.uint64(suffix_bits)).astype(np.int64)
+        remainder = hashes & np.uint64((1 << suffix_bits) - 1)
+        bit_length = np.searchsorted(_POWERS_OF_TWO, remainder, side="right")
+        rank = (suffix_bits - bit_length + 1).astype(np.uint8)
+        np.maximum.at(self.registers, index, rank)
+
+    def merge(self, other: "HyperLogLog") -> "HyperLogLog":
+        """Merge another sketch of the same precision into this one."""
+        if other.precision != self.precision:
+            raise ValueError("Cannot merge HyperLogLog sketches with different precision")
+        np.maximum(self.registers, other.registers, out=self.registers)
+        return self
+
+    def estimate(self) -> int:
+        """Estimate the number of distinct values seen."""
+        m = self.num_registers
+        alpha = 0.7213 / (1 + 1.079 / m)
+        raw = alpha * m * m / np.sum(np.power(2.0, -self.registers.astype(np.float64)))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if raw <= 2.5 * m and zeros:
+            # Small-range correction (linear counting)
+            return int(round(m * math.log(m / zeros)))
+        return int(round(raw))
+
+
+class KLLSketch:
+    """KLL quantile sketch built from a hierarchy of sorted compactors."""
+
+    def __init__(self, k: int = 200, seed: Optional[int] = None):
+        if k < 8:
+            raise ValueError("KLL parameter k must be at least 8")
+        self.k = k
+        self.count = 0
+        self.compactors: List[np.ndarray] = [np.empty(0, dtype=np.float64)]
+        self._rng = np.random.default_rng(seed)
+
+    @classmethod
+    def from_error(cls, rank_error: float) -> "KLLSketch":
+        """Create a sketch whose normalized rank error is about ``rank_error``."""
+        return cls(max(8, int(math.ceil(3.3 / rank_error))))
+
+    def _capacity(self, level: int) -> int:
+        depth = len(self.compactors) - level - 1
+        return max(2, int(math.ceil(self.k * (2.0 / 3.0) ** depth)))
+
+    def _compress(self) -> None:
+        level = 0
+        while level < len(self.compactors):
+            items = self.compactors[level]
+            if len(items) > self._capacity(level):
+                if level + 1 == len(self.compactors):
+                    self.compactors.append(np.empty(0, dtype=np.float64))
+                items = np.sort(items)
+                keep = items[-1:] if len(items) % 2 else items[:0]
+                paired = items[:len(items) - len(keep)]
+                promoted = paired[int(self._rng.integers(2))::2]
+                self.compactors[level] = keep
+                self.compactors[level + 1] = np.concatenate([self.compactors[level + 1], promoted])
+            level += 1
+
+    def update(self, values: pd.Series) -> None:
+        """Add all non-null numeric values of a series."""
+        values = pd.to_numeric(values, errors="coerce").dropna().to_numpy(dtype=np.float64)
+        if values.size == 0:
+            return
+        self.count += int(values.size)
+        self.compactors[0] = np.concatenate([self.compactors[0], values])
+        self._compress()
+
+    def merge(self, other: "KLLSketch") -> "KLLSketch":
+        """Merge another sketch into this one."""
+        while len(self.compactors) < len(other.compactors):
+            self.compactors.append(np.empty(0, dtype=np.float64))
+        for level, items in enumerate(other.compactors):
+            self.compactors[level] = np.concatenate([self.compactors[level], items])
+        self.count += other.count
+        self._compress()
+        return self
+
+    def quantiles(self, qs: List[float]) -> List[Optional[float]]:
+        """Return approximate values at the requested quantiles."""
+        if self.count == 0:
+            return [None for _ in qs]
+        values = np.concatenate(self.compactors)
+        weights = np.concatenate([
+            np.full(len(items), 2 ** level, dtype=np.float64)
+            for level, items in enumerate(self.compactors)
+        ])
+        order = np.argsort(values, kind="mergesort")
+        values, cumulative = values[order], np.cumsum(weights[order])
+        targets = np.asarray(qs, dtype=np.float64) * cumulative[-1]
+        positions = np.searchsorted(cumulative, targets, side="left")
+        positions = np.clip(positions, 0, len(values) - 1)
+        return [float(v) for v in values[positions]]
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Return the approximate value at quantile ``q``."""
+        return self.quantiles([q])[0]
+
+
+class FrequentItemsSketch:
+    """
+    Bounded heavy-hitter counter (Misra-Gries summary).
+    Keeps at most ``capacity`` counters. Each chunk is counted and combined
+    with the summary; when more than ``capacity`` items remain, the
+    (capacity + 1)-th largest count is subtracted from all counters and
+    non-positive ones are dropped. Reported counts are lower bounds that
+    underestimate the true frequency by at most ``max_error``, which stays
+    below total / (capacity + 1). Summaries merge the same way.
+    """
+
+    def __init__(self, capacity: int = 1000):
+        if capacity < 1:
+            raise ValueError("FrequentItemsSketch capacity must be at least 1")
+        self.capacity = capacity
+        self.counts = pd.Series(dtype=np.int64)
+        self.max_error = 0
+
+    def _reduce(self) -> None:
+        if len(self.counts) > self.capacity:
+            ordered = np.sort(self.counts.to_numpy())[::-1]
+            threshold = int(ordered[self.capacity])
+            self.counts = self.counts - threshold
+            self.counts = self.counts[self.counts > 0]
+            self.max_error += threshold
+
+    def update(self, values: pd.Series) -> None:
+        """Add all non-null values of a series."""
+        chunk_counts = values.value_counts(dropna=True)
+        if chunk_counts.empty:
+            return
+        self._combine(chunk_counts.astype(np.int64))
+
+    def _combine(self, counts: pd.Series) -> None:
+        if self.counts.empty:
+            self.counts = counts
+        else:
+            self.counts = pd.concat([self.counts, counts]).groupby(level=0, sort=False).sum()
+        self._reduce()
+
+    def merge(self, other: "FrequentItemsSketch") -> "FrequentItemsSketch":
+        """Merge another sketch into this one."""
+        self.max_error += other.max_error
+        if not other.counts.empty:
+            self._combine(other.counts)
+        return self
+
+    def top(self, n: int = 10) -> Dict[Any, int]:
+        """Return the ``n`` most frequent items with their (lower-bound) counts."""
+        return {key: int(count) for key, count in self.counts.nlargest(n).items()}
+
+
+class RowSample:
+    """
+    Fixed-size uniform sample of the rows of a chunked table (bottom-k sampling).
+    Every row gets a random priority and the ``size`` rows with the smallest
+    priorities are kept, so memory stays bounded however many chunks are
+    added, and samples of disjoint parts merge into a sample of the whole.
+    """
+
+    def __init__(self, size: int = 100_000, seed: Optional[int] = 0):
+        self.size = size
+        self.rows: Optional[pd.DataFrame] = None
+        self.priorities = np.empty(0, dtype=np.float64)
+        self._rng = np.random.default_rng(seed)
+
+    def update(self, chunk: pd.DataFrame) -> None:
+        """Offer all rows of a chunk to the sample."""
+        self._combine(chunk.reset_index(drop=True), self._rng.random(len(chunk)))
+
+    def _combine(self, rows: pd.DataFrame, priorities: np.ndarray) -> None:
+        if self.rows is not None:
+            rows = pd.concat([self.rows, rows], ignore_index=True)
+            priorities = np.concatenate([self.priorities, priorities])
+        if len(priorities) > self.size:
+            keep = np.sort(np.argpartition(priorities, self.size)[:self.size])
+            rows = rows.iloc[keep].reset_index(drop=True)
+            priorities = priorities[keep]
+        self.rows, self.priorities = rows, priorities
+
+    def merge(self, other: "RowSample") -> "RowSample":
+        """Merge a sample of another part of the same table into this one."""
+        if other.rows is not None:
+            self._combine(other.rows, other.priorities)
+        return self
+
+    def sample(self) -> pd.DataFrame:
+        """The sampled rows (in the order they were added)."""
+        return self.rows if self.rows is not None else pd.DataFrame()
+
+
+class ColumnSketch:
+    """All sketches needed to summarise one column, updated chunk by chunk."""
+
+    def __init__(self, numeric: bool, accuracy: float = 0.01, top_k_capacity: int = 1000,
+                 dtype: Any = None):
+        self.numeric = numeric
+        self.dtype = dtype
+        self.accuracy = accuracy
+        self.count = 0
+        self.null_count = 0
+        self.distinct = HyperLogLog.from_error(accuracy)
+        if numeric:
+            self.mean = 0.0
+            self.m2 = 0.0
+            self.min: Optional[float] = None
+            self.max: Optional[float] = None
+            self.quantiles = KLLSketch.from_error(accuracy)
+        else:
+            self.frequent = FrequentItemsSketch(top_k_capacity)
+
+    def update(self, series: pd.Series) -> None:
+        """Consume one chunk of the column."""
+        non_null = series.dropna()
+        self.null_count += len(series) - len(non_null)
+        if non_null.empty:
+            return
+        self.distinct.update(non_null)
+        if self.numeric:
+            values = non_null.to_numpy(dtype=np.float64)
+            self._update_moments(len(values), float(values.mean()),
+                                 float(((values - values.mean()) ** 2).sum()),
+                                 float(values.min()), float(values.max()))
+            self.quantiles.update(non_null)
+        else:
+            self.count += len(non_null)
+            self.frequent.update(non_null)
+
+    def _update_moments(self, n: int, mean: float, m2: float, lo: float, hi: float) -> None:
+        # Chan et al. parallel variance combination
+        total = self.count + n
+        delta = mean - self.mean
+        self.mean += delta * n / total
+        self.m2 += m2 + delta * delta * self.count * n / total
+        self.count = total
+        self.min = lo if self.min is None else min(self.min, lo)
+        self.max = hi if self.max is None else max(self.max, hi)
+
+    def merge(self, other: "ColumnSketch") -> "ColumnSketch":
+        """Merge a sketch of the same column built from another chunk range."""
+        self.null_count += other.null_count
+        self.distinct.merge(other.distinct)
+        if self.numeric:
+            if other.count:
+                self._update_moments(other.count, other.mean, other.m2, other.min, other.max)
+            self.quantiles.merge(other.quantiles)
+        else:
+            self.count += other.count
+            self.frequent.merge(other.frequent)
+        return self
+
+    def statistics(self) -> Dict[str, Any]:
+        """Summarise the sketch in the same shape as exact schema statistics."""
+        total = self.count + self.null_count
+        stats: Dict[str, Any] = {
+            'count': int(self.count),
+            'null_count': int(self.null_count),
+            'null_percentage': float(self.null_count / total) if total else 0.0,
+        }
+        if self.numeric:
+            std = math.sqrt(self.m2 / (self.count - 1)) if self.count > 1 else float('nan')
+            stats.update({
+                'mean': float(self.mean) if self.count else float('nan'),
+                'std': std,
+                'min': float(self.min) if self.min is not None else float('nan'),
+                'max': float(self.max) if self.max is not None else float('nan'),
+                'median': self.quantiles.quantile(0.5),
+            })
+        else:
+            stats['unique_count'] = self.distinct.estimate()
+            stats['top_values'] = self.frequent.top(10)
+        return stats
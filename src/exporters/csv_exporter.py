@@ -6,9 +6,48 @@
 #         Path(file_path).parent.mkdir(parents=True, exist_ok=True)
 #         data.to_csv(file_path, index=False)
 
-from pathlib import Path
+from .streaming import DEFAULT_BUFFER_SIZE, infer_compression, iter_chunks, open_output, write_chunks
+
 
 class CSVExporter:
+    """
+    Writes a DataFrame or a stream of DataFrame chunks to CSV with one header.
+
+    Compression ('gzip'/'zstd') is inferred from a ``.gz``/``.zst`` suffix
+    unless given explicitly; memory use is bounded by a few chunks.
+    """
+
+    def __init__(self, compression='infer', compression_level=None, compression_threads=0,
+                 buffer_size=DEFAULT_BUFFER_SIZE, background=True):
+        self.compression = compression
+        self.compression_level = compression_level
+        self.compression_threads = compression_threads
+        self.buffer_size = buffer_size
+        self.background = background
+
+    @staticmethod
+    def _encode(chunk, columns):
+        """UTF-8 CSV for one chunk; the header is emitted for the first chunk only."""
+        if not columns:
+            columns.extend(chunk.columns)
+            header = True
+        elif list(chunk.columns) != columns:
+            raise ValueError(f"Chunk columns {list(chunk.columns)} do not match header {columns}")
+        else:
+            header = False
+        return chunk.to_csv(index=False, header=header).encode('utf-8')
+
+    def encode(self, data):
+        """Yield the CSV bytes of ``data`` chunk by chunk (uncompressed), e.g. for an HTTP response."""
+        columns = []
+        for chunk in iter_chunks(data):
+            yield self._encode(chunk, columns)
+
     def export(self, data, file_path):
-        Path(file_path).parent.mkdir(parents=True, exist_ok=True)
-        data.to_csv(file_path, index=False)
\ No newline at end of file
+        """Write ``data`` (DataFrame or iterable of chunks); returns the number of rows written."""
+        compression = infer_compression(file_path, self.compression)
+        with open_output(file_path, compression, self.compression_level,
+                         self.compression_threads, self.buffer_size) as stream:
+            columns = []
+            return write_chunks(iter_chunks(data), lambda chunk: stream.write(self._encode(chunk, columns)),
+                                background=self.background)
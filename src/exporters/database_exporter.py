@@ -0,0 +1,171 @@
+import csv
+import io
+import threading
+import time
+
+from sqlalchemy import (BigInteger, Boolean, Column, DateTime, Float, MetaData, Table, Text,
+                        create_engine, inspect)
+from sqlalchemy.pool import StaticPool
+
+from .streaming import column_values, iter_chunks, write_chunks
+from ..core.cross_constraints import column_specs
+from ..core.data_types import DataTypeManager
+from ..utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+SQL_TYPES = {
+    'integer': BigInteger,
+    'float': Float,
+    'boolean': Boolean,
+    'datetime': DateTime,
+    'string': Text,
+    'pattern': Text,
+    'categorical': Text,
+}
+
+_ENGINES = {}
+_ENGINES_LOCK = threading.Lock()
+
+
+def get_engine(url):
+    """Return a pooled SQLAlchemy engine for ``url``, shared by every exporter in the process."""
+    with _ENGINES_LOCK:
+        if url not in _ENGINES:
+            if url.startswith('sqlite') and (url.rstrip('/') == 'sqlite:' or ':memory:' in url):
+                # One shared connection, or each pooled connection would see its own empty database
+                _ENGINES[url] = create_engine(url, poolclass=StaticPool,
+                                              connect_args={'check_same_thread': False})
+            else:
+                _ENGINES[url] = create_engine(url, pool_pre_ping=True)
+        return _ENGINES[url]
+
+
+class DatabaseExporter:
+    """
+    Bulk-loads a DataFrame or chunks of DataFrames into a database table.
+
+    The table is created from the schema's column types (or the first chunk's
+    dtypes). Rows go in with batched DB-API ``executemany`` on positional
+    tuples built column-wise; PostgreSQL (psycopg2) uses ``COPY FROM STDIN``
+    and SQL Server (pyodbc) ``fast_executemany``. A transaction is committed
+    every ``transaction_rows`` rows. Throughput is logged and kept in
+    ``last_stats``.
+    """
+
+    def __init__(self, url, schema=None, if_exists='fail', batch_size=10_000, transaction_rows=100_000,
+                 background=True):
+        if if_exists not in ('fail', 'replace', 'append'):
+            raise ValueError(f"Unsupported if_exists: {if_exists}")
+        self.engine = get_engine(url)
+        self.schema = column_specs(schema) if schema else None
+        self.if_exists = if_exists
+        self.batch_size = batch_size
+        self.transaction_rows = transaction_rows
+        self.background = background
+        self.last_stats = {}
+
+    def table_for(self, name, chunk):
+        """Build the SQLAlchemy table definition for ``chunk``'s columns."""
+        type_manager = DataTypeManager()
+        columns = []
+        for column in chunk.columns:
+            spec = (self.schema or {}).get(column, {})
+            data_type = spec.get('type') or type_manager.infer_type(chunk[column])
+            columns.append(Column(str(column), SQL_TYPES.get(data_type, Text)()))
+        return Table(name, MetaData(), *columns)
+
+    def create_table(self, table):
+        exists = inspect(self.engine).has_table(table.name)
+        if exists and self.if_exists == 'fail':
+            raise ValueError(f"Table {table.name} already exists")
+        if exists and self.if_exists == 'replace':
+            table.drop(self.engine)
+        table.create(self.engine, checkfirst=True)
+
+    def export(self, data, table_name):
+        """Insert ``data`` (DataFrame or iterable of chunks) into ``table_name``; returns rows inserted."""
+        state = {'table': None, 'connection': None, 'transaction': None, 'pending': 0}
+        started = time.perf_counter()
+
+        def commit():
+            if state['transaction'] is not None:
+                state['transaction'].commit()
+                state['connection'].close()
+                state['transaction'] = state['connection'] = None
+                state['pending'] = 0
+
+        def write(chunk):
+            if state['table'] is None:
+                state['table'] = self.table_for(table_name, chunk)
+                self.create_table(state['table'])
+            for start in range(0, len(chunk), self.batch_size):
+                if state['connection'] is None:
+                    state['connection'] = self.engine.connect()
+                    state['transaction'] = state['connection'].begin()
+                batch = chunk.iloc[start:start + self.batch_size]
+                self._insert(state['connection'], state['table'], batch)
+                state['pending'] += len(batch)
+                if state['pending'] >= self.transaction_rows:
+                    commit()
+
+        try:
+            rows = write_chunks(iter_chunks(data), write, background=self.background)
+            commit()
+        except BaseException:
+            if state['transaction'] is not None:
+                state['transaction'].rollback()
+                state['connection'].close()
+            raise
+
+        seconds = time.perf_counter() - started
+        self.last_stats = {
+            'rows': rows,
+            'seconds': seconds,
+            'rows_per_second': rows / seconds if seconds > 0 else float('inf'),
+        }
+        logger.info(f"Loaded {rows:,} rows into {table_name} in {seconds:.2f}s "
+                    f"({self.last_stats['rows_per_second']:,.0f} rows/s)")
+        return rows
+
+    def _insert(self, connection, table, batch):
+        if not len(batch):
+            return
+        dialect = self.engine.dialect
+        raw = connection.connection.dbapi_connection
+        if dialect.name == 'postgresql' and dialect.driver == 'psycopg2':
+            self._copy_postgres(raw, dialect, table, batch)
+            return
+
+        compiled = table.insert().compile(dialect=dialect)
+        values = [column_values(batch[name]) for name in batch.columns]
+        if compiled.positional:
+            params = list(zip(*values))
+        else:
+            names = [column.key for column in table.columns]
+            params = [dict(zip(names, row)) for row in zip(*values)]
+        cursor = raw.cursor()
+        try:
+            if dialect.driver == 'pyodbc':
+                cursor.fast_executemany = True
+            cursor.executemany(str(compiled), params)
+        finally:
+            cursor.close()
+
+    @staticmethod
+    def _copy_postgres(raw, dialect, table, batch):
+        """Native PostgreSQL bulk path: COPY the batch as CSV."""
+        buffer = io.StringIO()
+        batch.to_csv(buffer, index=False, header=False, quoting=csv.QUOTE_MINIMAL, na_rep='\\N')
+        buffer.seek(0)
+        # Names come from user files; let the dialect quote them (embedded quotes are doubled)
+        preparer = dialect.identifier_preparer
+        columns = ', '.join(preparer.format_column(column) for column in table.columns)
+        cursor = raw.cursor()
+        try:
+            cursor.copy_expert(
+                f'COPY {preparer.format_table(table)} ({columns}) FROM STDIN WITH (FORMAT csv, NULL \'\\N\')',
+                buffer
+            )
+        finally:
+            cursor.close()
@@ -1,5 +1,101 @@
-import pandas as pd
+from .streaming import column_values, iter_chunks, open_output, write_chunks
+
+try:
+    import xlsxwriter
+except ImportError:  # openpyxl (write-only mode) is the fallback
+    xlsxwriter = None
+
+# Excel's hard row limit per worksheet (header included)
+EXCEL_MAX_ROWS = 1_048_576
+
+
+class _XlsxWriterBook:
+    def __init__(self, stream):
+        self.workbook = xlsxwriter.Workbook(stream, {
+            'constant_memory': True,
+            'default_date_format': 'yyyy-mm-dd hh:mm:ss',
+            'strings_to_numbers': False,
+            'strings_to_formulas': False,
+            'strings_to_urls': False,
+        })
+        self.sheet = None
+
+    def add_sheet(self, name):
+        self.sheet = self.workbook.add_worksheet(name)
+
+    def write_rows(self, start, rows):
+        write_row = self.sheet.write_row
+        for offset, row in enumerate(rows):
+            write_row(start + offset, 0, row)
+
+    def close(self):
+        self.workbook.close()
+
+
+class _OpenpyxlBook:
+    def __init__(self, stream):
+        from openpyxl import Workbook
+        self.stream = stream
+        self.workbook = Workbook(write_only=True)
+        self.sheet = None
+
+    def add_sheet(self, name):
+        self.sheet = self.workbook.create_sheet(name)
+
+    def write_rows(self, start, rows):
+        append = self.sheet.append
+        for row in rows:
+            append(row)
+
+    def close(self):
+        self.workbook.save(self.stream)
+
 
 class ExcelExporter:
+    """
+    Streams a DataFrame or chunks of DataFrames into an .xlsx workbook in constant memory.
+
+    Uses xlsxwriter's constant_memory mode when installed, otherwise openpyxl's
+    write-only mode. When a sheet reaches Excel's row limit the writer rolls
+    over to ``<sheet_name>_2``, ``<sheet_name>_3``, ... each with its own header.
+    Values are converted to native types once per column, so numbers and dates
+    land as typed cells rather than text.
+    """
+
+    def __init__(self, sheet_name='Sheet1', max_rows_per_sheet=EXCEL_MAX_ROWS, background=True):
+        self.sheet_name = sheet_name
+        self.max_rows_per_sheet = max_rows_per_sheet
+        self.background = background
+
     def export(self, data, file_path):
-        data.to_excel(file_path, index=False)
\ No newline at end of file
+        """Write ``data`` (DataFrame or iterable of chunks); returns the number of rows written."""
+        capacity = self.max_rows_per_sheet - 1
+        with open_output(file_path) as stream:
+            book = _XlsxWriterBook(stream) if xlsxwriter is not None else _OpenpyxlBook(stream)
+            state = {'sheets': 0, 'row': capacity, 'columns': None}
+
+            def write(chunk):
+                if state['columns'] is None:
+                    state['columns'] = [str(c) for c in chunk.columns]
+                columns = [column_values(chunk[name]) for name in chunk.columns]
+                rows = list(zip(*columns)) if columns else [()] * len(chunk)
+                while rows:
+                    if state['row'] >= capacity:
+                        state['sheets'] += 1
+                        suffix = '' if state['sheets'] == 1 else f"_{state['sheets']}"
+                        # Sheet names are limited to 31 characters
+                        book.add_sheet(self.sheet_name[:31 - len(suffix)] + suffix)
+                        book.write_rows(0, [state['columns']])
+                        state['row'] = 0
+                    take = rows[:capacity - state['row']]
+                    book.write_rows(state['row'] + 1, take)
+                    state['row'] += len(take)
+                    rows = rows[len(take):]
+
+            rows = write_chunks(iter_chunks(data), write, background=self.background)
+            if state['sheets'] == 0:
+                book.add_sheet(self.sheet_name)
+                if state['columns']:
+                    book.write_rows(0, [state['columns']])
+            book.close()
+            return rows
@@ -1,7 +1,86 @@
-import json
-import pandas as pd
+from pathlib import Path
+
+from .streaming import DEFAULT_BUFFER_SIZE, infer_compression, iter_chunks, open_output, write_chunks
+
+LINES_SUFFIXES = ('.jsonl', '.ndjson')
+
 
 class JSONExporter:
+    """
+    Streams a DataFrame or chunks of DataFrames as JSON Lines or a JSON array.
+
+    Chunks are serialized by pandas' C JSON encoder straight from the column
+    blocks, with no per-row Python dicts. ``lines='infer'`` writes NDJSON for
+    ``.jsonl``/``.ndjson`` paths (also when compressed) and an array of records
+    otherwise. Arrays have one record per line, or no whitespace at all with
+    ``compact=True`` (handy for API fixtures).
+    """
+
+    def __init__(self, lines='infer', compact=False, compression='infer', compression_level=None,
+                 compression_threads=0, buffer_size=DEFAULT_BUFFER_SIZE, background=True):
+        self.lines = lines
+        self.compact = compact
+        self.compression = compression
+        self.compression_level = compression_level
+        self.compression_threads = compression_threads
+        self.buffer_size = buffer_size
+        self.background = background
+
+    def _lines(self, file_path, compression):
+        if self.lines != 'infer':
+            return bool(self.lines)
+        name = Path(file_path).name.lower()
+        if compression:
+            name = Path(name).stem
+        return name.endswith(LINES_SUFFIXES)
+
+    @staticmethod
+    def serialize(chunk):
+        """NDJSON text for one chunk (JSON strings never contain raw newlines)."""
+        return chunk.to_json(orient='records', lines=True, date_format='iso',
+                             double_precision=15, force_ascii=False)
+
+    def _encode(self, chunk, lines, started):
+        """UTF-8 JSON for one chunk: NDJSON lines, or array records with their separators."""
+        if not len(chunk):
+            return b''
+        text = self.serialize(chunk).rstrip('\n')
+        if lines:
+            text += '\n'
+        else:
+            separator = ',' if self.compact else ',\n'
+            text = ('' if not started else separator) + text.replace('\n', separator)
+            started.append(True)
+        return text.encode('utf-8')
+
+    def _brackets(self, lines):
+        if lines:
+            return b'', b''
+        return (b'[', b']') if self.compact else (b'[\n', b'\n]\n')
+
+    def encode(self, data, lines=True):
+        """Yield the JSON bytes of ``data`` chunk by chunk (uncompressed), e.g. for an HTTP response."""
+        opening, closing = self._brackets(lines)
+        started = []
+        if opening:
+            yield opening
+        for chunk in iter_chunks(data):
+            piece = self._encode(chunk, lines, started)
+            if piece:
+                yield piece
+        if closing:
+            yield closing
+
     def export(self, data, file_path):
-        with open(file_path, 'w') as f:
-            json.dump(data.to_dict(orient='records'), f, indent=2)
\ No newline at end of file
+        """Write ``data`` (DataFrame or iterable of chunks); returns the number of rows written."""
+        compression = infer_compression(file_path, self.compression)
+        lines = self._lines(file_path, compression)
+        opening, closing = self._brackets(lines)
+        with open_output(file_path, compression, self.compression_level,
+                         self.compression_threads, self.buffer_size) as stream:
+            started = []
+            stream.write(opening)
+            rows = write_chunks(iter_chunks(data), lambda chunk: stream.write(self._encode(chunk, lines, started)),
+                                background=self.background)
+            stream.write(closing)
+            return rows
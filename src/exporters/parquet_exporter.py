@@ -0,0 +1,76 @@
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from .streaming import DEFAULT_BUFFER_SIZE, iter_chunks, open_output, write_chunks
+
+
+class ParquetExporter:
+    """
+    Writes a DataFrame or a stream of DataFrame chunks to Parquet.
+
+    Each chunk becomes one row group (split further if larger than
+    ``row_group_size``). Low-cardinality columns (categoricals, and string
+    columns whose first chunk has at most ``dictionary_ratio`` distinct values
+    per row) are dictionary-encoded; min/max/null-count statistics are written
+    for every column so readers can skip row groups. Empty input still
+    produces a valid file: an empty frame keeps its columns, no chunks at all
+    give a file without columns (as CSV writes an empty file).
+    """
+
+    def __init__(self, compression='snappy', compression_level=None, row_group_size=None,
+                 dictionary_ratio=0.5, buffer_size=DEFAULT_BUFFER_SIZE, background=True):
+        self.compression = compression
+        self.compression_level = compression_level
+        self.row_group_size = row_group_size
+        self.dictionary_ratio = dictionary_ratio
+        self.buffer_size = buffer_size
+        self.background = background
+
+    def dictionary_columns(self, chunk):
+        """Columns worth dictionary-encoding, judged on one chunk."""
+        columns = []
+        for name in chunk.columns:
+            series = chunk[name]
+            if str(series.dtype) == 'category':
+                columns.append(name)
+            elif series.dtype == object or str(series.dtype).startswith('string'):
+                if len(series) and series.nunique() <= self.dictionary_ratio * len(series):
+                    columns.append(name)
+        return columns
+
+    @staticmethod
+    def plain_schema(table):
+        """Schema with dictionary columns decoded, so chunks with different categories line up."""
+        return pa.schema([
+            field.with_type(field.type.value_type) if pa.types.is_dictionary(field.type) else field
+            for field in table.schema
+        ])
+
+    def export(self, data, file_path):
+        """Write ``data`` (DataFrame or iterable of chunks); returns the number of rows written."""
+        with open_output(file_path, buffer_size=self.buffer_size) as stream:
+            state = {}
+
+            def write(chunk):
+                table = pa.Table.from_pandas(chunk, preserve_index=False)
+                if 'writer' not in state:
+                    state['schema'] = self.plain_schema(table)
+                    state['writer'] = pq.ParquetWriter(
+                        stream,
+                        state['schema'],
+                        compression=self.compression,
+                        compression_level=self.compression_level,
+                        use_dictionary=self.dictionary_columns(chunk),
+                        write_statistics=True,
+                    )
+                state['writer'].write_table(table.cast(state['schema']),
+                                            row_group_size=self.row_group_size or max(len(table), 1))
+
+            try:
+                rows = write_chunks(iter_chunks(data), write, background=self.background)
+                if 'writer' not in state:
+                    state['writer'] = pq.ParquetWriter(stream, pa.schema([]), compression=self.compression)
+            finally:
+                if 'writer' in state:
+                    state['writer'].close()
+            return rows
@@ -0,0 +1,281 @@
+"""
+Partitioned multi-file output on top of the streaming exporters.
+
+Rows of every incoming chunk are routed (one vectorized ``groupby`` per
+chunk) to per-partition writers laid out Hive-style, e.g.
+``out/store=12/date=2024-01-31/part-00000.parquet``. Each open writer runs
+an exporter on a thread-pool worker fed by a small bounded queue. At most
+``max_open_files`` writers are open at once; the least recently used one is
+finished when another partition needs a slot. Files also roll over after
+``max_rows_per_file`` rows or an estimated ``target_file_bytes``. A
+``_manifest.json`` lists every file with its partition values, row count,
+size and SHA-256 checksum. If the export fails, every writer is stopped,
+the files of the run are removed and no manifest is written.
+"""
+import json
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from queue import Full, Queue
+from typing import Any, Dict, List, Optional, Tuple, Union
+from urllib.parse import quote
+
+import pandas as pd
+
+from .csv_exporter import CSVExporter
+from .excel_exporter import ExcelExporter
+from .json_exporter import JSONExporter
+from .parquet_exporter import ParquetExporter
+from .streaming import Chunks, iter_chunks
+from ..core.file_loader import file_digest
+from ..utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+MANIFEST_NAME = "_manifest.json"
+
+# format -> (exporter class, file extension)
+FORMATS = {
+    'csv': (CSVExporter, '.csv'),
+    'json': (JSONExporter, '.jsonl'),
+    'parquet': (ParquetExporter, '.parquet'),
+    'excel': (ExcelExporter, '.xlsx'),
+}
+COMPRESSED_EXTENSIONS = {'gzip': '.gz', 'zstd': '.zst'}
+
+_DONE = object()
+
+# Rows per chunk measured (deep, including string payloads) to estimate bytes per row
+SIZE_SAMPLE_ROWS = 1000
+
+
+def partition_value(value: Any) -> str:
+    """Path-safe text for one partition value (datetimes are partitioned by day)."""
+    if value is None or (not isinstance(value, str) and pd.isna(value)):
+        return "__null__"
+    if isinstance(value, pd.Timestamp):
+        return value.strftime("%Y-%m-%d")
+    return quote(str(value), safe="-_.")
+
+
+class _PartitionWriter:
+    """One output file being written by an exporter on a pool thread."""
+
+    def __init__(self, pool: ThreadPoolExecutor, exporter: Any, path: Path,
+                 partition: Dict[str, str], queue_size: int):
+        self.path = path
+        self.partition = partition
+        self.rows = 0
+        self.bytes = 0
+        self.queue: Queue = Queue(maxsize=queue_size)
+        self.future = pool.submit(self._run, exporter)
+
+    def _frames(self):
+        while True:
+            frame = self.queue.get()
+            if frame is _DONE:
+                return
+            yield frame
+
+    def _run(self, exporter: Any) -> Dict[str, Any]:
+        rows = exporter.export(self._frames(), self.path)
+        return {
+            'rows': rows,
+            'bytes': self.path.stat().st_size,
+            'sha256': file_digest(self.path),
+        }
+
+    def _put(self, item: Any) -> None:
+        while True:
+            try:
+                self.queue.put(item, timeout=0.5)
+                return
+            except Full:
+                if self.future.done():
+                    # The writer died; surface its exception instead of blocking forever
+                    self.future.result()
+                    raise RuntimeError(f"Writer for {self.path} stopped consuming")
+
+    def write(self, frame: pd.DataFrame, frame_bytes: int) -> None:
+        self._put(frame)
+        self.rows += len(frame)
+        self.bytes += frame_bytes
+
+    def close(self) -> Dict[str, Any]:
+        self._put(_DONE)
+        return self.future.result()
+
+    def abort(self) -> None:
+        """Stop the writer without raising; its (partial) file is left for the caller to remove."""
+        try:
+            self._put(_DONE)
+        except Exception:
+            pass
+        try:
+            self.future.result()
+        except Exception:
+            pass
+
+
+class PartitionedExporter:
+    """
+    Writes chunks into a directory of partitioned files.
+
+    Args:
+        output_format: 'csv', 'json' (JSON Lines), 'parquet' or 'excel'
+        partition_by: Column name(s) to partition on (None: split by size only)
+        max_rows_per_file: Roll over to a new file after this many rows
+        target_file_bytes: Roll over once the rows written reach roughly this
+            many bytes (estimated from in-memory size, so compressed formats end up smaller)
+        max_open_files: Bound on concurrently open writers (and pool threads)
+        keep_partition_columns: Also keep partition columns inside the files
+        compression: Passed to CSV/JSON exporters ('gzip'/'zstd'); Parquet keeps its own codec
+        queue_size: Frames buffered per writer
+    """
+
+    def __init__(
+        self,
+        output_format: str = 'parquet',
+        partition_by: Optional[Union[str, List[str]]] = None,
+        max_rows_per_file: Optional[int] = None,
+        target_file_bytes: Optional[int] = None,
+        max_open_files: int = 16,
+        keep_partition_columns: bool = False,
+        compression: Optional[str] = None,
+        queue_size: int = 4
+    ):
+        if output_format not in FORMATS:
+            raise ValueError(f"Unsupported partitioned format: {output_format}")
+        self.output_format = output_format
+        self.partition_by = [partition_by] if isinstance(partition_by, str) else list(partition_by or [])
+        self.max_rows_per_file = max_rows_per_file
+        self.target_file_bytes = target_file_bytes
+        self.max_open_files = max(1, max_open_files)
+        self.keep_partition_columns = keep_partition_columns
+        self.compression = compression
+        self.queue_size = queue_size
+        self.last_manifest: Dict[str, Any] = {}
+
+    def _new_exporter(self) -> Any:
+        exporter_class, _ = FORMATS[self.output_format]
+        if self.output_format in ('csv', 'json'):
+            # Each writer already runs on its own pool thread
+            return exporter_class(compression=self.compression, background=False)
+        return exporter_class(background=False)
+
+    def _extension(self) -> str:
+        extension = FORMATS[self.output_format][1]
+        if self.output_format in ('csv', 'json') and self.compression:
+            extension += COMPRESSED_EXTENSIONS[self.compression]
+        return extension
+
+    def _split(self, chunk: pd.DataFrame):
+        """Yield (partition values, frame) pairs for one chunk."""
+        if not self.partition_by:
+            yield (), chunk
+            return
+        keys = [
+            chunk[name].dt.normalize() if pd.api.types.is_datetime64_any_dtype(chunk[name]) else chunk[name]
+            for name in self.partition_by
+        ]
+        for values, frame in chunk.groupby(keys, sort=False, observed=True, dropna=False):
+            values = values if isinstance(values, tuple) else (values,)
+            if not self.keep_partition_columns:
+                frame = frame.drop(columns=self.partition_by)
+            yield tuple(partition_value(v) for v in values), frame
+
+    def _capacity(self, writer: _PartitionWriter, bytes_per_row: float) -> Optional[int]:
+        """Rows ``writer`` can still take before it must roll over (None: unlimited)."""
+        limits = []
+        if self.max_rows_per_file:
+            limits.append(self.max_rows_per_file - writer.rows)
+        if self.target_file_bytes and bytes_per_row > 0:
+            limits.append(int((self.target_file_bytes - writer.bytes) / bytes_per_row))
+        return max(min(limits), 0) if limits else None
+
+    @staticmethod
+    def _bytes_per_row(chunk: pd.DataFrame) -> float:
+        """In-memory bytes per row (object/string payloads included) measured on an evenly spaced sample."""
+        sample = chunk.iloc[::max(1, len(chunk) // SIZE_SAMPLE_ROWS)]
+        return sample.memory_usage(index=False, deep=True).sum() / len(sample)
+
+    def export(self, data: Chunks, directory: Union[str, Path]) -> Dict[str, Any]:
+        """
+        Partition ``data`` (DataFrame or iterable of chunks) into ``directory``.
+
+        Returns:
+            Manifest dict (also written to ``directory/_manifest.json``)
+        """
+        root = Path(directory)
+        root.mkdir(parents=True, exist_ok=True)
+        files: List[Dict[str, Any]] = []
+        sequence: Dict[Tuple[str, ...], int] = {}
+        open_writers: "OrderedDict[Tuple[str, ...], _PartitionWriter]" = OrderedDict()
+        created: List[Path] = []
+
+        def finish(key: Tuple[str, ...]) -> None:
+            writer = open_writers[key]
+            result = writer.close()
+            del open_writers[key]
+            files.append({
+                'path': writer.path.relative_to(root).as_posix(),
+                'partition': writer.partition,
+                **result,
+            })
+
+        def open_writer(key: Tuple[str, ...]) -> _PartitionWriter:
+            if len(open_writers) >= self.max_open_files:
+                finish(next(iter(open_writers)))
+            partition = dict(zip(self.partition_by, key))
+            folder = root.joinpath(*(f"{name}={value}" for name, value in partition.items()))
+            number = sequence.get(key, 0)
+            sequence[key] = number + 1
+            path = folder / f"part-{number:05d}{self._extension()}"
+            created.append(path)
+            writer = _PartitionWriter(pool, self._new_exporter(), path, partition, self.queue_size)
+            open_writers[key] = writer
+            return writer
+
+        with ThreadPoolExecutor(max_workers=self.max_open_files, thread_name_prefix="partition-writer") as pool:
+            try:
+                for chunk in iter_chunks(data):
+                    if not len(chunk):
+                        continue
+                    bytes_per_row = self._bytes_per_row(chunk)
+                    for key, frame in self._split(chunk):
+                        while len(frame):
+                            writer = open_writers.get(key)
+                            if writer is None:
+                                writer = open_writer(key)
+                            open_writers.move_to_end(key)
+                            capacity = self._capacity(writer, bytes_per_row)
+                            if capacity == 0 and writer.rows:
+                                finish(key)
+                                continue
+                            # A fresh file always takes at least one row
+                            take = frame if capacity is None else frame.iloc[:max(capacity, 1)]
+                            writer.write(take, int(bytes_per_row * len(take)))
+                            frame = frame.iloc[len(take):]
+                while open_writers:
+                    finish(next(iter(open_writers)))
+            except BaseException:
+                # Stop every writer before the pool shuts down (it waits for them), then
+                # drop the run's files so a failed export never looks complete
+                for writer in open_writers.values():
+                    writer.abort()
+                for path in created:
+                    path.unlink(missing_ok=True)
+                logger.error(f"Partitioned export to {root} failed; removed {len(created)} files")
+                raise
+
+        files.sort(key=lambda entry: entry['path'])
+        manifest = {
+            'format': self.output_format,
+            'partition_by': self.partition_by,
+            'total_rows': sum(entry['rows'] for entry in files),
+            'files': files,
+        }
+        (root / MANIFEST_NAME).write_text(json.dumps(manifest, indent=2))
+        self.last_manifest = manifest
+        logger.info(f"Wrote {manifest['total_rows']:,} rows to {len(files)} files under {root}")
+        return manifest
@@ -0,0 +1,185 @@
+"""
+Shared plumbing for streaming exporters.
+
+Exporters accept either one DataFrame or an iterable of DataFrame chunks
+(e.g. ``SyntheticDataEngine.generate_chunks``). Output goes to a ``.part``
+file that is renamed into place once complete, through an optional
+gzip/zstd compressor. Chunks are written by a background thread fed from a
+small bounded queue, so formatting/compression of one chunk overlaps
+generation of the next while memory stays at a few chunks.
+"""
+import gzip
+import os
+import threading
+import zlib
+from contextlib import contextmanager
+from pathlib import Path
+from queue import Queue
+from typing import BinaryIO, Callable, Iterable, Iterator, Optional, Union
+
+import pandas as pd
+
+from ..utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_BUFFER_SIZE = 1 << 20
+
+COMPRESSION_SUFFIXES = {
+    '.gz': 'gzip',
+    '.gzip': 'gzip',
+    '.zst': 'zstd',
+    '.zstd': 'zstd',
+}
+
+Chunks = Union[pd.DataFrame, Iterable[pd.DataFrame]]
+
+_DONE = object()
+
+
+def infer_compression(file_path: Union[str, Path], compression: Optional[str] = 'infer') -> Optional[str]:
+    """Resolve ``'infer'`` from the file suffix; validate explicit codecs."""
+    if compression == 'infer':
+        return COMPRESSION_SUFFIXES.get(Path(file_path).suffix.lower())
+    if compression in (None, 'none'):
+        return None
+    if compression not in ('gzip', 'zstd'):
+        raise ValueError(f"Unsupported compression: {compression}")
+    return compression
+
+
+def iter_chunks(data: Chunks) -> Iterator[pd.DataFrame]:
+    """Yield DataFrame chunks from a single frame or an iterable of frames."""
+    if isinstance(data, pd.DataFrame):
+        yield data
+    else:
+        yield from data
+
+
+@contextmanager
+def open_output(
+    file_path: Union[str, Path],
+    compression: Optional[str] = None,
+    level: Optional[int] = None,
+    threads: int = 0,
+    buffer_size: int = DEFAULT_BUFFER_SIZE
+) -> Iterator[BinaryIO]:
+    """
+    Open a binary output stream, compressed as requested.
+
+    The file only appears under ``file_path`` once the block exits cleanly;
+    on error the partial file is removed.
+
+    Args:
+        file_path: Destination path
+        compression: None, 'gzip' or 'zstd'
+        level: Compression level (codec default if None)
+        threads: zstd worker threads (0 = compress on the writing thread, -1 = one per core);
+            gzip is a single stream and always compresses on the writing thread
+        buffer_size: Size of the file write buffer in bytes
+    """
+    path = Path(file_path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    part = path.with_name(path.name + '.part')
+    raw = open(part, 'wb', buffering=buffer_size)
+    try:
+        if compression == 'gzip':
+            stream = gzip.GzipFile(filename='', mode='wb', fileobj=raw,
+                                   compresslevel=6 if level is None else level, mtime=0)
+        elif compression == 'zstd':
+            import zstandard
+            compressor = zstandard.ZstdCompressor(level=3 if level is None else level, threads=threads)
+            stream = compressor.stream_writer(raw, write_size=buffer_size, closefd=False)
+        else:
+            stream = raw
+        yield stream
+        if stream is not raw:
+            stream.close()
+        raw.close()
+        os.replace(part, path)
+    except BaseException:
+        raw.close()
+        part.unlink(missing_ok=True)
+        raise
+
+
+def gzip_chunks(pieces: Iterable[bytes], level: int = 6) -> Iterator[bytes]:
+    """
+    Gzip a stream of byte strings incrementally.
+
+    Every piece is sync-flushed, so a client can decompress (and a proxy can
+    forward) each chunk as soon as it is produced.
+    """
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    for piece in pieces:
+        data = compressor.compress(piece) + compressor.flush(zlib.Z_SYNC_FLUSH)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def write_chunks(
+    chunks: Iterable[pd.DataFrame],
+    write: Callable[[pd.DataFrame], None],
+    background: bool = True,
+    queue_size: int = 2
+) -> int:
+    """
+    Call ``write`` for every chunk, optionally on a background thread.
+
+    Returns:
+        Number of rows written
+    """
+    if not background:
+        rows = 0
+        for chunk in chunks:
+            write(chunk)
+            rows += len(chunk)
+        return rows
+
+    queue: Queue = Queue(maxsize=queue_size)
+    errors = []
+
+    def consume() -> None:
+        while True:
+            chunk = queue.get()
+            if chunk is _DONE:
+                return
+            if errors:
+                continue  # keep draining so the producer never blocks
+            try:
+                write(chunk)
+            except BaseException as e:
+                errors.append(e)
+
+    writer = threading.Thread(target=consume, name="chunk-writer", daemon=True)
+    writer.start()
+    rows = 0
+    try:
+        for chunk in chunks:
+            if errors:
+                break
+            queue.put(chunk)
+            rows += len(chunk)
+    finally:
+        queue.put(_DONE)
+        writer.join()
+    if errors:
+        raise errors[0]
+    return rows
+
+
+def column_values(series: pd.Series) -> list:
+    """Convert a column to native Python values in one vectorized pass (nulls → None)."""
+    if pd.api.types.is_datetime64_any_dtype(series):
+        if getattr(series.dt, 'tz', None) is not None:
+            # Excel and most DB-API drivers expect naive datetimes
+            series = series.dt.tz_localize(None)
+        values = series.dt.to_pydatetime()
+    elif isinstance(series.dtype, pd.CategoricalDtype):
+        values = series.astype(object).to_numpy()
+    else:
+        values = series.to_numpy(dtype=object)
+    values = values.astype(object)
+    values[series.isna().to_numpy()] = None
+    return values.tolist()
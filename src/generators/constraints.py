@@ -0,0 +1,211 @@
+"""
+Constraint layer applied during generation.
+Column constraints (min/max, length, regex, categories) are enforced in
+vectorized form so generated data satisfies them by construction:
+numeric columns use truncated-distribution sampling, strings are
+resampled only where they violate length/regex rules, and categorical
+columns are masked to the allowed categories.
+"""
+from typing import Any, Callable, Dict, Optional
+import numpy as np
+import pandas as pd
+from scipy.special import ndtr, ndtri
+
+from ..utils.logger import get_logger
+from ..utils.random_state import ensure_rng
+
+logger = get_logger(__name__)
+
+Sampler = Callable[[int], Any]
+
+
+def _clip(values: np.ndarray, low: Optional[float], high: Optional[float]) -> np.ndarray:
+    if low is None and high is None:
+        return values
+    return np.clip(values, low, high)
+
+
+def truncated_normal(mean: float, std: float, low: Optional[float], high: Optional[float], size: int,
+                     rng: Optional[np.random.Generator] = None) -> np.ndarray:
+    """Sample a normal distribution truncated to [low, high] by inverse-CDF."""
+    if not std or not np.isfinite(std) or std <= 0:
+        return _clip(np.full(size, mean, dtype=np.float64), low, high)
+    a = 0.0 if low is None else ndtr((low - mean) / std)
+    b = 1.0 if high is None else ndtr((high - mean) / std)
+    if b <= a:
+        # Interval lies far in one tail – the closest bound is the best we can do
+        return _clip(np.full(size, mean, dtype=np.float64), low, high)
+    u = ensure_rng(rng).uniform(a, b, size)
+    samples = mean + std * ndtri(u)
+    return _clip(samples, low, high)
+
+
+def truncated_sample(sampler: Sampler, size: int, low: Optional[float], high: Optional[float],
+                     max_rounds: int = 10, rng: Optional[np.random.Generator] = None) -> np.ndarray:
+    """
+    Draw ``size`` values from ``sampler`` restricted to [low, high].
+
+    Out-of-range draws are replaced by fresh batches (vectorized rejection);
+    the few values still out of range after ``max_rounds`` are clipped.
+    Each batch is shuffled before replacements are taken from it, so a
+    sampler returning grouped output (e.g. sorted by mixture component)
+    does not bias the replacements.
+    """
+    values = np.asarray(sampler(size), dtype=np.float64).ravel()
+    if low is None and high is None:
+        return values
+    rng = ensure_rng(rng)
+    for _ in range(max_rounds):
+        bad = _out_of_range(values, low, high)
+        n_bad = int(bad.sum())
+        if not n_bad:
+            return values
+        # Oversample so most rounds finish in one pass
+        fresh = rng.permutation(np.asarray(sampler(max(n_bad * 2, 16)), dtype=np.float64).ravel())
+        fresh = fresh[~_out_of_range(fresh, low, high)][:n_bad]
+        idx = np.flatnonzero(bad)[:len(fresh)]
+        values[idx] = fresh
+    return np.clip(values, low, high)
+
+
+def _out_of_range(values: np.ndarray, low: Optional[float], high: Optional[float]) -> np.ndarray:
+    bad = np.zeros(len(values), dtype=bool)
+    if low is not None:
+        bad |= values < low
+    if high is not None:
+        bad |= values > high
+    return bad
+
+
+class ConstraintLayer:
+    """Enforces column constraints on generated values in vectorized form."""
+
+    def __init__(self, max_rounds: int = 10):
+        self.max_rounds = max_rounds
+
+    @staticmethod
+    def categories(spec: Dict[str, Any]) -> Optional[list]:
+        """Allowed categories from either the spec or its constraints."""
+        return spec.get('categories') or spec.get('constraints', {}).get('categories')
+
+    @staticmethod
+    def bounds(spec: Dict[str, Any]):
+        """(min, max) numeric bounds from the spec constraints."""
+        constraints = spec.get('constraints', {})
+        return constraints.get('min'), constraints.get('max')
+
+    def apply(self, values: Any, spec: Dict[str, Any], regenerate: Optional[Sampler] = None,
+              rng: Optional[np.random.Generator] = None) -> Any:
+        """
+        Return ``values`` with every constraint in ``spec`` satisfied.
+
+        Args:
+            values: Generated column (list, ndarray or Series)
+            spec: Column specification with ``constraints``/``categories``
+            regenerate: Callable producing ``k`` fresh values for resampling
+            rng: The run's random generator (fresh entropy if None)
+
+        Returns:
+            Constrained column, same length as ``values``
+        """
+        constraints = spec.get('constraints', {})
+        allowed = self.categories(spec)
+        if not constraints and not allowed:
+            return values
+
+        series = values if isinstance(values, pd.Series) else pd.Series(values)
+        if len(series) == 0:
+            return values
+
+        if allowed:
+            series = self._apply_categories(series, allowed, rng)
+
+        low, high = self.bounds(spec)
+        if (low is not None or high is not None) and pd.api.types.is_numeric_dtype(series):
+            series = self._apply_numeric(series, low, high, regenerate, rng)
+
+        string_rules = ('length', 'min_length', 'max_length', 'regex')
+        if spec.get('type', 'string') in ('string', 'pattern') and any(key in constraints for key in string_rules):
+            series = self._apply_string(series, constraints, regenerate)
+
+        return series if isinstance(values, pd.Series) else series.tolist()
+
+    def _apply_categories(self, series: pd.Series, allowed: list,
+                          rng: Optional[np.random.Generator]) -> pd.Series:
+        """Replace values outside the allowed categories with draws from them."""
+        bad = series.notna() & ~series.isin(allowed)
+        n_bad = int(bad.sum())
+        if n_bad:
+            series = series.astype(object)
+            series[bad] = ensure_rng(rng).choice(np.asarray(allowed, dtype=object), size=n_bad)
+        return series
+
+    def _apply_numeric(self, series: pd.Series, low, high, regenerate: Optional[Sampler],
+                       rng: Optional[np.random.Generator]) -> pd.Series:
+        """Resample out-of-range numbers from the generator, then clip the remainder."""
+        values = series.to_numpy(dtype=np.float64, na_value=np.nan)
+        bad = _out_of_range(values, low, high)
+        if bad.any() and regenerate is not None:
+            fresh = truncated_sample(
+                lambda k: pd.to_numeric(pd.Series(regenerate(k)), errors='coerce').to_numpy(dtype=np.float64),
+                int(bad.sum()), low, high, self.max_rounds, rng
+            )
+            values[bad] = fresh
+        values = _clip(values, low, high)
+        if pd.api.types.is_integer_dtype(series):
+            # Round towards the interior so rounding cannot leave the range
+            values = _clip(np.round(values), np.ceil(low) if low is not None else None,
+                           np.floor(high) if high is not None else None)
+            return pd.Series(values, index=series.index, name=series.name).astype(series.dtype)
+        return pd.Series(values, index=series.index, name=series.name)
+
+    def _string_violations(self, series: pd.Series, constraints: Dict[str, Any]) -> np.ndarray:
+        """Boolean mask of non-null strings violating length/regex rules."""
+        strings = series.astype('string')
+        lengths = strings.str.len()
+        bad = pd.Series(False, index=series.index)
+        if 'length' in constraints:
+            bad |= lengths != constraints['length']
+        if 'min_length' in constraints:
+            bad |= lengths < constraints['min_length']
+        if 'max_length' in constraints:
+            bad |= lengths > constraints['max_length']
+        if 'regex' in constraints:
+            bad |= ~strings.str.fullmatch(constraints['regex'])
+        return (bad.fillna(False) & series.notna()).to_numpy(dtype=bool)
+
+    def _apply_string(self, series: pd.Series, constraints: Dict[str, Any], regenerate: Optional[Sampler]) -> pd.Series:
+        """Resample violating strings; fit any remaining ones to the length bounds."""
+        bad = self._string_violations(series, constraints)
+        if bad.any() and regenerate is not None:
+            series = series.astype(object)
+            for _ in range(self.max_rounds):
+                n_bad = int(bad.sum())
+                if not n_bad:
+                    break
+                fresh = pd.Series(regenerate(max(n_bad * 2, 16)), dtype=object)
+                fresh = fresh[~self._string_violations(fresh, constraints)].to_numpy()[:n_bad]
+                idx = np.flatnonzero(bad)[:len(fresh)]
+                series.iloc[idx] = fresh
+                bad[idx] = False
+
+        if bad.any():
+            series = self._fit_lengths(series, bad, constraints)
+            if 'regex' in constraints and self._string_violations(series, constraints).any():
+                logger.warning(f"Column {series.name}: some values could not be made to match "
+                               f"regex {constraints['regex']!r}")
+        return series
+
+    @staticmethod
+    def _fit_lengths(series: pd.Series, bad: np.ndarray, constraints: Dict[str, Any]) -> pd.Series:
+        """Truncate or pad violating strings to satisfy the length bounds."""
+        series = series.astype(object)
+        strings = series[bad].astype(str)
+        target_max = constraints.get('length', constraints.get('max_length'))
+        target_min = constraints.get('length', constraints.get('min_length'))
+        if target_max is not None:
+            strings = strings.str.slice(0, target_max)
+        if target_min is not None:
+            strings = strings.str.pad(target_min, side='right', fillchar='0')
+        series[bad] = strings.to_numpy()
+        return series
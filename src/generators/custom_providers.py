@@ -3,7 +3,7 @@ Custom data providers for realistic synthetic data generation.
 Extends Mimesis with domain-specific realistic data.
 """
 import random
-from typing import List
+from typing import List, Optional
 
 
 class CustomProviders:
@@ -51,29 +51,29 @@ class CustomProviders:
     ]
     
     @staticmethod
-    def department() -> str:
+    def department(rng: Optional[random.Random] = None) -> str:
         """Generate a realistic department name."""
-        return random.choice(CustomProviders.DEPARTMENTS)
+        return (rng or random).choice(CustomProviders.DEPARTMENTS)
     
     @staticmethod
-    def product_category() -> str:
+    def product_category(rng: Optional[random.Random] = None) -> str:
         """Generate a realistic product category."""
-        return random.choice(CustomProviders.PRODUCT_CATEGORIES)
+        return (rng or random).choice(CustomProviders.PRODUCT_CATEGORIES)
     
     @staticmethod
-    def company_name() -> str:
+    def company_name(rng: Optional[random.Random] = None) -> str:
         """Generate a realistic company name."""
-        return random.choice(CustomProviders.COMPANY_NAMES)
+        return (rng or random).choice(CustomProviders.COMPANY_NAMES)
     
     @staticmethod
-    def product_name() -> str:
+    def product_name(rng: Optional[random.Random] = None) -> str:
         """Generate a realistic product name."""
 """
 Custom data providers for realistic synthetic data generation.
 Extends Mimesis with domain-specific realistic data.
 """
 import random
-from typing import List
+from typing import List, Optional
 
 
 class CustomProviders:
@@ -121,37 +121,37 @@ class CustomProviders:
     ]
     
     @staticmethod
-    def department() -> str:
+    def department(rng: Optional[random.Random] = None) -> str:
         """Generate a realistic department name."""
-        return random.choice(CustomProviders.DEPARTMENTS)
+        return (rng or random).choice(CustomProviders.DEPARTMENTS)
     
     @staticmethod
-    def product_category() -> str:
+    def product_category(rng: Optional[random.Random] = None) -> str:
         """Generate a realistic product category."""
-        return random.choice(CustomProviders.PRODUCT_CATEGORIES)
+        return (rng or random).choice(CustomProviders.PRODUCT_CATEGORIES)
     
     @staticmethod
-    def company_name() -> str:
+    def company_name(rng: Optional[random.Random] = None) -> str:
         """Generate a realistic company name."""
-        return random.choice(CustomProviders.COMPANY_NAMES)
+        return (rng or random).choice(CustomProviders.COMPANY_NAMES)
     
     @staticmethod
-    def product_name() -> str:
+    def product_name(rng: Optional[random.Random] = None) -> str:
         """Generate a realistic product name."""
-        return random.choice(CustomProviders.PRODUCT_NAMES)
+        return (rng or random).choice(CustomProviders.PRODUCT_NAMES)
     
     @staticmethod
-    def status() -> str:
+    def status(rng: Optional[random.Random] = None) -> str:
         """Generate a realistic status value."""
-        return random.choice(CustomProviders.STATUS_VALUES)
+        return (rng or random).choice(CustomProviders.STATUS_VALUES)
     
     # Aliases for LLM compatibility
     @staticmethod
-    def product() -> str:
+    def product(rng: Optional[random.Random] = None) -> str:
         """Alias for product_name."""
-        return CustomProviders.product_name()
+        return CustomProviders.product_name(rng)
     
     @staticmethod
-    def company() -> str:
+    def company(rng: Optional[random.Random] = None) -> str:
         """Alias for company_name."""
-        return CustomProviders.company_name()
+        return CustomProviders.company_name(rng)
@@ -4,19 +4,24 @@ Preserves statistics (distributions, categories, ranges) automatically.
 """
 import pandas as pd
 import numpy as np
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 from sklearn.mixture import GaussianMixture
 from sklearn.preprocessing import LabelEncoder
 import warnings
 
 from .base_generator import BaseGenerator
+from .constraints import truncated_normal, truncated_sample
+from ..utils.cache import LRUCache
 from ..utils.logger import get_logger
+from ..utils.random_state import ensure_rng
 
 logger = get_logger(__name__)
 
 class FileGenerator(BaseGenerator):
-    def __init__(self):
+    def __init__(self, model_cache_size: int = 256):
         super().__init__("file")
+        # Fitted mixtures keyed by column content, so re-synthesizing the same data skips the BIC search
+        self.models = LRUCache(model_cache_size)
 
     def generate(self, column_spec: Dict[str, Any], num_rows: int, **kwargs) -> List[Any]:
         """Generate synthetic data preserving statistical properties of original file."""
@@ -25,27 +30,52 @@ class FileGenerator(BaseGenerator):
             # fallback to basic generation
             return self._generate_basic(column_spec, num_rows)
 
-        return self._generate_with_statistics(original_series, num_rows)
+        return self._generate_with_statistics(original_series, num_rows, ensure_rng(kwargs.get("rng")))
 
-    def _generate_with_statistics(self, original_series: pd.Series, num_rows: int) -> List[Any]:
+    def _generate_with_statistics(self, original_series: pd.Series, num_rows: int,
+                                  rng: np.random.Generator) -> List[Any]:
         """Preserve distribution & categories of original column."""
         dtype = str(original_series.dtype)
 
-        if pd.api.types.is_numeric_dtype(original_series):
-            return self._numeric_synthetic(original_series, num_rows)
-        elif pd.api.types.is_categorical_dtype(original_series) or original_series.dtype == 'object':
-            return self._categorical_synthetic(original_series, num_rows)
+        if pd.api.types.is_bool_dtype(original_series):
+            # Booleans are numeric to pandas, but a mixture cannot be fitted to two values
+            return self._categorical_synthetic(original_series, num_rows, rng)
+        elif pd.api.types.is_numeric_dtype(original_series):
+            return self._numeric_synthetic(original_series, num_rows, rng)
+        elif (pd.api.types.is_categorical_dtype(original_series) or original_series.dtype == 'object'
+              or pd.api.types.is_string_dtype(original_series)):
+            return self._categorical_synthetic(original_series, num_rows, rng)
         elif pd.api.types.is_datetime64_any_dtype(original_series):
-            return self._datetime_synthetic(original_series, num_rows)
+            return self._datetime_synthetic(original_series, num_rows, rng)
         else:
-            return original_series.sample(n=num_rows, replace=True).tolist()
+            return original_series.sample(n=num_rows, replace=True, random_state=rng).tolist()
 
-    def _numeric_synthetic(self, series: pd.Series, num_rows: int) -> List[Any]:
+    def _numeric_synthetic(self, series: pd.Series, num_rows: int, rng: np.random.Generator) -> List[Any]:
         """Preserve numeric distribution using Gaussian Mixture."""
         valid = series.dropna()
         if len(valid) < 10:
-            return self._numeric_fallback(series, num_rows)
+            return self._numeric_fallback(series, num_rows, rng)
+
+        key = (str(valid.dtype), len(valid), int(pd.util.hash_pandas_object(valid, index=False).sum()))
+        # A failed fit is cached as False so the fallback is chosen without refitting
+        best_gmm = self.models.get_or_create(key, lambda: self._fit_mixture(valid) or False)
+
+        if best_gmm:
+            # truncated sampling within the original range instead of clamping to it
+            generated = truncated_sample(
+                lambda k: self._sample_mixture(best_gmm, k, rng), num_rows, float(valid.min()), float(valid.max()),
+                rng=rng
+            )
+            if pd.api.types.is_integer_dtype(series):
+                generated = np.round(generated).astype(int)
+            return generated.tolist()
 
+        # fallback
+        return self._numeric_fallback(series, num_rows, rng)
+
+    @staticmethod
+    def _fit_mixture(valid: pd.Series):
+        """Best Gaussian mixture (1-5 components, by BIC) for a numeric column, or None."""
         # Remove outliers for better fitting
         Q1, Q3 = valid.quantile(0.25), valid.quantile(0.75)
         IQR = Q3 - Q1
@@ -67,32 +97,38 @@ class FileGenerator(BaseGenerator):
                     best_gmm = gmm
             except Exception:
                 continue
-
-        if best_gmm is not None:
-            samples, _ = best_gmm.sample(num_rows)
-            generated = samples.flatten()
-            # clamp to original range
-            generated = np.clip(generated, valid.min(), valid.max())
-            if series.dtype == 'int64':
-                generated = np.round(generated).astype(int)
-            return generated.tolist()
-
-        # fallback
-        return self._numeric_fallback(series, num_rows)
-
-    def _categorical_synthetic(self, series: pd.Series, num_rows: int) -> List[Any]:
+        return best_gmm
+
+    @staticmethod
+    def _sample_mixture(gmm: GaussianMixture, num_rows: int,
+                        rng: Optional[np.random.Generator] = None) -> np.ndarray:
+        """
+        Draw from a fitted 1-D mixture with fresh randomness on every call.
+
+        ``GaussianMixture.sample`` reuses the model's fixed ``random_state`` (so
+        every resampling round returned the same batch) and groups its output by
+        component; here each draw picks its component by weight, in random order.
+        """
+        rng = ensure_rng(rng)
+        weights = gmm.weights_ / gmm.weights_.sum()
+        components = rng.choice(len(weights), size=num_rows, p=weights)
+        means = gmm.means_.ravel()
+        stds = np.sqrt(gmm.covariances_.reshape(len(weights), -1)[:, 0])
+        return rng.normal(means[components], stds[components])
+
+    def _categorical_synthetic(self, series: pd.Series, num_rows: int, rng: np.random.Generator) -> List[Any]:
         """Preserve categorical distribution."""
         value_counts = series.value_counts(normalize=True)
         choices = value_counts.index.tolist()
         probabilities = value_counts.values.tolist()
-        return np.random.choice(choices, size=num_rows, p=probabilities).tolist()
+        return rng.choice(choices, size=num_rows, p=probabilities).tolist()
 
-    def _datetime_synthetic(self, series: pd.Series, num_rows: int) -> List[Any]:
+    def _datetime_synthetic(self, series: pd.Series, num_rows: int, rng: np.random.Generator) -> List[Any]:
         """Preserve datetime distribution."""
         start_date = series.min()
         end_date = series.max()
         time_range = (end_date - start_date).total_seconds()
-        random_seconds = np.random.uniform(0, time_range, num_rows)
+        random_seconds = rng.uniform(0, time_range, num_rows)
         base_timestamps = start_date.value + (random_seconds * 1e9).astype(int)
         return pd.to_datetime(base_timestamps).strftime('%Y-%m-%d %H:%M:%S').tolist()
 
@@ -110,14 +146,13 @@ class FileGenerator(BaseGenerator):
         else:
             return [None] * num_rows
 
-    def _numeric_fallback(self, series: pd.Series, num_rows: int) -> List[Any]:
+    def _numeric_fallback(self, series: pd.Series, num_rows: int, rng: np.random.Generator) -> List[Any]:
         """Fallback for numeric generation when Gaussian Mixture fails."""
         mean = series.mean()
         std = series.std()
         min_val = series.min()
         max_val = series.max()
-        data = np.random.normal(mean, std, num_rows)
-        data = np.clip(data, min_val, max_val)
-        if series.dtype == 'int64':
+        data = truncated_normal(mean, std, min_val, max_val, num_rows, rng)
+        if pd.api.types.is_integer_dtype(series):
             data = np.round(data).astype(int)
         return data.tolist()
\ No newline at end of file
@@ -13,10 +13,13 @@ _PROV: Dict[str, Any] = {}
 Mimesis-based data generator with custom provider support.
 """
 import random
+import threading
+import numpy as np
 from mimesis import Person, Address, Finance, Datetime, Payment, Food, Internet
 from typing import Dict, Any, List
 
 from ..utils.logger import get_logger
+from ..utils.random_state import derive_seed, ensure_rng, python_random
 from .custom_providers import CustomProviders
 
 logger = get_logger(__name__)
@@ -31,11 +34,28 @@ _PROV = {
     "food": Food(),
     "internet": Internet()
 }
+# Providers keep their own random state, so a run with its own ``rng`` gets
+# providers of the same classes seeded from it. Building a provider costs
+# ~0.7 ms and reseeding one ~10 µs, so each thread keeps its own instances
+# and reseeds them per call (same values as a fresh provider with that seed)
+_SEEDED = threading.local()
 
 # Initialize custom providers
 _CUSTOM = CustomProviders()
 
 
+def _seeded_provider(name: str, rng: np.random.Generator):
+    """This thread's ``name`` provider, reseeded from ``rng``."""
+    providers = getattr(_SEEDED, "providers", None)
+    if providers is None:
+        providers = _SEEDED.providers = {}
+    provider = providers.get(name)
+    if provider is None:
+        provider = providers[name] = type(_PROV[name])()
+    provider.reseed(derive_seed(rng))
+    return provider
+
+
 class MimesisGenerator:
     """Generate data using Mimesis library with custom provider support."""
     
@@ -46,17 +66,20 @@ class MimesisGenerator:
         Args:
             column_spec: Column specification with provider info
             num_rows: Number of rows to generate
+            rng: The run's random generator (keyword; shared providers if absent)
             
         Returns:
             List of generated values
         """
+        rng = kwargs.get("rng")
         # Check if it's a custom provider
         if "provider" in column_spec:
             provider_path = column_spec["provider"]
             if provider_path.startswith("custom."):
                 # Custom provider
-                provider_func = provider_path.split(".", 1)[1]
-                return [getattr(_CUSTOM, provider_func)() for _ in range(num_rows)]
+                provider_func = getattr(_CUSTOM, provider_path.split(".", 1)[1])
+                rnd = python_random(rng) if rng is not None else None
+                return [provider_func(rnd) for _ in range(num_rows)]
         
         # Mimesis provider
         method = column_spec.get("mimesis", "person.full_name")
@@ -73,19 +96,19 @@ class MimesisGenerator:
                     "company": "full_name",
                     "dish": "dish"}.get(func, "full_name")
 
-        prov_obj = _PROV[provider]
+        prov_obj = _PROV[provider] if rng is None else _seeded_provider(provider, rng)
+
+        # Constrained numeric methods are sampled in one vectorized call
+        c = column_spec.get("constraints", {})
+        if method == "person.age":
+            return ensure_rng(rng).integers(c.get("min", 18), c.get("max", 65) + 1, num_rows).tolist()
+        if method == "finance.price":
+            return np.round(ensure_rng(rng).uniform(c.get("min", 10), c.get("max", 500), num_rows), 2).tolist()
 
         # Generate data
         rows = []
         for _ in range(num_rows):
-            if method == "person.age":
-                c = column_spec.get("constraints", {})
-                rows.append(random.randint(c.get("min", 18), c.get("max", 65)))
-            elif method == "finance.price":
-                c = column_spec.get("constraints", {})
-                rows.append(prov_obj.price(c.get("min", 10), c.get("max", 500)))
-            elif method == "datetime.date":
-                c = column_spec.get("constraints", {})
+            if method == "datetime.date":
                 start = c.get("start", 2020)
                 end   = c.get("end", 2024)
                 rows.append(prov_obj.date(start=start, end=end).strftime("%Y-%m-%d"))
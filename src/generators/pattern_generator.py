@@ -0,0 +1,291 @@
+"""
+Pattern-based string generation and pattern learning.
+
+A ``pattern`` column is described by a small regex subset, e.g.
+``"[A-Z]{3}-\\d{6}"``: literals (punctuation may be escaped), ``\\d``, ``\\w``, ``.``, character classes
+with ranges, and the quantifiers ``{n}``, ``{m,n}``, ``?``, ``+`` and ``*``
+(unbounded repeats are capped, and values may be at most
+``MAX_PATTERN_WIDTH`` characters long). Values are built column by column on
+a fixed-width uint8 matrix, one vectorized draw per position, so no Python
+code runs per row.
+"""
+import re
+import string
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+import numpy as np
+import pandas as pd
+
+from .base_generator import BaseGenerator
+from ..utils.logger import get_logger
+from ..utils.random_state import ensure_rng
+
+logger = get_logger(__name__)
+
+# Upper repeat count used for "+" and "*"
+UNBOUNDED_REPEAT = 8
+# Longest value a pattern may describe: generation allocates rows x width bytes
+MAX_PATTERN_WIDTH = 256
+
+Token = Tuple[np.ndarray, int, int]
+
+_DIGITS = b"0123456789"
+_UPPER = b"ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+_LOWER = b"abcdefghijklmnopqrstuvwxyz"
+_ESCAPES = {
+    'd': _DIGITS,
+    'w': _UPPER + _LOWER + _DIGITS + b"_",
+}
+
+
+def _escape(char: str, pattern: str) -> bytes:
+    """Characters for ``\\<char>``: a supported class or an escaped punctuation literal."""
+    if char in _ESCAPES:
+        return _ESCAPES[char]
+    if char in string.punctuation or char == ' ':
+        return char.encode('ascii')
+    raise ValueError(f"Unsupported escape '\\{char}' in pattern {pattern!r}")
+
+
+def _alphabet(chars: bytes) -> np.ndarray:
+    return np.frombuffer(bytes(sorted(set(chars))), dtype=np.uint8)
+
+
+def _parse_class(pattern: str, pos: int) -> Tuple[bytes, int]:
+    """Parse ``[...]`` starting after the opening bracket; return (chars, next position)."""
+    chars = bytearray()
+    if pos < len(pattern) and pattern[pos] == '^':
+        raise ValueError("Negated character classes are not supported in patterns")
+    while pos < len(pattern) and pattern[pos] != ']':
+        if pattern[pos] == '\\' and pos + 1 < len(pattern):
+            chars += _escape(pattern[pos + 1], pattern)
+            pos += 2
+        elif pos + 2 < len(pattern) and pattern[pos + 1] == '-' and pattern[pos + 2] != ']':
+            low, high = ord(pattern[pos]), ord(pattern[pos + 2])
+            if high < low:
+                raise ValueError(f"Bad character range {pattern[pos:pos + 3]!r}")
+            chars += bytes(range(low, high + 1))
+            pos += 3
+        else:
+            chars += pattern[pos].encode('ascii')
+            pos += 1
+    if pos >= len(pattern):
+        raise ValueError(f"Unterminated character class in pattern {pattern!r}")
+    return bytes(chars), pos + 1
+
+
+def _parse_quantifier(pattern: str, pos: int) -> Tuple[int, int, int]:
+    """Parse an optional quantifier; return (min, max, next position)."""
+    if pos >= len(pattern):
+        return 1, 1, pos
+    char = pattern[pos]
+    if char == '?':
+        return 0, 1, pos + 1
+    if char == '+':
+        return 1, UNBOUNDED_REPEAT, pos + 1
+    if char == '*':
+        return 0, UNBOUNDED_REPEAT, pos + 1
+    if char == '{':
+        match = re.match(r"\{(\d+)(?:,(\d*))?\}", pattern[pos:])
+        if not match:
+            raise ValueError(f"Bad quantifier in pattern {pattern!r}")
+        low = int(match.group(1))
+        if match.group(2) is None:
+            high = low
+        else:
+            high = int(match.group(2)) if match.group(2) else max(low, UNBOUNDED_REPEAT)
+        if high < low:
+            raise ValueError(f"Bad quantifier in pattern {pattern!r}")
+        return low, high, pos + match.end()
+    return 1, 1, pos
+
+
+@lru_cache(maxsize=256)
+def parse_pattern(pattern: str) -> Tuple[Token, ...]:
+    """
+    Compile a pattern into (alphabet, min_repeat, max_repeat) tokens.
+
+    Raises:
+        ValueError: For syntax outside the supported subset (groups, alternation,
+            anchors, negated classes, escapes other than ``\\d``, ``\\w`` and
+            punctuation, non-ASCII literals) or patterns wider than ``MAX_PATTERN_WIDTH``
+    """
+    tokens: List[Token] = []
+    width = 0
+    pos = 0
+    while pos < len(pattern):
+        char = pattern[pos]
+        if char in '()|^$':
+            raise ValueError(f"Unsupported pattern syntax {char!r} in {pattern!r}")
+        if char == '[':
+            chars, pos = _parse_class(pattern, pos + 1)
+        elif char == '\\':
+            if pos + 1 >= len(pattern):
+                raise ValueError(f"Trailing backslash in pattern {pattern!r}")
+            chars = _escape(pattern[pos + 1], pattern)
+            pos += 2
+        elif char == '.':
+            chars = _UPPER + _LOWER + _DIGITS
+            pos += 1
+        else:
+            chars = char.encode('ascii')
+            pos += 1
+        low, high, pos = _parse_quantifier(pattern, pos)
+        if not chars:
+            raise ValueError(f"Empty character class in pattern {pattern!r}")
+        width += high
+        if width > MAX_PATTERN_WIDTH:
+            raise ValueError(f"Pattern {pattern[:50]!r} allows values longer than {MAX_PATTERN_WIDTH} characters")
+        tokens.append((_alphabet(chars), low, high))
+    return tuple(tokens)
+
+
+def generate_pattern(pattern: str, num_rows: int, rng: Optional[np.random.Generator] = None) -> np.ndarray:
+    """
+    Generate ``num_rows`` strings matching ``pattern`` (``rng``: the run's random generator).
+
+    Returns:
+        Object array of str
+    """
+    tokens = parse_pattern(pattern)
+    width = sum(high for _, _, high in tokens)
+    if width == 0 or num_rows == 0:
+        return np.full(num_rows, "", dtype=object)
+
+    rng = ensure_rng(rng)
+    codes = np.empty((num_rows, width), dtype=np.uint8)
+    drop = None
+    col = 0
+    for alphabet, low, high in tokens:
+        if high == 0:
+            continue
+        if len(alphabet) == 1:
+            codes[:, col:col + high] = alphabet[0]
+        else:
+            codes[:, col:col + high] = alphabet[rng.integers(0, len(alphabet), (num_rows, high))]
+        if low < high:
+            if drop is None:
+                drop = np.zeros((num_rows, width), dtype=bool)
+            lengths = rng.integers(low, high + 1, num_rows)
+            drop[:, col:col + high] = np.arange(high) >= lengths[:, None]
+        col += high
+
+    if drop is not None:
+        # Move dropped positions to the end of each row; trailing NULs vanish in the bytes view
+        order = np.argsort(drop, axis=1, kind='stable')
+        codes = np.take_along_axis(codes, order, axis=1)
+        codes[np.take_along_axis(drop, order, axis=1)] = 0
+    return codes.view(f"S{width}").ravel().astype(f"U{width}").astype(object)
+
+
+def _position_class(column: np.ndarray) -> Optional[str]:
+    """Regex for one character position of equal-length samples."""
+    if (column == column[0]).all():
+        return re.escape(chr(column[0]))
+    for alphabet, token in ((_DIGITS, r"\d"), (_UPPER, "[A-Z]"), (_LOWER, "[a-z]"),
+                            (_UPPER + _DIGITS, "[A-Z0-9]"), (_UPPER + _LOWER + _DIGITS, "[A-Za-z0-9]")):
+        if np.isin(column, np.frombuffer(alphabet, dtype=np.uint8)).all():
+            return token
+    return None
+
+
+def _collapse(tokens: List[str]) -> str:
+    """Join per-position tokens, folding repeated classes into ``{n}``."""
+    parts = []
+    i = 0
+    while i < len(tokens):
+        j = i
+        while j < len(tokens) and tokens[j] == tokens[i]:
+            j += 1
+        is_class = tokens[i].startswith('[') or tokens[i] == r"\d"
+        if is_class and j - i > 1:
+            parts.append(f"{tokens[i]}{{{j - i}}}")
+        else:
+            parts.append(tokens[i] * (j - i))
+        i = j
+    return "".join(parts)
+
+
+def _learn_fixed_width(sample: pd.Series, width: int) -> Optional[str]:
+    chars = np.frombuffer("".join(sample.tolist()).encode('ascii'), dtype=np.uint8).reshape(-1, width)
+    tokens = [_position_class(chars[:, pos]) for pos in range(width)]
+    if any(token is None for token in tokens):
+        return None
+    return _collapse(tokens)
+
+
+_RUNS = re.compile(r"[0-9]+|[A-Z]+|[a-z]+|[^0-9A-Za-z]")
+
+
+def _learn_runs(sample: pd.Series) -> Optional[str]:
+    """Variable-length values: same sequence of digit/letter runs and separators."""
+    runs = sample.str.findall(_RUNS)
+    shapes = runs.map(lambda parts: tuple(
+        part if not part.isalnum() else ('9' if part[0].isdigit() else 'A' if part[0].isupper() else 'a')
+        for part in parts
+    ))
+    if shapes.nunique() != 1:
+        return None
+    shape = shapes.iloc[0]
+    lengths = pd.DataFrame(runs.map(lambda parts: [len(part) for part in parts]).tolist())
+    classes = {'9': r"\d", 'A': "[A-Z]", 'a': "[a-z]"}
+    parts = []
+    for i, kind in enumerate(shape):
+        if kind not in classes:
+            parts.append(re.escape(kind))
+            continue
+        low, high = int(lengths[i].min()), int(lengths[i].max())
+        parts.append(classes[kind] + (f"{{{low}}}" if low == high else f"{{{low},{high}}}"))
+    return "".join(parts)
+
+
+def learn_pattern(values: pd.Series, sample_size: int = 1000) -> Optional[str]:
+    """
+    Learn a generating pattern from a sample of a string column.
+
+    Equal-length values are learned position by position (constant positions
+    become literals); otherwise every value must share the same sequence of
+    digit/letter runs and separators. Returns None when no single pattern
+    covers the sample, the values are not printable ASCII without spaces, or
+    the pattern would be wider than ``MAX_PATTERN_WIDTH``.
+    """
+    sample = values.dropna().astype(str)
+    if sample.nunique() < 2:
+        # Empty or constant: nothing to learn
+        return None
+    if len(sample) > sample_size:
+        sample = sample.sample(n=sample_size, random_state=0)
+    if not sample.str.fullmatch(r"[\x21-\x7e]+").all():
+        return None
+
+    lengths = sample.str.len()
+    if lengths.nunique() == 1:
+        pattern = _learn_fixed_width(sample, int(lengths.iloc[0]))
+    else:
+        pattern = _learn_runs(sample)
+    if pattern is None or not sample.str.fullmatch(pattern).all():
+        return None
+    try:
+        parse_pattern(pattern)
+    except ValueError:
+        return None
+    return pattern
+
+
+class PatternGenerator(BaseGenerator):
+    """Generates strings for ``pattern`` columns."""
+
+    def __init__(self):
+        super().__init__("pattern")
+
+    def generate(self, column_spec: Dict[str, Any], num_rows: int, **kwargs) -> Any:
+        pattern = column_spec.get('pattern') or column_spec.get('constraints', {}).get('regex')
+        if not pattern:
+            raise ValueError("Pattern columns need a 'pattern' entry")
+        rng = ensure_rng(kwargs.get('rng'))
+        values = generate_pattern(pattern, num_rows, rng)
+
+        null_percentage = column_spec.get('statistics', {}).get('null_percentage', 0)
+        if null_percentage:
+            values[rng.random(num_rows) < null_percentage] = None
+        return values
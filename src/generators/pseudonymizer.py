@@ -0,0 +1,269 @@
+"""
+Consistent, format-preserving pseudonymization of identifier columns.
+
+Values are mapped through a keyed FE1 Feistel permutation computed with
+vectorized uint64 arithmetic. The domain of each value depends only on the
+value's own format, never on the rest of the column, so the same key maps
+the same input to the same output in every file and every run: primary keys
+and the foreign keys that reference them stay joinable. Distinct inputs
+never collide, and no frequency tables are built.
+
+- integer IDs keep their sign and number of decimal digits (results are int64)
+- string IDs keep their length, separators and the class of every character;
+  digits, upper- and lower-case letters are permuted as mixed-radix numbers
+"""
+import hashlib
+import os
+from typing import Any, Dict, List, Optional
+import numpy as np
+import pandas as pd
+
+from .base_generator import BaseGenerator
+from ..utils.logger import get_logger
+from ..utils.random_state import ensure_rng
+
+logger = get_logger(__name__)
+
+DEFAULT_KEY = "synthetic-data-generator"
+_ROUNDS = 4
+_MAX_DOMAIN = 1 << 62
+
+_DIGITS = np.frombuffer(b"0123456789", dtype=np.uint8)
+_UPPER = np.frombuffer(b"ABCDEFGHIJKLMNOPQRSTUVWXYZ", dtype=np.uint8)
+_LOWER = np.frombuffer(b"abcdefghijklmnopqrstuvwxyz", dtype=np.uint8)
+_ALPHABETS = (None, _DIGITS, _UPPER, _LOWER)
+
+# Byte -> character class (0: kept as is, otherwise an index into _ALPHABETS)
+_CLASS = np.zeros(256, dtype=np.uint8)
+_INDEX = np.zeros(256, dtype=np.uint64)
+for _cls, _alphabet in enumerate(_ALPHABETS[1:], start=1):
+    _CLASS[_alphabet] = _cls
+    _INDEX[_alphabet] = np.arange(len(_alphabet), dtype=np.uint64)
+
+# Upper bounds of 1..18 digit magnitudes; 19-digit integers go through the string path
+_POW10 = np.array([10 ** i for i in range(1, 19)], dtype=np.uint64)
+
+
+def _splitmix64(x: np.ndarray) -> np.ndarray:
+    """Vectorized SplitMix64 finalizer (wrapping uint64 arithmetic)."""
+    with np.errstate(over='ignore'):
+        x = x + np.uint64(0x9E3779B97F4A7C15)
+        x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+        x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+        return x ^ (x >> np.uint64(31))
+
+
+class Pseudonymizer:
+    """Keyed format-preserving mapping for identifier values."""
+
+    def __init__(self, key: Optional[str] = None):
+        key = key or os.getenv("SDG_PSEUDONYM_KEY") or DEFAULT_KEY
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=8 * (_ROUNDS + 1)).digest()
+        words = np.frombuffer(digest, dtype="<u8")
+        self._round_keys = words[:_ROUNDS]
+        # pandas' hash_array expects a 16-character key
+        self._hash_key = digest[8 * _ROUNDS:].hex()
+
+    def _permute(self, x: np.ndarray, domain: int, tweak: int = 0) -> np.ndarray:
+        """
+        FE1 permutation of ``x`` over [0, domain) with cycle walking.
+
+        The Feistel works on Z_a x Z_b with a*b >= domain; results that fall
+        outside the domain are re-encrypted until they land inside it.
+        """
+        if domain <= 1:
+            return x.copy()
+        a = int(np.ceil(np.sqrt(domain)))
+        b = (domain + a - 1) // a
+        x = x.astype(np.uint64).copy()
+        pending = np.ones(len(x), dtype=bool)
+        while pending.any():
+            y = self._fe1(x[pending], a, b, tweak)
+            x[pending] = y
+            pending[pending] = y >= np.uint64(domain)
+        return x
+
+    def _fe1(self, x: np.ndarray, a: int, b: int, tweak: int) -> np.ndarray:
+        ua, ub = np.uint64(a), np.uint64(b)
+        for i, round_key in enumerate(self._round_keys):
+            # Alternate the (a, b) split so every round is a bijection on Z_a x Z_b
+            divisor, modulus = (ub, ua) if i % 2 == 0 else (ua, ub)
+            left, right = x // divisor, x % divisor
+            with np.errstate(over='ignore'):
+                f = _splitmix64(right ^ round_key ^ np.uint64(tweak))
+            x = modulus * right + (left + f % modulus) % modulus
+        return x
+
+    def pseudonymize_integers(self, values: np.ndarray, tweak: int = 0) -> np.ndarray:
+        """
+        Permute integers among those with the same sign and number of digits.
+
+        Raises ValueError for magnitudes of 19 digits and more.
+        """
+        values = np.asarray(values, dtype=np.int64)
+        if len(values) and (values.min() <= -10 ** 18 or values.max() >= 10 ** 18):
+            raise ValueError("Integer identifier too large to permute")
+        magnitude = np.abs(values).astype(np.uint64)
+        digits = np.searchsorted(_POW10, magnitude, side="right") + 1
+        out = np.empty(len(values), dtype=np.uint64)
+        for d in np.unique(digits):
+            rows = digits == d
+            low = 0 if d == 1 else 10 ** (int(d) - 1)
+            out[rows] = self._permute(magnitude[rows] - np.uint64(low), 10 ** int(d) - low,
+                                      (tweak << 8) | int(d)) + np.uint64(low)
+        return np.where(values < 0, -out.astype(np.int64), out.astype(np.int64))
+
+    def pseudonymize_strings(self, values: pd.Series, tweak: int = 0) -> pd.Series:
+        """Format-preserving mapping of string identifiers (nulls are kept)."""
+        result = pd.Series(np.empty(len(values), dtype=object), index=values.index)
+        result[:] = None
+        non_null = values.dropna().astype(str)
+        if non_null.empty:
+            return result
+        encoded = non_null.str.encode("utf-8")
+        for width, group in encoded.groupby(encoded.str.len(), sort=False):
+            result[group.index] = self._pseudonymize_fixed_width(non_null[group.index], group, int(width), tweak)
+        return result
+
+    def _pseudonymize_fixed_width(self, group: pd.Series, encoded: pd.Series, width: int, tweak: int) -> np.ndarray:
+        """
+        Map strings of ``width`` bytes position-wise.
+
+        Values are grouped by shape (the class of each byte); within a shape
+        the digit/letter positions form mixed-radix numbers of at most
+        ``_MAX_DOMAIN`` that are permuted independently, other bytes
+        (separators, non-ASCII text) are kept. Values without any digit or
+        letter fall back to a keyed hash.
+        """
+        if width == 0:
+            return self._hash_fallback(group)
+        chars = np.frombuffer(b"".join(encoded.tolist()), dtype=np.uint8).reshape(-1, width)
+        classes = _CLASS[chars]
+        shapes, inverse = np.unique(classes, axis=0, return_inverse=True)
+        inverse = inverse.ravel()
+
+        out = chars.copy()
+        hashed = np.zeros(len(chars), dtype=bool)
+        for s, shape in enumerate(shapes):
+            rows = np.flatnonzero(inverse == s)
+            positions = np.flatnonzero(shape)
+            if not positions.size:
+                hashed[rows] = True
+                continue
+            for b, block in enumerate(self._blocks(shape, positions)):
+                radices = [len(_ALPHABETS[shape[pos]]) for pos in block]
+                number = np.zeros(len(rows), dtype=np.uint64)
+                for pos, radix in zip(block, radices):
+                    number = number * np.uint64(radix) + _INDEX[chars[rows, pos]]
+                domain = int(np.prod(np.array(radices, dtype=object)))
+                number = self._permute(number, domain, (tweak << 8) | b)
+                for pos, radix in reversed(list(zip(block, radices))):
+                    out[rows, pos] = _ALPHABETS[shape[pos]][(number % np.uint64(radix)).astype(np.intp)]
+                    number //= np.uint64(radix)
+
+        mapped = np.char.decode(out.view(f"S{width}").ravel(), "utf-8").astype(object)
+        if hashed.any():
+            mapped[hashed] = self._hash_fallback(group[hashed])
+        return mapped
+
+    @staticmethod
+    def _blocks(shape: np.ndarray, positions: np.ndarray) -> List[List[int]]:
+        """Split permutable positions into consecutive runs whose domain fits ``_MAX_DOMAIN``."""
+        blocks: List[List[int]] = [[]]
+        domain = 1
+        for pos in positions:
+            radix = len(_ALPHABETS[shape[pos]])
+            if domain * radix > _MAX_DOMAIN:
+                blocks.append([])
+                domain = 1
+            blocks[-1].append(int(pos))
+            domain *= radix
+        return blocks
+
+    def _hash_fallback(self, group: pd.Series) -> np.ndarray:
+        hashes = pd.util.hash_array(group.to_numpy(dtype=object), hash_key=self._hash_key)
+        return np.char.add("ID", np.char.zfill(np.char.mod("%x", hashes), 16)).astype(object)
+
+    def pseudonymize(self, series: pd.Series, tweak: int = 0) -> pd.Series:
+        """
+        Pseudonymize a column, choosing the integer or string strategy by dtype.
+
+        Integer columns come back as int64 (nullable ``Int64`` when they have
+        nulls), never narrowed to the input dtype, since a pseudonym can have
+        more significant bits than the key it replaces.
+        """
+        if pd.api.types.is_integer_dtype(series):
+            non_null = series.dropna()
+            try:
+                mapped = self.pseudonymize_integers(non_null.to_numpy(dtype=np.int64), tweak)
+            except ValueError:
+                pass
+            else:
+                result = pd.Series(mapped, index=non_null.index, name=series.name)
+                return result if len(non_null) == len(series) else result.astype("Int64").reindex(series.index)
+        return self.pseudonymize_strings(series, tweak).rename(series.name)
+
+    def extend(self, mapped: pd.Series, source: pd.Series, tile: int) -> pd.Series:
+        """
+        Derive the ``tile``-th set of extra keys from mapped ``source`` keys.
+
+        Used when more unique keys are requested than the source has: integers
+        are moved past the largest source magnitude, strings get a ``-<tile>``
+        suffix, so extra keys never collide with mapped ones or each other.
+        """
+        if pd.api.types.is_integer_dtype(mapped):
+            digits = len(str(int(source.abs().max())))
+            if tile * 10 ** digits + 10 ** digits <= np.iinfo(np.int64).max:
+                return mapped + np.sign(mapped).replace(0, 1) * tile * 10 ** digits
+            mapped = mapped.astype(str)
+        return mapped.astype(str) + f"-{tile}"
+
+
+class PseudonymGenerator(BaseGenerator):
+    """
+    Generates identifier columns by pseudonymizing source keys instead of sampling them.
+
+    Primary keys (``identifier == 'primary'``) are drawn without replacement
+    so they stay unique, also across chunks generated with ``row_offset``;
+    foreign keys are resampled with their observed frequencies and go through
+    the same mapping, so they still reference the pseudonymized primary keys
+    of the parent table.
+
+    ``row_offset`` is the position of the first generated row within the
+    whole output, and a primary key is a function of its position. Calls
+    that contribute to one output (chunks, rows regenerated by the privacy
+    check) must therefore cover disjoint position ranges, e.g. by passing the
+    running count of rows drawn so far; overlapping ranges repeat keys.
+    """
+
+    def __init__(self, key: Optional[str] = None):
+        super().__init__("pseudonym")
+        self.pseudonymizer = Pseudonymizer(key)
+
+    def generate(self, column_spec: Dict[str, Any], num_rows: int, **kwargs) -> List[Any]:
+        original_series = kwargs.get("original_series")
+        offset = kwargs.get("row_offset", 0)
+        if isinstance(offset, bool) or not isinstance(offset, (int, np.integer)) or offset < 0:
+            raise ValueError(f"row_offset must be a non-negative integer, got {offset!r}")
+        if original_series is None or original_series.dropna().empty:
+            return [f"ID{i:08d}" for i in range(offset, offset + num_rows)]
+
+        if column_spec.get("identifier") == "foreign":
+            source = original_series.reset_index(drop=True)
+            picks = ensure_rng(kwargs.get("rng")).integers(0, len(source), num_rows)
+            return self.pseudonymizer.pseudonymize(source).iloc[picks].tolist()
+
+        source = original_series.dropna().drop_duplicates().reset_index(drop=True)
+        n = len(source)
+        # Each key's pseudonym depends only on the key, so map the source once
+        mapped = self.pseudonymizer.pseudonymize(source)
+        # Output position p takes the (p mod n)-th key of a keyed shuffle, from pass p // n
+        # over the source; positions never repeat, so neither do keys (also across chunks)
+        tiles, slots = np.divmod(np.arange(offset, offset + num_rows, dtype=np.int64), n)
+        values = np.empty(num_rows, dtype=object)
+        for tile in np.unique(tiles):
+            rows = tiles == tile
+            keys = mapped if tile == 0 else self.pseudonymizer.extend(mapped, source, int(tile))
+            order = self.pseudonymizer._permute(slots[rows], n, tweak=int(tile)).astype(np.intp)
+            values[rows] = keys.to_numpy(dtype=object)[order]
+        return values.tolist()
@@ -0,0 +1,66 @@
+"""
+Small thread-safe in-memory caches shared across requests.
+"""
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Hashable
+
+_MISSING = object()
+
+
+class LRUCache:
+    """
+    Bounded least-recently-used mapping guarded by a lock.
+
+    ``get_or_create`` computes missing values outside the lock, so a slow
+    factory (an LLM call, a model fit) never blocks readers of other keys;
+    two threads missing the same key at once may both compute it, and the
+    first stored value wins.
+    """
+
+    def __init__(self, max_size: int = 256):
+        self.max_size = max_size
+        self._items: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            value = self._items.get(key, _MISSING)
+            if value is _MISSING:
+                self.misses += 1
+                return default
+            self._items.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Hashable, value: Any) -> Any:
+        """Store ``value`` unless another thread stored one first; returns the cached value."""
+        if not self.max_size:
+            return value
+        with self._lock:
+            current = self._items.get(key, _MISSING)
+            if current is not _MISSING:
+                self._items.move_to_end(key)
+                return current
+            self._items[key] = value
+            while len(self._items) > self.max_size:
+                self._items.popitem(last=False)
+            return value
+
+    def get_or_create(self, key: Hashable, factory: Callable[[], Any]) -> Any:
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = self.put(key, factory())
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def stats(self) -> dict:
+        return {'size': len(self), 'max_size': self.max_size, 'hits': self.hits, 'misses': self.misses}
@@ -2,4 +2,65 @@ class Config:
     def __init__(self):
         self.default_rows = 1000
         self.max_workers = 4
-        self.output_dir = "output"
\ No newline at end of file
+        self.output_dir = "output"
+        # Inputs with more rows than this are profiled with streaming sketches
+        self.approximate_inference_rows = 1_000_000
+        self.inference_accuracy = 0.01
+        # ...and the generators are fitted on a uniform sample of this many rows
+        self.approximate_sample_rows = 100_000
+        # Directory for Feather copies of CSV/JSON/Excel inputs (None disables) and its size limit
+        self.columnar_cache_dir = None
+        self.columnar_cache_max_bytes = 1 << 30
+        # Narrow generated frames to compact dtypes (inputs keep their width for inference and fitting).
+        # Opt-in: columns come back as uint8/int16/float32/category sized to the generated values, so
+        # arithmetic on the output can wrap or lose precision (e.g. uint8 0 - 1 == 255)
+        self.optimize_dtypes = False
+        self.categorical_threshold = 0.5
+        # Chunked generation and incremental validation
+        self.chunk_size = 100_000
+        self.validation_sample_fraction = 1.0
+        # Constraints are enforced during generation; set to re-check the full output afterwards
+        self.post_validate = False
+        # Real-vs-synthetic fidelity report after file-based generation (opt-in: an extra pass over both frames)
+        self.compute_fidelity = False
+        self.fidelity_sample_size = 200_000
+        # Exact-match / distance-to-closest-record check for file-based generation
+        # (opt-in: hashes every real row and builds a KD-tree over the input)
+        self.privacy_check = False
+        self.privacy_reject = False
+        self.privacy_max_rounds = 5
+        # Also reject rows closer than this to a real record (encoded space); None = exact copies only
+        self.privacy_dcr_threshold = None
+        # Key columns (near-unique or named like references) get consistent keyed pseudonyms
+        # (key falls back to SDG_PSEUDONYM_KEY)
+        self.pseudonymize_identifiers = True
+        self.identifier_unique_ratio = 0.95
+        self.pseudonym_key = None
+        # Streaming exporters: write buffer and zstd worker threads (0 = on the writer thread, -1 = all cores)
+        self.export_buffer_size = 1 << 20
+        self.export_compression_threads = 0
+        # Database exporter: rows per executemany batch and per committed transaction
+        self.db_batch_size = 10_000
+        self.db_transaction_rows = 100_000
+        # Partitioned output: concurrently open files (one writer thread each)
+        self.partition_max_open_files = 16
+        # Chunks buffered between generation and export (bounds memory, applies backpressure)
+        self.pipeline_queue_size = 4
+        # Rows per chunk for streamed HTTP responses (smaller first bytes than chunk_size)
+        self.stream_chunk_size = 10_000
+        # Long-lived engines (web app): cached prompt schemas and fitted models
+        self.schema_cache_size = 256
+        self.model_cache_size = 256
+        # Background jobs (web app): concurrent workers and queued-plus-running limit
+        self.job_workers = 2
+        self.job_max_queued = 100
+        # Content store (web app uploads, job outputs, reports): disk quota and idle TTL
+        self.store_max_bytes = 2 << 30
+        self.store_ttl_seconds = 7 * 24 * 3600
+        # Seeded web requests up to this many rows are cached in the content store (0 disables)
+        self.result_cache_max_rows = 1_000_000
+        # File previews read and fit only the first this-many rows of the file
+        self.preview_sample_rows = 10_000
+        # EDA reports: above this many cells (rows x columns) profile minimally, on a sample of this many rows
+        self.eda_minimal_cells = 5_000_000
+        self.eda_sample_rows = 100_000
@@ -0,0 +1,35 @@
+"""
+Reproducible (seeded) generation.
+
+Every run owns a ``numpy.random.Generator`` (seeded for reproducible runs,
+from OS entropy otherwise) that the engine passes to the generators and the
+constraint layer as the ``rng`` keyword. Generators that need another random
+source (Mimesis providers, ``random.Random``) seed it from that generator.
+No process-wide random state is reseeded or locked, so concurrent runs
+neither wait for nor disturb each other, and a chunk iterator that is
+abandoned midway holds nothing.
+"""
+import random
+from typing import Optional
+
+import numpy as np
+
+
+def run_rng(seed: Optional[int] = None) -> np.random.Generator:
+    """Random generator for one run (fresh entropy for ``seed=None``)."""
+    return np.random.default_rng(None if seed is None else seed % 2 ** 64)
+
+
+def ensure_rng(rng: Optional[np.random.Generator]) -> np.random.Generator:
+    """``rng``, or a freshly seeded generator for calls made outside an engine run."""
+    return rng if rng is not None else np.random.default_rng()
+
+
+def derive_seed(rng: np.random.Generator) -> int:
+    """Integer seed for a secondary random source, drawn from ``rng``."""
+    return int(rng.integers(2 ** 63))
+
+
+def python_random(rng: Optional[np.random.Generator]) -> random.Random:
+    """``random.Random`` seeded from ``rng`` (fresh entropy if None)."""
+    return random.Random(derive_seed(ensure_rng(rng)))
@@ -1,16 +1,167 @@
 """
 Data validation utilities for synthetic data.
 """
-from typing import Any, Dict, List, Optional
+from statistics import NormalDist
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import math
 import pandas as pd
 import numpy as np
 
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+except ImportError:  # string lengths then fall back to pandas' .str.len()
+    pa = None
+
+from ..core.cross_constraints import CrossColumnPlan, column_specs
+
 class ValidationResult:
     """Result of data validation."""
     
-    def __init__(self, is_valid: bool = True, errors: List[str] = None):
+    def __init__(self, is_valid: bool = True, errors: List[str] = None,
+                 statistics: Optional[Dict[str, Any]] = None):
         self.is_valid = is_valid
         self.errors = errors or []
+        self.statistics = statistics or {}
+
+
+# Key under which cross-column rule violations are counted
+CROSS_COLUMN = "__cross_column__"
+
+
+class ValidationFailed(ValueError):
+    """Raised when streaming validation hits a hard failure in fail-fast mode."""
+    
+    def __init__(self, result: ValidationResult):
+        super().__init__("; ".join(result.errors))
+        self.result = result
+
+
+def wilson_interval(violations: int, checked: int, confidence: float = 0.95) -> Tuple[float, float]:
+    """Wilson score confidence interval for a violation rate."""
+    if checked == 0:
+        return 0.0, 1.0
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+    p = violations / checked
+    denominator = 1 + z * z / checked
+    centre = (p + z * z / (2 * checked)) / denominator
+    margin = z * math.sqrt(p * (1 - p) / checked + z * z / (4 * checked * checked)) / denominator
+    return max(0.0, centre - margin), min(1.0, centre + margin)
+
+
+class StreamingValidator:
+    """
+    Incremental validator fed one chunk at a time.
+    
+    Type and missing-column problems are hard failures; constraint
+    violations are counted per column. With ``sample_fraction < 1`` only a
+    Bernoulli sample of each chunk is checked and violation rates are
+    reported with confidence bounds.
+    """
+    
+    def __init__(
+        self,
+        validator: "DataValidator",
+        schema: Dict[str, Any],
+        fail_fast: bool = True,
+        sample_fraction: float = 1.0,
+        confidence: float = 0.95,
+        seed: Optional[int] = None
+    ):
+        if not 0 < sample_fraction <= 1:
+            raise ValueError("sample_fraction must be in (0, 1]")
+        self.validator = validator
+        self.schema = column_specs(schema)
+        self.plan = CrossColumnPlan(schema)
+        self.fail_fast = fail_fast
+        self.sample_fraction = sample_fraction
+        self.confidence = confidence
+        self.rows_seen = 0
+        self.rows_checked = 0
+        self.violations: Dict[str, Dict[str, int]] = {}
+        self.hard_errors: List[str] = []
+        self._rng = np.random.default_rng(seed)
+    
+    @property
+    def failed(self) -> bool:
+        return bool(self.hard_errors)
+    
+    def update(self, chunk: pd.DataFrame) -> bool:
+        """
+        Validate one chunk and update the running counters.
+        
+        Returns:
+            False once a hard failure has been seen in fail-fast mode
+        """
+        if self.failed and self.fail_fast:
+            return False
+        
+        self.rows_seen += len(chunk)
+        if self.sample_fraction < 1:
+            chunk = chunk[self._rng.random(len(chunk)) < self.sample_fraction]
+        self.rows_checked += len(chunk)
+        
+        for column_name, column_spec in self.schema.items():
+            if column_name not in chunk.columns:
+                self._hard_error(f"Missing column: {column_name}")
+                continue
+            
+            column_data = chunk[column_name]
+            data_type = column_spec.get('type', 'string')
+            if data_type in self.validator.validation_rules:
+                for error in self.validator.validation_rules[data_type](column_data, column_spec):
+                    self._hard_error(error)
+            
+            counts = self.validator.count_constraint_violations(column_data, column_spec)
+            column_counts = self.violations.setdefault(column_name, {})
+            for check, count in counts.items():
+                column_counts[check] = column_counts.get(check, 0) + count
+            
+            if self.failed and self.fail_fast:
+                return False
+        
+        if self.plan.has_rules:
+            rule_counts = self.violations.setdefault(CROSS_COLUMN, {})
+            for rule, count in self.plan.violations(chunk).items():
+                rule_counts[rule] = rule_counts.get(rule, 0) + count
+        
+        return not (self.failed and self.fail_fast)
+    
+    def _hard_error(self, error: str) -> None:
+        if error not in self.hard_errors:
+            self.hard_errors.append(error)
+    
+    def result(self) -> ValidationResult:
+        """Summarise everything seen so far."""
+        errors = list(self.hard_errors)
+        rates: Dict[str, Dict[str, Any]] = {}
+        for column_name, counts in self.violations.items():
+            for check, count in counts.items():
+                if self.sample_fraction < 1:
+                    low, high = wilson_interval(count, self.rows_checked, self.confidence)
+                    rates.setdefault(column_name, {})[check] = {
+                        'violations': count,
+                        'rate': count / self.rows_checked if self.rows_checked else 0.0,
+                        'rate_lower': low,
+                        'rate_upper': high,
+                        'estimated_violations': int(round(count / self.sample_fraction))
+                    }
+                if count:
+                    scope = " (sampled)" if self.sample_fraction < 1 else ""
+                    if column_name == CROSS_COLUMN:
+                        errors.append(f"Cross-column rule {check} has {count} violations{scope}")
+                    else:
+                        errors.append(f"Column {column_name} has {count} {check.replace('_', ' ')} violations{scope}")
+        
+        statistics = {
+            'rows_seen': self.rows_seen,
+            'rows_checked': self.rows_checked,
+            'violations': self.violations,
+            'confidence': self.confidence,
+        }
+        if rates:
+            statistics['violation_rates'] = rates
+        return ValidationResult(is_valid=len(errors) == 0, errors=errors, statistics=statistics)
 
 class DataValidator:
     """Validates generated synthetic data."""
@@ -22,7 +173,8 @@ class DataValidator:
             'string': self._validate_string,
             'boolean': self._validate_boolean,
             'datetime': self._validate_datetime,
-            'categorical': self._validate_categorical
+            'categorical': self._validate_categorical,
+            'pattern': self._validate_pattern
         }
     
     def validate_data(self, data: pd.DataFrame, schema: Dict[str, Any]) -> ValidationResult:
@@ -38,7 +190,7 @@ class DataValidator:
         """
         errors = []
         
-        for column_name, column_spec in schema.items():
+        for column_name, column_spec in column_specs(schema).items():
             if column_name not in data.columns:
                 errors.append(f"Missing column: {column_name}")
                 continue
@@ -55,16 +207,73 @@ class DataValidator:
             constraint_errors = self._validate_constraints(column_data, column_spec)
             errors.extend(constraint_errors)
         
+        # Validate cross-column rules
+        for rule, count in CrossColumnPlan(schema).violations(data).items():
+            if count:
+                errors.append(f"Cross-column rule {rule} has {count} violations")
+        
         return ValidationResult(is_valid=len(errors) == 0, errors=errors)
     
+    def stream(self, schema: Dict[str, Any], **kwargs) -> StreamingValidator:
+        """Create a StreamingValidator for validating chunks as they are produced."""
+        return StreamingValidator(self, schema, **kwargs)
+    
+    def validate_chunks(
+        self,
+        chunks: Iterable[pd.DataFrame],
+        schema: Dict[str, Any],
+        **kwargs
+    ) -> ValidationResult:
+        """
+        Validate an iterable of chunks without materializing the full frame.
+        
+        Args:
+            chunks: Iterable of DataFrame chunks
+            schema: Expected schema
+            **kwargs: StreamingValidator options (fail_fast, sample_fraction, confidence, seed)
+            
+        Returns:
+            ValidationResult with running violation counters in ``statistics``
+        """
+        streaming = self.stream(schema, **kwargs)
+        for chunk in chunks:
+            if not streaming.update(chunk):
+                break
+        return streaming.result()
+    
+    def count_constraint_violations(self, data: pd.Series, spec: Dict[str, Any]) -> Dict[str, int]:
+        """Count rows violating the column constraints (vectorized)."""
+        counts: Dict[str, int] = {}
+        constraints = spec.get('constraints', {})
+        
+        try:
+            if 'min' in constraints:
+                counts['below_min'] = int((data < constraints['min']).sum())
+            if 'max' in constraints:
+                counts['above_max'] = int((data > constraints['max']).sum())
+            if 'length' in constraints and spec.get('type') == 'string':
+                expected_length = constraints['length']
+                if isinstance(data.dtype, pd.CategoricalDtype):
+                    # Check each category once, then count rows through the codes
+                    bad = (data.cat.categories.astype(str).str.len() != expected_length)
+                    codes = data.cat.codes.to_numpy()
+                    counts['length'] = int(np.asarray(bad)[codes[codes >= 0]].sum())
+                else:
+                    counts['length'] = self._length_mismatches(data, expected_length)
+        except Exception:
+            counts['constraint_error'] = len(data)
+        
+        return counts
+    
     def _validate_integer(self, data: pd.Series, spec: Dict[str, Any]) -> List[str]:
         """Validate integer data."""
         errors = []
         
         try:
-            # Check if all non-null values are integers
-            non_null_data = data.dropna()
-            if not non_null_data.apply(lambda x: isinstance(x, (int, np.integer))).all():
+            # Typed integer/bool arrays are valid by construction – no scan needed
+            if pd.api.types.is_integer_dtype(data) or pd.api.types.is_bool_dtype(data):
+                return errors
+            if self._inferred_type(data) not in ('integer', 'boolean', 'empty'):
                 errors.append(f"Column {data.name} contains non-integer values")
         except Exception as e:
             errors.append(f"Column {data.name} integer validation failed: {str(e)}")
@@ -76,8 +285,9 @@ class DataValidator:
         errors = []
         
         try:
-            non_null_data = data.dropna()
-            if not non_null_data.apply(lambda x: isinstance(x, (float, int, np.floating, np.integer))).all():
+            if pd.api.types.is_numeric_dtype(data):
+                return errors
+            if self._inferred_type(data) not in ('floating', 'integer', 'mixed-integer-float', 'boolean', 'empty'):
                 errors.append(f"Column {data.name} contains non-numeric values")
         except Exception as e:
             errors.append(f"Column {data.name} float validation failed: {str(e)}")
@@ -89,21 +299,40 @@ class DataValidator:
         errors = []
         
         try:
-            non_null_data = data.dropna()
-            if not non_null_data.apply(lambda x: isinstance(x, str)).all():
+            if isinstance(data.dtype, pd.StringDtype):
+                return errors
+            if self._inferred_type(data) not in ('string', 'empty'):
                 errors.append(f"Column {data.name} contains non-string values")
         except Exception as e:
             errors.append(f"Column {data.name} string validation failed: {str(e)}")
         
         return errors
     
+    def _validate_pattern(self, data: pd.Series, spec: Dict[str, Any]) -> List[str]:
+        """Validate pattern data: strings that fully match ``spec['pattern']``."""
+        errors = self._validate_string(data, spec)
+        pattern = spec.get('pattern')
+        if errors or not pattern:
+            return errors
+        
+        try:
+            values = self._values(data).dropna().astype(str)
+            mismatches = int((~values.str.fullmatch(pattern)).sum())
+            if mismatches:
+                errors.append(f"Column {data.name} has {mismatches} values not matching pattern {pattern!r}")
+        except Exception as e:
+            errors.append(f"Column {data.name} pattern validation failed: {str(e)}")
+        
+        return errors
+    
     def _validate_boolean(self, data: pd.Series, spec: Dict[str, Any]) -> List[str]:
         """Validate boolean data."""
         errors = []
         
         try:
-            non_null_data = data.dropna()
-            if not non_null_data.apply(lambda x: isinstance(x, (bool, np.bool_))).all():
+            if pd.api.types.is_bool_dtype(data):
+                return errors
+            if self._inferred_type(data) not in ('boolean', 'empty'):
                 errors.append(f"Column {data.name} contains non-boolean values")
         except Exception as e:
             errors.append(f"Column {data.name} boolean validation failed: {str(e)}")
@@ -115,13 +344,42 @@ class DataValidator:
         errors = []
         
         try:
+            if pd.api.types.is_datetime64_any_dtype(data):
+                return errors
             # Try to convert to datetime
-            pd.to_datetime(data, errors='raise')
+            pd.to_datetime(self._values(data), errors='raise')
         except Exception as e:
             errors.append(f"Column {data.name} contains invalid datetime values: {str(e)}")
         
         return errors
     
+    @staticmethod
+    def _values(data: pd.Series) -> pd.Series:
+        """Distinct categories for categorical columns, the column itself otherwise."""
+        if isinstance(data.dtype, pd.CategoricalDtype):
+            return pd.Series(data.cat.categories, name=data.name)
+        return data
+    
+    @classmethod
+    def _inferred_type(cls, data: pd.Series) -> str:
+        """Element type of a column via pandas' C-level inference (skips nulls)."""
+        return pd.api.types.infer_dtype(cls._values(data), skipna=True)
+    
+    @classmethod
+    def _length_mismatches(cls, values: pd.Series, expected_length: int) -> int:
+        """Non-null ``values`` whose length is not ``expected_length`` (non-strings measured as ``str(value)``)."""
+        if pa is not None and values.dtype == object:
+            try:
+                # One Arrow pass instead of a Python len() per element; raises on non-strings
+                lengths = pc.utf8_length(pa.array(values, type=pa.string(), from_pandas=True))
+                return pc.sum(pc.not_equal(lengths, expected_length)).as_py() or 0
+            except (pa.ArrowInvalid, pa.ArrowTypeError):
+                pass
+        values = values.dropna()
+        if not pd.api.types.is_string_dtype(values) or cls._inferred_type(values) != 'string':
+            values = values.astype(str)
+        return int((values.str.len() != expected_length).sum())
+    
     def _validate_categorical(self, data: pd.Series, spec: Dict[str, Any]) -> List[str]:
         """Validate categorical data."""
         errors = []
@@ -129,9 +387,9 @@ class DataValidator:
         try:
             # Check if all values are in allowed categories
             if 'categories' in spec:
-                allowed = set(spec['categories'])
-                unique_values = set(data.dropna().unique())
-                invalid = unique_values - allowed
+                values = self._values(data)
+                present = values[values.notna()].unique()
+                invalid = set(present[~pd.Series(present).isin(spec['categories']).to_numpy()])
                 if invalid:
                     errors.append(f"Column {data.name} contains invalid categories: {invalid}")
         except Exception as e:
@@ -145,23 +403,21 @@ class DataValidator:
         constraints = spec.get('constraints', {})
         
         try:
-            non_null_data = data.dropna()
-            
-            # Min/Max constraints
+            # Min/Max constraints – reductions skip nulls, no boolean mask needed
             if 'min' in constraints:
                 min_val = constraints['min']
-                if (non_null_data < min_val).any():
+                if data.min() < min_val:
                     errors.append(f"Column {data.name} has values below minimum {min_val}")
             
             if 'max' in constraints:
                 max_val = constraints['max']
-                if (non_null_data > max_val).any():
+                if data.max() > max_val:
                     errors.append(f"Column {data.name} has values above maximum {max_val}")
             
             # Length constraints (for strings)
             if 'length' in constraints and spec.get('type') == 'string':
                 expected_length = constraints['length']
-                if not non_null_data.apply(lambda x: len(str(x)) == expected_length).all():
+                if self._length_mismatches(self._values(data), expected_length):
                     errors.append(f"Column {data.name} has strings not matching length {expected_length}")
             
         except Exception as e:
@@ -0,0 +1,207 @@
+"""
+Privacy checks for synthetic data generated from real records.
+
+- exact matches: whole-row hashes of synthetic rows looked up in the set of
+  real row hashes (vectorized, no pairwise comparison)
+- distance to closest record (DCR): real rows are encoded into a numeric
+  feature space and indexed with a KD-tree/ball-tree; synthetic rows are
+  queried in chunks. Rows closer to a real record than real records
+  typically are to each other are flagged.
+"""
+from typing import Any, Dict, List, Optional
+import numpy as np
+import pandas as pd
+from sklearn.neighbors import BallTree, KDTree
+
+from ..utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class PrivacyReport:
+    """Exact-match and distance-to-closest-record results."""
+
+    def __init__(self, exact_match_rate: float, dcr: Dict[str, Any], offending: np.ndarray):
+        self.exact_match_rate = exact_match_rate
+        self.dcr = dcr
+        self.offending = offending
+
+    @property
+    def offending_count(self) -> int:
+        return int(self.offending.sum())
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'exact_match_rate': self.exact_match_rate,
+            'dcr': self.dcr,
+            'offending_rows': self.offending_count,
+        }
+
+    def __str__(self) -> str:
+        lines = [f"Exact match rate: {self.exact_match_rate:.4%}"]
+        if self.dcr:
+            lines.append(
+                f"DCR median={self.dcr['median']:.4f} p5={self.dcr['p5']:.4f} "
+                f"threshold={self.dcr['threshold']:.4f} below={self.dcr['below_threshold_rate']:.4%}"
+            )
+        lines.append(f"Offending rows: {self.offending_count}")
+        return "\n".join(lines)
+
+
+def row_hashes(df: pd.DataFrame, columns: List[str]) -> np.ndarray:
+    """uint64 hash per row over ``columns`` (values compared as strings for dtype independence)."""
+    return pd.util.hash_pandas_object(df[columns].astype(str), index=False).to_numpy()
+
+
+def exact_matches(
+    real: pd.DataFrame,
+    synthetic: pd.DataFrame,
+    columns: Optional[List[str]] = None,
+    real_hashes: Optional[np.ndarray] = None
+) -> np.ndarray:
+    """Boolean mask of synthetic rows identical to some real row (``real_hashes`` overrides ``real``'s rows)."""
+    columns = columns or [c for c in real.columns if c in synthetic.columns]
+    if real_hashes is None:
+        real_hashes = row_hashes(real, columns)
+    return np.isin(row_hashes(synthetic, columns), real_hashes)
+
+
+class RecordEncoder:
+    """Encode mixed-type rows into a standardized numeric feature space fitted on the real data."""
+
+    def __init__(self, max_categories: int = 20):
+        self.max_categories = max_categories
+        self.numeric: Dict[str, tuple] = {}
+        self.datetimes: set = set()
+        self.categorical: Dict[str, np.ndarray] = {}
+
+    def fit(self, real: pd.DataFrame) -> "RecordEncoder":
+        for name in real.columns:
+            series = real[name]
+            if pd.api.types.is_bool_dtype(series):
+                self.categorical[name] = np.array(['False', 'True'], dtype=object)
+            elif pd.api.types.is_numeric_dtype(series) or pd.api.types.is_datetime64_any_dtype(series):
+                if pd.api.types.is_datetime64_any_dtype(series):
+                    self.datetimes.add(name)
+                values = self._numeric(series)
+                std = np.nanstd(values)
+                self.numeric[name] = (np.nanmean(values), std if std > 0 else 1.0)
+            else:
+                categories = series.dropna().astype(str).unique()
+                # High-cardinality columns (identifiers, free text) are left to the exact-match check
+                if len(categories) <= self.max_categories:
+                    self.categorical[name] = np.sort(categories)
+        return self
+
+    @staticmethod
+    def _numeric(series: pd.Series) -> np.ndarray:
+        if pd.api.types.is_datetime64_any_dtype(series):
+            stamps = series.to_numpy(dtype='datetime64[ns]')
+            values = stamps.astype(np.int64).astype(np.float64)
+            values[np.isnat(stamps)] = np.nan
+            return values
+        return pd.to_numeric(series, errors='coerce').to_numpy(dtype=np.float64, na_value=np.nan)
+
+    @property
+    def dimensions(self) -> int:
+        return len(self.numeric) + sum(len(c) for c in self.categorical.values())
+
+    def transform(self, df: pd.DataFrame) -> np.ndarray:
+        parts = []
+        for name, (mean, std) in self.numeric.items():
+            series = df[name]
+            if name in self.datetimes:
+                # Synthetic datetimes may come back as formatted strings
+                series = pd.to_datetime(series, errors='coerce')
+            values = self._numeric(series)
+            parts.append(np.nan_to_num((values - mean) / std)[:, None])
+        for name, categories in self.categorical.items():
+            codes = pd.Categorical(df[name].astype(str), categories=categories).codes
+            one_hot = np.zeros((len(df), len(categories)), dtype=np.float64)
+            rows = np.flatnonzero(codes >= 0)
+            # Scale so two different categories are at distance 1, like one std of a numeric column
+            one_hot[rows, codes[rows]] = np.sqrt(0.5)
+            parts.append(one_hot)
+        return np.hstack(parts) if parts else np.zeros((len(df), 0))
+
+
+def distance_to_closest_record(
+    real: pd.DataFrame,
+    synthetic: pd.DataFrame,
+    chunk_size: int = 50_000,
+    baseline_sample: int = 10_000,
+    threshold_percentile: float = 5.0,
+    seed: int = 0
+) -> Dict[str, Any]:
+    """
+    Nearest-real-record distance for every synthetic row.
+
+    Returns:
+        Dict with per-row ``distances`` plus summary statistics and the
+        ``threshold`` (``threshold_percentile`` of real-to-real distances)
+    """
+    encoder = RecordEncoder().fit(real)
+    if encoder.dimensions == 0:
+        return {}
+    real_features = encoder.transform(real)
+    # KD-trees degrade in high dimensions; ball trees hold up better there
+    tree = (KDTree if encoder.dimensions <= 20 else BallTree)(real_features)
+
+    rng = np.random.default_rng(seed)
+    baseline_idx = rng.choice(len(real_features), size=min(baseline_sample, len(real_features)), replace=False)
+    if len(real_features) > 1:
+        baseline, _ = tree.query(real_features[baseline_idx], k=2)
+        threshold = float(np.percentile(baseline[:, 1], threshold_percentile))
+    else:
+        threshold = 0.0
+
+    distances = np.empty(len(synthetic), dtype=np.float64)
+    for start in range(0, len(synthetic), chunk_size):
+        chunk = synthetic.iloc[start:start + chunk_size]
+        dist, _ = tree.query(encoder.transform(chunk), k=1)
+        distances[start:start + len(chunk)] = dist[:, 0]
+
+    return {
+        'distances': distances,
+        'median': float(np.median(distances)) if len(distances) else 0.0,
+        'p5': float(np.percentile(distances, 5)) if len(distances) else 0.0,
+        'threshold': threshold,
+        'below_threshold_rate': float(np.mean(distances < threshold)) if len(distances) else 0.0,
+    }
+
+
+def check_privacy(
+    real: pd.DataFrame,
+    synthetic: pd.DataFrame,
+    dcr: bool = True,
+    dcr_threshold: Optional[float] = None,
+    chunk_size: int = 50_000,
+    real_hashes: Optional[np.ndarray] = None
+) -> PrivacyReport:
+    """
+    Run the exact-match and (optionally) DCR checks.
+
+    A synthetic row is offending if it copies a real row or, when
+    ``dcr_threshold`` is given, lies closer than that to a real record in
+    the encoded feature space. The real-to-real baseline threshold is only
+    reported: by construction a share of genuine records fall below it.
+
+    When ``real`` is only a sample of the real table, pass ``real_hashes``
+    (``row_hashes`` of every real row over ``real``'s columns) so exact
+    copies of unsampled rows are caught too; DCR then uses the sample.
+    """
+    columns = [c for c in real.columns if c in synthetic.columns]
+    offending = exact_matches(real, synthetic, columns, real_hashes)
+    exact_rate = float(offending.mean()) if len(offending) else 0.0
+
+    dcr_stats: Dict[str, Any] = {}
+    if dcr and columns:
+        dcr_stats = distance_to_closest_record(real[columns], synthetic[columns], chunk_size=chunk_size)
+        if dcr_stats:
+            distances = dcr_stats.pop('distances')
+            if dcr_threshold is not None:
+                offending = offending | (distances < dcr_threshold)
+
+    report = PrivacyReport(exact_rate, dcr_stats, offending)
+    logger.info(f"Privacy check: {report.offending_count} offending rows, exact match rate {exact_rate:.4%}")
+    return report
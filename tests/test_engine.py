@@ -0,0 +1,555 @@
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.core.engine import SyntheticDataEngine
+from src.core.schema_inference import SchemaInference
+from src.core.sketches import ColumnSketch, FrequentItemsSketch, HyperLogLog, KLLSketch, RowSample
+
+
+def test_frequent_items_sketch_is_bounded():
+    sketch = FrequentItemsSketch(capacity=10)
+    rng = np.random.default_rng(0)
+    for _ in range(10):
+        sketch.update(pd.Series(['a'] * 500 + ['b'] * 300 + [f"x{i}" for i in rng.integers(0, 100_000, 1_200)]))
+        assert len(sketch.counts) <= 10
+    top = sketch.top(2)
+    assert list(top) == ['a', 'b']
+    # Counts are lower bounds within max_error of the truth
+    assert 5000 - sketch.max_error <= top['a'] <= 5000
+
+
+def test_row_sample_keeps_a_fixed_size_uniform_sample():
+    sample = RowSample(size=1000, seed=1)
+    for start in range(0, 50_000, 5_000):
+        sample.update(pd.DataFrame({'v': np.arange(start, start + 5_000)}))
+    rows = sample.sample()
+    assert len(rows) == 1000
+    assert rows['v'].is_unique
+    assert 20_000 < rows['v'].mean() < 30_000
+
+
+def test_large_file_is_streamed_into_sketches(tmp_path):
+    rng = np.random.default_rng(2)
+    n = 30_000
+    path = tmp_path / "big.csv"
+    pd.DataFrame({
+        'age': rng.integers(18, 90, n),
+        'city': rng.choice(['a', 'b', 'c'], n),
+    }).to_csv(path, index=False)
+
+    engine = SyntheticDataEngine()
+    engine.config.approximate_inference_rows = 10_000
+    engine.config.approximate_sample_rows = 2_000
+    engine.config.chunk_size = 4_000
+    data, schema, hashes = engine._scan_file(str(path))
+
+    assert len(data) == 2_000
+    assert len(hashes) == n
+    assert schema['age']['approximate']
+    assert set(schema['city']['statistics']['top_values']) == {'a', 'b', 'c'}
+
+
+def test_columnar_cache_is_size_bounded(tmp_path):
+    from src.core.file_loader import cached_file_digest, load_file
+
+    cache = tmp_path / "cache"
+    inputs = []
+    for i in range(4):
+        path = tmp_path / f"in{i}.csv"
+        pd.DataFrame({'v': np.arange(i, i + 5_000)}).to_csv(path, index=False)
+        inputs.append(path)
+    load_file(inputs[0], cache_dir=cache)
+    limit = next(cache.glob('*.feather')).stat().st_size * 2
+
+    for path in inputs:
+        assert load_file(path, cache_dir=cache, cache_max_bytes=limit)['v'].iloc[0] == int(path.stem[2:])
+    copies = list(cache.glob('*.feather'))
+    assert 1 <= len(copies) < len(inputs)
+    assert sum(copy.stat().st_size for copy in copies) <= limit
+    assert cache / f"{cached_file_digest(inputs[-1])}.feather" in copies
+
+
+def test_only_output_frames_are_downcast(tmp_path):
+    path = tmp_path / "small.csv"
+    pd.DataFrame({'qty': np.arange(200) % 50, 'price': np.linspace(0.1, 99.9, 200)}).to_csv(path, index=False)
+
+    engine = SyntheticDataEngine()
+    data, schema, _ = engine._scan_file(str(path))
+    assert data['qty'].dtype == np.int64
+    assert data['price'].dtype == np.float64
+
+    # Output keeps full-width dtypes unless downcasting is asked for
+    output = engine.generate_from_file(str(path), num_rows=100)
+    assert output['qty'].dtype == np.int64 and output['price'].dtype == np.float64
+    assert not engine.memory_reports
+
+    engine.config.optimize_dtypes = True
+    output = engine.generate_from_file(str(path), num_rows=100)
+    assert 'input' not in engine.memory_reports
+    assert output['qty'].dtype == np.uint8
+
+
+def test_cross_column_rules_are_applied():
+    import pytest
+    from src.generators.mimesis_generator import MimesisGenerator
+
+    engine = SyntheticDataEngine()
+    engine.register_generator("mimesis", MimesisGenerator())
+    schema = {
+        'price': {'type': 'float', 'mimesis': 'finance.price', 'constraints': {'min': 1, 'max': 10}},
+        'quantity': {'type': 'integer', 'mimesis': 'person.age', 'constraints': {'min': 1, 'max': 5}},
+        '__constraints__': [
+            {'rule': 'formula', 'column': 'total', 'expression': 'price * quantity'},
+            {'rule': 'conditional', 'if': 'quantity >= 3 and `total` > 0', 'then': {'bulk': True},
+             'else': {'bulk': False}},
+        ],
+    }
+    data = engine.preview(schema, 50)
+    assert np.allclose(data['total'], data['price'] * data['quantity'])
+    assert (data['bulk'] == (data['quantity'] >= 3)).all()
+
+    schema['__constraints__'][0]['expression'] = 'price * nope'
+    with pytest.raises(ValueError):
+        engine.preview(schema, 5)
+
+
+def test_untrusted_expressions_are_rejected():
+    import pytest
+    from src.core.cross_constraints import CrossColumnPlan, Expression
+
+    for source in (
+        "__import__('os').system('true')",
+        "price.__class__",
+        "price.apply(print)",
+        "@secret",
+        "(lambda: 1)()",
+        "price[0]",
+        "[price for price in price]",
+    ):
+        with pytest.raises(ValueError):
+            Expression(source)
+    with pytest.raises(ValueError):
+        CrossColumnPlan({'a': {}, '__constraints__': [
+            {'rule': 'formula', 'column': 'b', 'expression': "a.to_csv('/tmp/x')"}
+        ]})
+    # Constant arithmetic is done in NumPy, never as unbounded Python integers
+    assert Expression("9 ** 9 * 9 ** 9").evaluate(pd.DataFrame()) is not None
+
+
+def test_expressions_reject_string_arithmetic_and_large_exponents():
+    import pytest
+    from src.core.cross_constraints import Expression
+
+    for source in ("'a' * 1000000000", "name + 'x'", "10 ** 10 ** 9", "price ** quantity", "2 ** 17", "None - 1"):
+        with pytest.raises(ValueError):
+            Expression(source)
+    data = pd.DataFrame({'name': ['ab', 'cd'], 'code': pd.Series(['x', 'y'], dtype=object),
+                         'price': [1.5, 2.0], 'quantity': [2, 3]})
+    for source in ("name * quantity", "code * 3", "-name + price"):
+        with pytest.raises(ValueError, match="non-numeric column"):
+            Expression(source).evaluate(data)
+    assert Expression("price ** -2 + quantity ** 2").evaluate(data).tolist() == [1 / 2.25 + 4, 0.25 + 9]
+    assert Expression("name == 'ab'").evaluate(data).tolist() == [True, False]
+
+
+def test_privacy_report_describes_the_returned_rows(tmp_path):
+    from src.validators.privacy import exact_matches
+
+    rng = np.random.default_rng(3)
+    path = tmp_path / "real.csv"
+    letters = list('abcdefghij')
+    real = pd.DataFrame({'x': letters * 3, 'y': rng.choice(letters, 30)})
+    real.to_csv(path, index=False)
+
+    engine = SyntheticDataEngine()
+    assert not engine.config.privacy_check and not engine.config.compute_fidelity
+    output = engine.generate_from_file(str(path), num_rows=200)
+    assert engine.last_privacy is None and engine.last_fidelity is None
+
+    engine.config.privacy_max_rounds = 2
+    output = engine.generate_from_file(str(path), num_rows=200, privacy_reject=True)
+    expected = exact_matches(real, output.astype(str))
+    assert expected.mean() < 0.2
+    assert engine.last_privacy.exact_match_rate == expected.mean()
+    assert engine.last_privacy.offending_count == expected.sum()
+
+
+def test_regenerated_rows_keep_primary_keys_unique(tmp_path):
+    rng = np.random.default_rng(4)
+    path = tmp_path / "orders.csv"
+    pd.DataFrame({'order_id': np.arange(1000, 1100), 'x': rng.choice(list('ab'), 100),
+                  'y': rng.choice(list('ab'), 100)}).to_csv(path, index=False)
+
+    engine = SyntheticDataEngine()
+    engine.config.privacy_max_rounds = 3
+    output = engine.generate_from_file(str(path), num_rows=400, privacy_check=True, privacy_reject=True, seed=1)
+    assert len(output) == 400 and output['order_id'].is_unique
+
+
+def _seeded_schema():
+    return {
+        'name': {'type': 'string', 'mimesis': 'person.full_name'},
+        'dept': {'type': 'string', 'provider': 'custom.department'},
+        'age': {'type': 'integer', 'mimesis': 'person.age', 'constraints': {'min': 20, 'max': 30}},
+        'code': {'type': 'pattern', 'pattern': r"[A-Z]{2}-\d{4}"},
+    }
+
+
+def test_seeded_runs_are_reproducible_and_independent():
+    import threading
+    from src.generators.mimesis_generator import MimesisGenerator
+
+    engine = SyntheticDataEngine()
+    engine.register_generator("mimesis", MimesisGenerator())
+    schema = _seeded_schema()
+
+    def run(seed, out=None):
+        data = pd.concat(engine.generate_chunks(schema, 300, chunk_size=100, validate=False, seed=seed))
+        if out is not None:
+            out[seed] = data
+        return data
+
+    first = run(7)
+    assert first.equals(run(7))
+    assert not first.equals(run(8))
+    # Concurrent seeded runs neither block nor disturb each other
+    results = {}
+    threads = [threading.Thread(target=run, args=(seed, results)) for seed in (7, 8, 9)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=60)
+    assert first.equals(results[7]) and run(9).equals(results[9])
+
+
+def test_abandoned_chunk_iterators_hold_nothing(tmp_path):
+    import threading
+    from src.core.pipeline import Pipeline
+    from src.generators.mimesis_generator import MimesisGenerator
+
+    engine = SyntheticDataEngine()
+    engine.register_generator("mimesis", MimesisGenerator())
+    schema = _seeded_schema()
+
+    abandoned = engine.generate_chunks(schema, 1_000, chunk_size=10, validate=False, seed=1)
+    next(abandoned)
+    done = threading.Event()
+    worker = threading.Thread(target=lambda: (engine.preview(schema, 5, seed=2), done.set()))
+    worker.start()
+    worker.join(timeout=30)
+    assert done.is_set()
+
+    # The pipeline closes its source when the consumer stops early
+    closed = []
+
+    def source():
+        try:
+            yield from engine.generate_chunks(schema, 1_000, chunk_size=10, validate=False, seed=3)
+        finally:
+            closed.append(True)
+
+    chunks = source()
+    first = Pipeline(queue_size=1).run(chunks, lambda stream: next(stream))
+    assert len(first) == 10 and closed == [True]
+
+
+def test_sketches_estimate_distincts_and_quantiles():
+    rng = np.random.default_rng(10)
+    values = rng.normal(50, 10, 200_000)
+
+    distinct = HyperLogLog.from_error(0.01)
+    quantiles = KLLSketch.from_error(0.01)
+    for start in range(0, len(values), 20_000):
+        chunk = pd.Series(values[start:start + 20_000])
+        distinct.update(chunk)
+        quantiles.update(chunk)
+
+    assert abs(distinct.estimate() - len(values)) / len(values) < 0.03
+    for q, estimate in zip((0.1, 0.5, 0.9), quantiles.quantiles([0.1, 0.5, 0.9])):
+        assert abs(np.mean(values <= estimate) - q) < 0.02
+    assert sum(len(items) for items in quantiles.compactors) < 5_000
+
+
+def test_merged_column_sketches_match_a_single_pass():
+    rng = np.random.default_rng(11)
+    series = pd.Series(rng.integers(0, 1_000, 50_000).astype(float))
+    series[::100] = np.nan
+
+    whole = ColumnSketch(numeric=True)
+    whole.update(series)
+    left, right = ColumnSketch(numeric=True), ColumnSketch(numeric=True)
+    left.update(series[:20_000])
+    right.update(series[20_000:])
+    merged = left.merge(right).statistics()
+
+    expected = whole.statistics()
+    assert merged['count'] == expected['count'] == series.count()
+    assert merged['null_count'] == 500
+    assert np.isclose(merged['mean'], series.mean()) and np.isclose(merged['std'], series.std())
+    assert (merged['min'], merged['max']) == (series.min(), series.max())
+
+
+def test_approximate_inference_is_close_to_exact():
+    rng = np.random.default_rng(12)
+    data = pd.DataFrame({
+        'amount': rng.exponential(100, 100_000),
+        'city': rng.choice(['a', 'b', 'c', 'd'], 100_000, p=[0.4, 0.3, 0.2, 0.1]),
+    })
+    inference = SchemaInference()
+    exact = inference.infer_from_data(data)
+    approximate = inference.infer_from_data(data, approximate=True, chunk_size=10_000)
+
+    assert approximate['amount']['approximate'] and 'approximate' not in exact['amount']
+    stats, truth = approximate['amount']['statistics'], exact['amount']['statistics']
+    assert np.isclose(stats['mean'], truth['mean']) and stats['max'] == truth['max']
+    assert abs(stats['median'] - truth['median']) / truth['median'] < 0.05
+    assert approximate['city']['statistics']['top_values'] == data['city'].value_counts().to_dict()
+
+
+def test_all_input_formats_load_with_projection(tmp_path):
+    from src.core.file_loader import file_suffix, load_file
+
+    data = pd.DataFrame({'id': np.arange(100), 'name': [f"n{i}" for i in range(100)], 'score': np.linspace(0, 1, 100)})
+    paths = [tmp_path / "in.csv", tmp_path / "in.csv.gz", tmp_path / "in.json",
+             tmp_path / "in.parquet", tmp_path / "in.feather"]
+    data.to_csv(paths[0], index=False)
+    data.to_csv(paths[1], index=False, compression='gzip')
+    data.to_json(paths[2])
+    data.to_parquet(paths[3])
+    data.to_feather(paths[4])
+
+    assert file_suffix(paths[1]) == '.csv.gz'
+    for path in paths:
+        loaded = load_file(path, columns=['id', 'score'])
+        assert list(loaded.columns) == ['id', 'score']
+        assert np.allclose(loaded['score'], data['score']) and (loaded['id'] == data['id']).all()
+    with pytest.raises(ValueError):
+        load_file(tmp_path / "in.txt")
+
+
+def test_text_inputs_are_cached_as_feather_by_content(tmp_path):
+    from src.core.file_loader import load_file
+
+    cache = tmp_path / "cache"
+    data = pd.DataFrame({'v': np.arange(50), 'label': ['x', None] * 25})
+    data.to_csv(tmp_path / "a.csv", index=False)
+    data.to_csv(tmp_path / "b.csv", index=False)
+
+    first = load_file(tmp_path / "a.csv", cache_dir=cache)
+    copies = list(cache.glob('*.feather'))
+    assert len(copies) == 1
+    # Same content under another name is served from the same copy
+    second = load_file(tmp_path / "b.csv", cache_dir=cache)
+    assert list(cache.glob('*.feather')) == copies
+    assert first.equals(second) and first['label'].isna().sum() == 25
+
+
+def test_cache_keeps_csv_types_and_refuses_mixed_columns(tmp_path):
+    from src.core.file_loader import iter_file_chunks, load_file
+
+    cache = tmp_path / "cache"
+    n = 200_000
+    data = pd.DataFrame({'id': np.arange(n), 'when': ['2024-01-02'] * n,
+                         'label': ['x', None, 'y', 'z'] * (n // 4), 'ratio': np.where(np.arange(n) % 5, 0.5, np.nan)})
+    data.to_csv(tmp_path / "big.csv.gz", index=False)
+    plain = load_file(tmp_path / "big.csv.gz")
+    cached = load_file(tmp_path / "big.csv.gz", cache_dir=cache)
+    assert len(list(cache.glob('*.feather'))) == 1
+    assert (cached.dtypes == plain.dtypes).all() and cached['when'][0] == '2024-01-02'
+    assert cached['label'].isna().sum() == n // 4 and cached['ratio'].isna().sum() == n // 5
+    assert sum(len(chunk) for chunk in iter_file_chunks(tmp_path / "big.csv.gz", 30_000, cache_dir=cache)) == n
+
+    # A value that changes the column's type past the first block is not rewritten as text
+    pd.DataFrame({'v': [str(i) for i in range(n)] + ['oops']}).to_csv(tmp_path / "late.csv", index=False)
+    pd.DataFrame({'m': [1, 'a', None]}).to_json(tmp_path / "mixed.json")
+    for name in ("late.csv", "mixed.json"):
+        assert load_file(tmp_path / name, cache_dir=cache).equals(load_file(tmp_path / name))
+    assert len(list(cache.iterdir())) == 1
+    assert load_file(tmp_path / "mixed.json", cache_dir=cache)['m'].tolist() == [1, 'a', None]
+
+
+def test_dtypes_are_narrowed_without_changing_values():
+    from src.core.data_types import DataTypeManager
+
+    n = 10_000
+    data = pd.DataFrame({
+        'qty': np.arange(n) % 200,
+        'delta': np.arange(n) % 300 - 150,
+        'ratio': np.arange(n, dtype=np.float64) / 4,
+        'price': np.linspace(0.1, 99.9, n),
+        'big': np.linspace(1e300, 2e300, n),
+        'city': np.where(np.arange(n) % 2, 'north', 'south').astype(object),
+    })
+    optimized, report = DataTypeManager().optimize_dtypes(data)
+
+    assert optimized['qty'].dtype == np.uint8 and optimized['delta'].dtype == np.int16
+    assert optimized['ratio'].dtype == optimized['price'].dtype == np.float32
+    assert optimized['big'].dtype == np.float64
+    assert isinstance(optimized['city'].dtype, pd.CategoricalDtype)
+    for column in ('qty', 'delta', 'ratio', 'city'):
+        assert (optimized[column].astype(data[column].dtype) == data[column]).all()
+    assert np.allclose(optimized['price'], data['price'], rtol=1e-6, atol=0)
+    assert report.saved_bytes > 0 and report.after_bytes == optimized.memory_usage(index=False, deep=True).sum()
+    assert report.columns['big']['saved_bytes'] == 0
+
+
+def test_cross_column_plan_orders_and_resolves_rules():
+    from src.core.cross_constraints import CrossColumnPlan
+    from src.validators.data_validator import DataValidator
+
+    schema = {
+        'order_date': {'type': 'string'},
+        'ship_date': {'type': 'string'},
+        'price': {'type': 'float'},
+        'quantity': {'type': 'integer'},
+        'status': {'type': 'string'},
+        '__constraints__': [
+            {'rule': 'compare', 'left': 'ship_date', 'op': '>=', 'right': 'order_date'},
+            {'rule': 'formula', 'column': 'total', 'expression': 'price * quantity'},
+            {'rule': 'conditional', 'if': "status == 'Cancelled'", 'then': {'ship_date': None}},
+        ],
+    }
+    plan = CrossColumnPlan(schema)
+    levels = plan.levels()
+    assert levels[0] == ['order_date', 'price', 'quantity', 'status']
+    assert levels.index(['ship_date', 'total']) == 1
+
+    data = pd.DataFrame({
+        'order_date': ['2024-01-10', '2024-01-10', '2024-02-01'],
+        'ship_date': ['2024-01-05', '2024-01-12', '2024-01-01'],
+        'price': [2.0, 3.0, 4.0],
+        'quantity': [1, 2, 3],
+        'status': ['Open', 'Open', 'Cancelled'],
+        'total': [0.0, 0.0, 0.0],
+    })
+    assert not DataValidator().validate_data(data, schema).is_valid
+    for level in levels:
+        plan.apply(data, level)
+    assert data['ship_date'].tolist() == ['2024-01-15', '2024-01-12', None]
+    assert data['total'].tolist() == [2.0, 6.0, 12.0]
+    assert DataValidator().validate_data(data, schema).is_valid
+
+    with pytest.raises(ValueError):
+        CrossColumnPlan({'a': {}, '__constraints__': [
+            {'rule': 'formula', 'column': 'a', 'expression': 'b + 1'},
+            {'rule': 'formula', 'column': 'b', 'expression': 'a + 1'},
+        ]}).levels()
+
+
+def test_pipeline_overlaps_stages_and_propagates_failures():
+    from src.core.pipeline import run_pipeline
+
+    chunks = (pd.DataFrame({'x': range(i * 10, (i + 1) * 10)}) for i in range(8))
+    total, stats = run_pipeline(chunks, lambda stream: sum(int(chunk['x'].sum()) for chunk in stream), queue_size=2)
+    assert total == sum(range(80))
+    assert stats.chunks == 8 and stats.rows == 80 and stats.max_queue_depth <= 2
+    assert stats.to_dict()['bottleneck'] in ('export', 'generation')
+
+    def failing():
+        yield pd.DataFrame({'x': [1]})
+        raise RuntimeError("generation failed")
+
+    with pytest.raises(RuntimeError, match="generation failed"):
+        run_pipeline(failing(), lambda stream: [len(chunk) for chunk in stream])
+
+
+def test_lru_cache_evicts_least_recently_used_and_counts_hits():
+    from src.utils.cache import LRUCache
+
+    cache = LRUCache(2)
+    cache.put('a', 1)
+    cache.put('b', 2)
+    assert cache.get('a') == 1
+    cache.put('c', 3)
+    assert cache.get('b') is None and cache.get('c') == 3
+    assert cache.get_or_create('a', lambda: 99) == 1
+    assert cache.stats() == {'size': 2, 'max_size': 2, 'hits': 3, 'misses': 1}
+
+
+def test_forks_share_generators_and_fitted_models():
+    from src.core.shared_engine import SharedEngine
+
+    shared = SharedEngine()
+    first, second = shared.engine(), shared.engine()
+    assert first is not second and first.generators['file'] is second.generators['file']
+    first.last_fidelity = 'report'
+    assert second.last_fidelity is None
+
+    series = pd.Series(np.random.default_rng(0).normal(50, 5, 500))
+    for engine in (first, second):
+        assert len(engine.generators['file'].generate({}, 100, original_series=series)) == 100
+    assert shared.cache_stats()['fitted_models']['hits'] == 1
+
+
+def test_seeded_results_are_reproducible_and_cached_by_alias(tmp_path):
+    from src.core.content_store import ContentStore
+    from src.core.engine import SyntheticDataEngine
+    from src.generators.mimesis_generator import MimesisGenerator
+
+    engine = SyntheticDataEngine()
+    engine.register_generator("mimesis", MimesisGenerator())
+    schema = {'qty': {'type': 'integer', 'constraints': {'min': 1, 'max': 1000}},
+              'price': {'type': 'float', 'constraints': {'min': 0, 'max': 10}}}
+
+    def run(seed):
+        return pd.concat(engine.generate_chunks(schema, 500, chunk_size=200, validate=False, seed=seed))
+
+    first = run(11)
+    assert first.equals(run(11)) and not first.equals(run(12))
+
+    store = ContentStore(tmp_path, ttl_seconds=None)
+    key = store.put_stream(io.BytesIO(first.to_csv(index=False).encode()), '.csv')
+    store.set_alias('request-fingerprint', key)
+    assert store.resolve('request-fingerprint') == key
+    store.path(key).unlink()
+    assert store.resolve('request-fingerprint') is None
+
+
+def test_previews_are_small_stable_and_fitted_on_a_sample(tmp_path):
+    from src.core.engine import SyntheticDataEngine
+    from src.generators.mimesis_generator import MimesisGenerator
+
+    engine = SyntheticDataEngine()
+    engine.register_generator("mimesis", MimesisGenerator())
+    schema = {'age': {'type': 'integer', 'mimesis': 'person.age', 'constraints': {'min': 20, 'max': 30}}}
+    rows = engine.preview(schema, 5, seed=3)
+    assert len(rows) == 5 and rows.equals(engine.preview(schema, 5, seed=3))
+    assert rows['age'].between(20, 30).all()
+
+    source = tmp_path / "source.csv"
+    rng = np.random.default_rng(0)
+    pd.DataFrame({'amount': rng.normal(100, 10, 5_000), 'city': rng.choice(['a', 'b'], 5_000)}).to_csv(source, index=False)
+    preview = engine.preview_from_file(str(source), 8, sample_rows=500, seed=1)
+    assert len(preview) == 8 and list(preview.columns) == ['amount', 'city']
+    assert preview.equals(engine.preview_from_file(str(source), 8, sample_rows=500, seed=1))
+    assert engine.last_fidelity is None and engine.last_privacy is None
+
+
+def test_previews_read_only_the_head_and_meet_the_latency_target(tmp_path):
+    import time
+    from src.generators.mimesis_generator import MimesisGenerator
+
+    engine = SyntheticDataEngine()
+    engine.register_generator("mimesis", MimesisGenerator())
+    # Rows past the head are malformed, so reading the whole file would fail
+    source = tmp_path / "wide.csv"
+    head = pd.DataFrame({'amount': np.arange(2_000) % 97, 'city': ['a', 'b'] * 1_000}).to_csv(index=False)
+    source.write_text(head + "1,a,extra\n" * 10)
+    preview = engine.preview_from_file(str(source), 20, sample_rows=1_000, seed=1)
+    assert len(preview) == 20 and preview['amount'].between(0, 96).all()
+
+    schema = {'name': {'type': 'string', 'mimesis': 'person.full_name'},
+              'email': {'type': 'string', 'mimesis': 'person.email'},
+              'city': {'type': 'string', 'mimesis': 'address.city'},
+              'age': {'type': 'integer', 'mimesis': 'person.age', 'constraints': {'min': 18, 'max': 90}}}
+    assert engine.preview(schema, 100, seed=4).equals(engine.preview(schema, 100, seed=4))
+    timings = []
+    for seed in range(100):
+        started = time.perf_counter()
+        engine.preview(schema, 100, seed=seed)
+        timings.append(time.perf_counter() - started)
+    # Target: p99 under 200 ms for a 100-row schema preview
+    assert sorted(timings)[98] < 0.2
@@ -0,0 +1,238 @@
+import gzip
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.exporters.partitioned import MANIFEST_NAME, PartitionedExporter
+
+
+def _chunks(n_chunks, rows):
+    for i in range(n_chunks):
+        yield pd.DataFrame({
+            'store': np.arange(rows) % 3,
+            'value': np.arange(i * rows, (i + 1) * rows),
+            'note': pd.Series(['x' * 200] * rows, dtype=object),
+        })
+
+
+def test_partitions_roll_over_and_are_listed_in_the_manifest(tmp_path):
+    exporter = PartitionedExporter('csv', partition_by='store', max_rows_per_file=250, max_open_files=2)
+    manifest = exporter.export(_chunks(4, 300), tmp_path)
+
+    assert manifest == json.loads((tmp_path / MANIFEST_NAME).read_text())
+    assert manifest['total_rows'] == 1_200
+    assert {entry['partition']['store'] for entry in manifest['files']} == {'0', '1', '2'}
+    for entry in manifest['files']:
+        frame = pd.read_csv(tmp_path / entry['path'])
+        assert len(frame) == entry['rows'] <= 250
+        assert 'store' not in frame
+    per_store = pd.Series({e['path']: e['rows'] for e in manifest['files']})
+    assert per_store.groupby(lambda path: path.split('/')[0]).sum().tolist() == [400, 400, 400]
+
+    # Byte targets count string payloads, not just object pointers
+    sized = PartitionedExporter('csv', target_file_bytes=60_000).export(_chunks(2, 300), tmp_path / "sized")
+    assert len(sized['files']) >= 3
+
+
+def test_failed_export_stops_writers_and_removes_partial_files(tmp_path):
+    def failing():
+        yield from _chunks(2, 300)
+        raise RuntimeError("source failed")
+
+    exporter = PartitionedExporter('csv', partition_by='store', max_rows_per_file=100, max_open_files=2)
+    with pytest.raises(RuntimeError, match="source failed"):
+        exporter.export(failing(), tmp_path)
+    assert not list(tmp_path.rglob('*.csv'))
+    assert not (tmp_path / MANIFEST_NAME).exists()
+
+
+def test_empty_parquet_export_keeps_the_schema(tmp_path):
+    from src.exporters.parquet_exporter import ParquetExporter
+
+    empty = pd.DataFrame({'a': pd.Series([], dtype='int64'), 'b': pd.Series([], dtype=object)})
+    assert ParquetExporter().export(empty, tmp_path / "empty.parquet") == 0
+    assert list(pd.read_parquet(tmp_path / "empty.parquet").columns) == ['a', 'b']
+    assert ParquetExporter().export(iter([]), tmp_path / "none.parquet") == 0
+    assert pd.read_parquet(tmp_path / "none.parquet").empty
+
+
+def test_copy_quotes_identifiers():
+    from sqlalchemy import Column, MetaData, Table, Text
+    from sqlalchemy.dialects import postgresql
+
+    from src.exporters.database_exporter import DatabaseExporter
+
+    class Cursor:
+        def copy_expert(self, sql, buffer):
+            self.sql = sql
+
+        def close(self):
+            pass
+
+    cursor = Cursor()
+    raw = type('Raw', (), {'cursor': lambda self: cursor})()
+    table = Table('my"table', MetaData(), Column('a") FROM x; --', Text))
+    DatabaseExporter._copy_postgres(raw, postgresql.dialect(), table, pd.DataFrame({'a") FROM x; --': ['v']}))
+    assert cursor.sql.startswith('COPY "my""table" ("a"") FROM x; --") FROM STDIN')
+
+
+def _frames(n_chunks=4, rows=250):
+    for i in range(n_chunks):
+        yield pd.DataFrame({'id': np.arange(i * rows, (i + 1) * rows), 'name': [f"n{j}" for j in range(rows)]})
+
+
+def test_csv_export_streams_chunks_with_one_header(tmp_path):
+    from src.exporters.csv_exporter import CSVExporter
+
+    for name in ("out.csv", "out.csv.gz"):
+        assert CSVExporter().export(_frames(), tmp_path / name) == 1_000
+        written = pd.read_csv(tmp_path / name)
+        assert written['id'].tolist() == list(range(1_000))
+    assert (tmp_path / "out.csv.gz").read_bytes()[:2] == b"\x1f\x8b"
+
+    def mismatched():
+        yield from _frames(1)
+        yield pd.DataFrame({'other': [1]})
+
+    with pytest.raises(ValueError):
+        CSVExporter().export(mismatched(), tmp_path / "bad.csv")
+    assert not (tmp_path / "bad.csv").exists() and not (tmp_path / "bad.csv.part").exists()
+
+
+def test_parquet_export_writes_row_groups_dictionaries_and_statistics(tmp_path):
+    import pyarrow.parquet as pq
+
+    from src.exporters.parquet_exporter import ParquetExporter
+
+    def chunks():
+        for i in range(3):
+            yield pd.DataFrame({'id': np.arange(i * 1_000, (i + 1) * 1_000),
+                                'city': pd.Series(['north', 'south'] * 500, dtype=object)})
+
+    path = tmp_path / "out.parquet"
+    assert ParquetExporter(row_group_size=500).export(chunks(), path) == 3_000
+    metadata = pq.ParquetFile(path).metadata
+    assert metadata.num_row_groups == 6
+    first = metadata.row_group(0)
+    assert (first.column(0).statistics.min, first.column(0).statistics.max) == (0, 499)
+    assert 'RLE_DICTIONARY' in first.column(1).encodings or 'PLAIN_DICTIONARY' in first.column(1).encodings
+    assert pd.read_parquet(path)['id'].tolist() == list(range(3_000))
+
+
+def test_json_export_streams_lines_and_arrays(tmp_path):
+    from src.exporters.json_exporter import JSONExporter
+
+    def chunks():
+        for i in range(3):
+            yield pd.DataFrame({'id': np.arange(i * 10, (i + 1) * 10), 'name': ['é"\n'] * 10})
+
+    assert JSONExporter().export(chunks(), tmp_path / "out.jsonl") == 30
+    lines = (tmp_path / "out.jsonl").read_text(encoding='utf-8').splitlines()
+    assert len(lines) == 30 and json.loads(lines[-1]) == {'id': 29, 'name': 'é"\n'}
+
+    for compact in (False, True):
+        JSONExporter(compact=compact).export(chunks(), tmp_path / "out.json")
+        records = json.loads((tmp_path / "out.json").read_text(encoding='utf-8'))
+        assert [record['id'] for record in records] == list(range(30))
+    JSONExporter().export(pd.DataFrame({'id': []}), tmp_path / "empty.json")
+    assert json.loads((tmp_path / "empty.json").read_text()) == []
+
+
+def test_excel_export_rolls_over_to_new_sheets(tmp_path):
+    from src.exporters.excel_exporter import ExcelExporter
+
+    def chunks():
+        for i in range(3):
+            yield pd.DataFrame({'id': np.arange(i * 4, (i + 1) * 4),
+                                'when': pd.date_range('2024-01-01', periods=4) + pd.Timedelta(days=4 * i),
+                                'name': ['a', None, 'c', 'd']})
+
+    path = tmp_path / "out.xlsx"
+    assert ExcelExporter(sheet_name='data', max_rows_per_sheet=6).export(chunks(), path) == 12
+    sheets = pd.read_excel(path, sheet_name=None)
+    assert list(sheets) == ['data', 'data_2', 'data_3']
+    combined = pd.concat(sheets.values(), ignore_index=True)
+    assert combined['id'].tolist() == list(range(12))
+    assert pd.api.types.is_datetime64_any_dtype(combined['when']) and combined['name'].isna().sum() == 3
+
+
+def test_database_export_loads_chunks_in_batches(tmp_path):
+    from sqlalchemy import inspect
+
+    from src.exporters.database_exporter import DatabaseExporter
+
+    url = f"sqlite:///{tmp_path / 'out.db'}"
+    schema = {'id': {'type': 'integer'}, 'price': {'type': 'float'}, 'when': {'type': 'datetime'}}
+
+    def chunks():
+        for i in range(5):
+            yield pd.DataFrame({'id': np.arange(i * 100, (i + 1) * 100), 'price': np.linspace(1, 2, 100),
+                                'when': pd.Timestamp('2024-01-01') + pd.to_timedelta(np.arange(100), unit='h')})
+
+    exporter = DatabaseExporter(url, schema=schema, batch_size=30, transaction_rows=120)
+    assert exporter.export(chunks(), 'orders') == 500 and exporter.last_stats['rows'] == 500
+    types = {column['name']: str(column['type']) for column in inspect(exporter.engine).get_columns('orders')}
+    assert types == {'id': 'BIGINT', 'price': 'FLOAT', 'when': 'DATETIME'}
+    loaded = pd.read_sql_table('orders', exporter.engine)
+    assert loaded['id'].tolist() == list(range(500)) and loaded['when'].iloc[-1] == pd.Timestamp('2024-01-05 03:00')
+
+    with pytest.raises(ValueError):
+        DatabaseExporter(url).export(pd.DataFrame({'id': [1]}), 'orders')
+    assert DatabaseExporter(url, if_exists='replace').export(pd.DataFrame({'id': [1]}), 'orders') == 1
+    assert len(pd.read_sql_table('orders', exporter.engine)) == 1
+
+
+def test_partitioned_export_writes_hive_folders_and_a_manifest(tmp_path):
+    from src.exporters.partitioned import MANIFEST_NAME, PartitionedExporter
+
+    def chunks():
+        for i in range(4):
+            yield pd.DataFrame({'store': [1, 2, 3] * 10, 'amount': range(i * 30, (i + 1) * 30),
+                                'day': pd.Timestamp('2024-01-31 08:00')})
+
+    exporter = PartitionedExporter('csv', partition_by=['store', 'day'], max_rows_per_file=25, max_open_files=3)
+    manifest = exporter.export(chunks(), tmp_path)
+
+    assert manifest['total_rows'] == 120
+    assert json.loads((tmp_path / MANIFEST_NAME).read_text()) == manifest
+    assert {entry['partition']['store'] for entry in manifest['files']} == {'1', '2', '3'}
+    assert all(entry['partition']['day'] == '2024-01-31' and entry['rows'] <= 25 for entry in manifest['files'])
+    first = tmp_path / 'store=1' / 'day=2024-01-31' / 'part-00000.csv'
+    assert first.exists() and list(pd.read_csv(first).columns) == ['amount']
+    store_2 = [entry for entry in manifest['files'] if entry['partition']['store'] == '2']
+    assert sum(entry['rows'] for entry in store_2) == 40 and len(store_2) == 2
+
+
+def test_streamed_encodings_match_exported_files(tmp_path):
+    from src.exporters.csv_exporter import CSVExporter
+    from src.exporters.json_exporter import JSONExporter
+    from src.exporters.streaming import gzip_chunks
+
+    chunks = [pd.DataFrame({'id': range(i * 3, (i + 1) * 3), 'name': list('abc')}) for i in range(3)]
+    CSVExporter(background=False).export(chunks, tmp_path / 'out.csv')
+    streamed = b''.join(CSVExporter().encode(chunks))
+    assert streamed == (tmp_path / 'out.csv').read_bytes()
+    assert gzip.decompress(b''.join(gzip_chunks(CSVExporter().encode(chunks)))) == streamed
+
+    records = json.loads(b''.join(JSONExporter().encode(chunks, lines=False)))
+    assert [record['id'] for record in records] == list(range(9))
+    assert b''.join(JSONExporter().encode(chunks)).count(b'\n') == 9
+
+
+def test_pipeline_iterate_stops_the_producer_when_closed():
+    from src.core.pipeline import Pipeline
+
+    produced = []
+
+    def chunks():
+        for i in range(1000):
+            produced.append(i)
+            yield pd.DataFrame({'x': [i]})
+
+    pipeline = Pipeline(queue_size=2)
+    stream = pipeline.iterate(chunks())
+    assert next(stream)['x'].iloc[0] == 0
+    stream.close()
+    assert len(produced) < 10 and pipeline.stats.chunks == 1
@@ -0,0 +1,231 @@
+import re
+
+import numpy as np
+import pandas as pd
+
+from src.generators.constraints import truncated_sample
+from src.generators.file_generator import FileGenerator
+
+
+def test_mixture_draws_are_fresh_and_unbiased():
+    rng = np.random.default_rng(0)
+    series = pd.Series(np.concatenate([rng.normal(0, 1, 2_000), rng.normal(100, 1, 2_000)]))
+    generator = FileGenerator()
+
+    first = np.asarray(generator.generate({}, 4_000, original_series=series))
+    second = np.asarray(generator.generate({}, 4_000, original_series=series))
+
+    assert not np.array_equal(first, second)
+    assert first.min() >= series.min() and first.max() <= series.max()
+    # Both modes keep their weight
+    assert 0.45 < np.mean(first > 50) < 0.55
+
+
+def test_boolean_columns_are_sampled_as_categories():
+    flags = pd.Series(np.arange(1_000) % 10 < 7)
+    values = FileGenerator().generate({}, 20_000, original_series=flags, rng=np.random.default_rng(0))
+    assert set(values) == {True, False}
+    assert abs(np.mean(values) - 0.7) < 0.02
+
+
+def test_truncated_sample_replacements_come_from_the_whole_batch():
+    calls = []
+
+    # First batch is entirely out of range; later batches are grouped, low values first
+    def sampler(k):
+        calls.append(k)
+        if len(calls) == 1:
+            return np.full(k, -5.0)
+        return np.concatenate([np.full(k // 2, 1.0), np.full(k - k // 2, 9.0)])
+
+    values = truncated_sample(sampler, 1_000, 0, 10)
+    assert values.min() >= 0
+    assert 0.4 < np.mean(values == 9.0) < 0.6
+
+
+def test_pseudonyms_are_unique_and_never_narrowed():
+    from src.generators.pseudonymizer import Pseudonymizer, PseudonymGenerator
+
+    keys = pd.Series(np.arange(256), dtype=np.uint8)
+    mapped = Pseudonymizer("k").pseudonymize(keys)
+    assert mapped.dtype == np.int64 and mapped.is_unique
+    assert not mapped.equals(keys.astype(np.int64))
+
+    values = PseudonymGenerator("k").generate({'identifier': 'primary'}, 1_000, original_series=keys)
+    assert len(set(values)) == 1_000
+
+    codes = pd.Series(['AB-1', 'AB-2', '---', '+++', 'ÄÖ-12', 'x' * 40])
+    mapped = Pseudonymizer("k").pseudonymize(codes)
+    assert mapped.is_unique
+    assert not set(mapped) & set(codes)
+    assert mapped.str.len().tolist()[:2] == [4, 4] and mapped[4].startswith('ÄÖ-')
+
+
+def test_pseudonyms_line_up_across_tables(tmp_path):
+    from src.core.engine import SyntheticDataEngine
+
+    rng = np.random.default_rng(4)
+    customers = pd.DataFrame({'customer_id': np.arange(1_000, 1_200),
+                              'code': [f"C-{i:05d}" for i in range(200)],
+                              'age': rng.integers(18, 90, 200)})
+    orders = pd.DataFrame({'order_id': np.arange(5_000),
+                           'customer_id': rng.choice(customers['customer_id'][:50], 5_000),
+                           'customer_key': rng.choice(customers['code'][:50], 5_000),
+                           'qty': rng.integers(1, 5, 5_000)})
+    customers.to_csv(tmp_path / "customers.csv", index=False)
+    orders.to_csv(tmp_path / "orders.csv", index=False)
+
+    engine = SyntheticDataEngine()
+    parents = engine.generate_from_file(str(tmp_path / "customers.csv"), num_rows=200)
+    children = engine.generate_from_file(str(tmp_path / "orders.csv"), num_rows=1_000)
+
+    assert parents['customer_id'].is_unique and children['order_id'].is_unique
+    assert set(children['customer_id']) <= set(parents['customer_id'])
+    # Pseudonyms stay in the 4-digit domain; only chance overlaps with real keys
+    assert parents['customer_id'].between(1_000, 9_999).all()
+    assert parents['customer_id'].isin(customers['customer_id']).mean() < 0.1
+    # Same pseudonym in both tables, without sharing the parent's data
+    assert set(children['customer_key']) <= set(parents['code'])
+
+
+def test_primary_keys_stay_unique_across_chunks_and_regenerated_rows(tmp_path):
+    import pytest
+    from src.core.engine import SyntheticDataEngine
+    from src.generators.pseudonymizer import PseudonymGenerator
+
+    rng = np.random.default_rng(6)
+    path = tmp_path / "orders.csv"
+    pd.DataFrame({'order_id': np.arange(2_000, 2_150), 'x': rng.choice(list('ab'), 150),
+                  'y': rng.choice(list('ab'), 150)}).to_csv(path, index=False)
+    engine = SyntheticDataEngine()
+
+    chunks = list(engine.generate_chunks_from_file(str(path), 1_000, chunk_size=130, seed=2))
+    keys = pd.concat(chunks)['order_id']
+    assert len(keys) == 1_000 and keys.is_unique
+
+    engine.config.privacy_max_rounds = 3
+    output = engine.generate_from_file(str(path), num_rows=600, privacy_check=True, privacy_reject=True, seed=2)
+    assert output['order_id'].is_unique
+
+    generator = PseudonymGenerator("k")
+    source = pd.Series(np.arange(100))
+    # Disjoint position ranges never repeat a key; overlapping ones do
+    parts = [generator.generate({'identifier': 'primary'}, 80, original_series=source, row_offset=start)
+             for start in (0, 80, 160)]
+    assert len(set(sum(parts, []))) == 240
+    overlap = generator.generate({'identifier': 'primary'}, 80, original_series=source, row_offset=40)
+    assert set(overlap) & set(parts[0])
+    with pytest.raises(ValueError):
+        generator.generate({'identifier': 'primary'}, 10, original_series=source, row_offset=-1)
+
+
+def test_patterns_are_learned_only_for_codes():
+    import pytest
+    from src.core.schema_inference import SchemaInference
+    from src.generators.pattern_generator import generate_pattern, parse_pattern
+
+    rng = np.random.default_rng(5)
+    data = pd.DataFrame({
+        'invoice': [f"INV-{i:05d}" for i in rng.choice(90_000, 100, replace=False) + 10_000],
+        'email': [f"user{i}@example.com" for i in range(100)],
+        'username': [f"{name}{i}" for i, name in enumerate(rng.choice(['jsmith', 'adoe', 'mlee'], 100))],
+        'name': [f"{first} {last}" for first, last in zip(rng.choice(list('ABCDEFGHIJ'), 100), range(100))],
+    })
+    schema = SchemaInference().infer_from_data(data)
+    assert schema['invoice']['pattern'] == r"INV\-\d{5}"
+    assert all(schema[column]['type'] != 'pattern' for column in ('email', 'username', 'name'))
+
+    assert all(value.startswith('a.b') for value in generate_pattern(r"a\.b\d", 10))
+    for pattern in (r"\s+", r"\D{3}", r"A\W", r"\bx", r"[\S]"):
+        with pytest.raises(ValueError):
+            parse_pattern(pattern)
+
+
+def test_pattern_width_is_bounded():
+    import pytest
+    from src.generators.pattern_generator import MAX_PATTERN_WIDTH, generate_pattern, learn_pattern, parse_pattern
+
+    for pattern in (r"\d{1000000000}", r"[a-z]{1,100000}", r"\d{200}[A-Z]{57}", r"x+" * 33):
+        with pytest.raises(ValueError, match="longer than 256"):
+            generate_pattern(pattern, 1_000_000)
+    values = generate_pattern(rf"[A-Z]{{{MAX_PATTERN_WIDTH - 1}}}\d?", 10)
+    assert max(map(len, values)) <= MAX_PATTERN_WIDTH
+    assert len(parse_pattern(r"x+" * 32)) == 32
+    # Long codes are left to the other generators instead of learning an unusable pattern
+    assert learn_pattern(pd.Series([f"{i:03d}" * 100 for i in range(50)])) is None
+
+
+def test_constraint_layer_enforces_rules_during_generation():
+    from src.generators.constraints import ConstraintLayer, truncated_normal
+
+    values = truncated_normal(50, 30, 40, 60, 10_000)
+    assert values.min() >= 40 and values.max() <= 60
+    # Truncation keeps the shape inside the range instead of piling values up at the bounds
+    assert np.mean(values == 40) < 0.01 and abs(np.median(values) - 50) < 1
+
+    layer = ConstraintLayer()
+    rng = np.random.default_rng(6)
+    ages = layer.apply(list(rng.integers(0, 100, 1_000)), {'type': 'integer', 'constraints': {'min': 18, 'max': 65}},
+                       regenerate=lambda k: rng.integers(0, 100, k))
+    assert 18 <= min(ages) and max(ages) <= 65
+    assert len(set(ages)) > 40
+
+    cities = layer.apply(['a', 'b', 'x', None] * 25, {'type': 'categorical', 'categories': ['a', 'b']})
+    assert set(cities) == {'a', 'b', None}
+
+    words = ['abc', 'toolong', 'x1', 'xyz'] * 50
+    codes = layer.apply(words, {'type': 'string', 'constraints': {'length': 3, 'regex': '[a-z]{3}'}},
+                        regenerate=lambda k: list(rng.choice(['abc', 'zz9', 'qrs'], k)))
+    assert set(codes) <= {'abc', 'xyz', 'qrs'}
+
+
+def test_pseudonyms_are_keyed_consistent_and_format_preserving():
+    from src.generators.pseudonymizer import Pseudonymizer, PseudonymGenerator
+
+    codes = pd.Series([f"CUST-{i:05d}" for i in range(0, 3_000, 3)])
+    first = Pseudonymizer("secret").pseudonymize(codes)
+    again = Pseudonymizer("secret").pseudonymize(codes.iloc[::-1]).iloc[::-1]
+    other = Pseudonymizer("other").pseudonymize(codes)
+
+    assert first.tolist() == again.tolist() and first.is_unique
+    assert (first != other).mean() > 0.9 and (first != codes).mean() > 0.9
+    assert first.str.fullmatch(r"[A-Z]{4}-\d{5}").all()
+
+    ids = pd.Series(np.arange(1_000, 1_500))
+    values = PseudonymGenerator("secret").generate({}, 1_200, original_series=ids)
+    assert len(values) == 1_200 and len(set(values)) == 1_200
+
+
+def test_key_columns_are_marked_as_identifiers():
+    from src.core.schema_inference import SchemaInference
+
+    rng = np.random.default_rng(9)
+    schema = SchemaInference().infer_from_data(pd.DataFrame({
+        'customer_id': np.arange(500, 1_000),
+        'sku': [f"SKU-{i:04d}" for i in range(500)],
+        'amount': rng.normal(100, 20, 500),
+        'city': rng.choice(['a', 'b'], 500),
+    }))
+    assert schema['customer_id']['identifier'] and schema['sku']['identifier']
+    assert schema['customer_id']['statistical_generator'] == 'pseudonym'
+    assert not schema['amount'].get('identifier') and not schema['city'].get('identifier')
+
+
+def test_patterns_are_generated_and_learned():
+    from src.core.schema_inference import SchemaInference
+    from src.generators.pattern_generator import generate_pattern, learn_pattern
+    from src.validators.data_validator import DataValidator
+
+    for pattern in (r"[A-Z]{3}-\d{6}", r"ORD-202[34]-\d{2,4}x?", r"[a-f0-9]{8}"):
+        values = generate_pattern(pattern, 2_000)
+        assert len(values) == 2_000 and all(re.fullmatch(pattern, value) for value in values)
+        assert len(set(values)) > 1_000
+
+    assert learn_pattern(pd.Series(['AB12', 'XYZ123', 'Q9'])) == r"[A-Z]{1,3}\d{1,3}"
+    rng = np.random.default_rng(5)
+    codes = pd.DataFrame({'ref': [f"REF-{i:05d}" for i in rng.choice(90_000, 200, replace=False) + 10_000]})
+    schema = SchemaInference().infer_from_data(codes)
+    assert schema['ref']['type'] == 'pattern' and schema['ref']['pattern'] == r"REF\-\d{5}"
+
+    result = DataValidator().validate_data(pd.DataFrame({'ref': ['REF-12345', 'REF-1234']}), {'ref': schema['ref']})
+    assert result.errors == [r"Column ref has 1 values not matching pattern 'REF\\-\\d{5}'"]
@@ -0,0 +1,191 @@
+import io
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.core.engine import SyntheticDataEngine
+from src.core.jobs import FAILED, SUCCEEDED, JobManager, JobQueueFull, track_progress
+
+
+def _wait(manager, job_id, timeout=30):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        job = manager.get(job_id)
+        if job['status'] in (SUCCEEDED, FAILED):
+            return job
+        time.sleep(0.02)
+    raise AssertionError(f"job {job_id} did not finish")
+
+
+def _file_handler(engine):
+    def handler(params, job_dir, progress):
+        chunks = engine.generate_chunks_from_file(params['input'], params['rows'], seed=params['seed'])
+        path = job_dir / "out.csv"
+        pd.concat(track_progress(chunks, progress)).to_csv(path, index=False)
+        return path
+    return handler
+
+
+def test_file_jobs_stream_chunks_and_report_progress(tmp_path):
+    source = tmp_path / "source.csv"
+    pd.DataFrame({'order_id': np.arange(300), 'qty': np.arange(300) % 7}).to_csv(source, index=False)
+    engine = SyntheticDataEngine()
+    engine.config.chunk_size = 200
+    seen = []
+
+    def handler(params, job_dir, progress):
+        return _file_handler(engine)(params, job_dir, lambda done: (seen.append(done), progress(done)))
+
+    manager = JobManager(tmp_path / "jobs", {'file': handler}, progress_interval=0)
+    params = {'input': str(source), 'rows': 1_000, 'seed': None}
+    job = _wait(manager, manager.submit('file', params, rows_total=1_000)['id'])
+    output = pd.read_csv(manager.artifact_path(job['id']))
+    manager.shutdown()
+
+    assert job['status'] == SUCCEEDED and job['rows_done'] == 1_000 and job['progress'] == 1.0
+    assert seen == [200, 400, 600, 800, 1_000]
+    # Primary keys stay unique across chunks and passes over the source
+    assert len(output) == 1_000 and output['order_id'].is_unique
+
+
+def test_interrupted_jobs_are_recovered(tmp_path):
+    runs = []
+
+    def handler(params, job_dir, progress):
+        runs.append(params['n'])
+        progress(params['n'])
+        path = job_dir / "out.txt"
+        path.write_text(str(params['n']))
+        return path
+
+    first = JobManager(tmp_path, {'count': handler})
+    job_id = _wait(first, first.submit('count', {'n': 5}, rows_total=5)['id'])['id']
+    # Simulate a crash mid-run: the record is left running with partial progress
+    first._update(job_id, status='running', rows_done=2, finished_at=None)
+    first.shutdown()
+
+    second = JobManager(tmp_path, {'count': handler})
+    job = _wait(second, job_id)
+    artifact = second.artifact_path(job_id).read_text()
+    second.shutdown()
+    assert runs == [5, 5]
+    assert job['status'] == SUCCEEDED and job['rows_done'] == 5
+    assert artifact == '5'
+
+
+def test_store_evicts_least_recently_used_objects_but_never_pinned_ones(tmp_path):
+    import io
+
+    from src.core.content_store import ContentStore
+
+    store = ContentStore(tmp_path, max_bytes=2_500, ttl_seconds=None)
+    keys = [store.put_stream(io.BytesIO(bytes([i]) * 1_000), '.bin') for i in range(2)]
+    with store.pinned(keys[0]) as path:
+        assert path.exists()
+        third = store.put_stream(io.BytesIO(b'c' * 1_000), '.bin')
+        # Over quota: the pinned (older) object survives, the next least recently used goes
+        assert keys[0] in store and keys[1] not in store and third in store
+    store.path(third)
+    store.put_stream(io.BytesIO(b'd' * 1_000), '.bin')
+    assert keys[0] not in store and third in store
+    assert store.total_bytes() <= 2_500
+
+
+def test_deleting_a_job_drops_its_unshared_artifact(tmp_path):
+    from src.core.content_store import ContentStore
+
+    store = ContentStore(tmp_path / "store", ttl_seconds=None)
+
+    def handler(params, job_dir, progress):
+        path = job_dir / "out.txt"
+        path.write_text(params['text'])
+        return path
+
+    manager = JobManager(tmp_path / "jobs", {'write': handler}, store=store)
+    first, second, other = (_wait(manager, manager.submit('write', {'text': text})['id'])
+                            for text in ('same', 'same', 'other'))
+    assert first['artifact'] == second['artifact'] != other['artifact']
+    store.set_alias('cached-request', other['artifact'])
+
+    assert manager.delete(first['id']) and first['artifact'] in store  # still used by the second job
+    assert manager.delete(second['id']) and first['artifact'] not in store
+    assert manager.delete(other['id']) and other['artifact'] in store  # still aliased
+    assert not manager.delete(first['id']) and manager.get(first['id']) is None
+    manager.shutdown()
+
+
+def test_jobs_run_in_the_background_and_report_results(tmp_path):
+    def write(params, job_dir, progress):
+        chunks = (pd.DataFrame({'x': range(100)}) for _ in range(params['chunks']))
+        path = job_dir / "out.csv"
+        pd.concat(track_progress(chunks, progress)).to_csv(path, index=False)
+        return path
+
+    def fail(params, job_dir, progress):
+        raise ValueError("bad input")
+
+    manager = JobManager(tmp_path / "jobs", {'write': write, 'fail': fail}, progress_interval=0)
+    try:
+        job = _wait(manager, manager.submit('write', {'chunks': 3}, rows_total=300)['id'])
+        assert job['status'] == SUCCEEDED and job['rows_done'] == 300 and job['progress'] == 1.0
+        assert len(pd.read_csv(manager.artifact_path(job['id']))) == 300
+
+        failed = _wait(manager, manager.submit('fail', {})['id'])
+        assert failed['status'] == FAILED and failed['error'] == "bad input"
+        assert manager.artifact_path(failed['id']) is None
+        assert manager.delete(job['id']) and manager.get(job['id']) is None
+        with pytest.raises(ValueError):
+            manager.submit('unknown', {})
+    finally:
+        manager.shutdown()
+
+
+def test_job_queue_is_bounded(tmp_path):
+    release = threading.Event()
+
+    def block(params, job_dir, progress):
+        release.wait(10)
+        path = job_dir / "done.txt"
+        path.write_text("done")
+        return path
+
+    manager = JobManager(tmp_path / "jobs", {'block': block}, max_workers=1, max_queued=2)
+    try:
+        first = manager.submit('block', {})['id']
+        manager.submit('block', {})
+        with pytest.raises(JobQueueFull):
+            manager.submit('block', {})
+        release.set()
+        assert _wait(manager, first)['status'] == SUCCEEDED
+    finally:
+        release.set()
+        manager.shutdown()
+
+
+def test_store_deduplicates_content_and_receives_job_artifacts(tmp_path):
+    from src.core.content_store import ContentStore
+
+    store = ContentStore(tmp_path / "store", ttl_seconds=None)
+    key = store.put_stream(io.BytesIO(b"a,b\n1,2\n"), '.CSV')
+    assert key.endswith('.csv') and store.put_stream(io.BytesIO(b"a,b\n1,2\n"), '.csv') == key
+    assert store.stats()['objects'] == 1
+    linked = store.link(key, tmp_path / "job" / "input.csv")
+    assert linked.read_bytes() == b"a,b\n1,2\n"
+
+    def copy_input(params, job_dir, progress):
+        path = job_dir / "out.csv"
+        path.write_bytes(linked.read_bytes())
+        return path
+
+    manager = JobManager(tmp_path / "jobs", {'copy': copy_input}, store=store)
+    try:
+        job = _wait(manager, manager.submit('copy', {})['id'])
+        # Same bytes as the upload, so the artifact is the stored object itself
+        assert job['status'] == SUCCEEDED and job['artifact'] == key
+        assert manager.artifact_path(job['id']) == store.path(key)
+        assert not manager.job_dir(job['id']).exists()
+    finally:
+        manager.shutdown()
@@ -0,0 +1,124 @@
+import numpy as np
+import pandas as pd
+
+from src.validators.data_validator import DataValidator
+
+
+def test_typed_and_object_columns_are_validated():
+    schema = {
+        'age': {'type': 'integer', 'constraints': {'min': 0, 'max': 120}},
+        'score': {'type': 'float'},
+        'grade': {'type': 'string', 'constraints': {'length': 1}},
+        'active': {'type': 'boolean'},
+        'city': {'type': 'categorical', 'categories': ['a', 'b']},
+    }
+    good = pd.DataFrame({
+        'age': np.arange(100) % 90,
+        'score': np.linspace(0, 1, 100),
+        'grade': pd.Series(list('ABCD') * 25, dtype=object),
+        'active': np.arange(100) % 2 == 0,
+        'city': pd.Categorical(['a', 'b'] * 50),
+    })
+    result = DataValidator().validate_data(good, schema)
+    assert result.is_valid, result.errors
+
+    bad = good.assign(
+        age=np.arange(100) + 100,
+        score=pd.Series(['x'] + [0.5] * 99, dtype=object),
+        grade=pd.Series(['AB'] + ['A'] * 99, dtype=object),
+        active=pd.Series([1.5] + [True] * 99, dtype=object),
+        city=pd.Categorical(['a', 'c'] * 50),
+    )
+    errors = DataValidator().validate_data(bad, schema).errors
+    assert len(errors) == 5
+    for column in ('age', 'score', 'grade', 'active', 'city'):
+        assert any(f"Column {column} " in error for error in errors)
+
+
+def test_string_lengths_skip_nulls_and_measure_non_strings_as_text():
+    spec = {'type': 'string', 'constraints': {'length': 2}}
+    validator = DataValidator()
+    strings = pd.Series(['ab', None, 'cde', np.nan, 'é!'] * 1_000, dtype=object)
+    assert validator.count_constraint_violations(strings, spec) == {'length': 1_000}
+    mixed = pd.Series(['ab', 12, 3, None], dtype=object)
+    assert validator.count_constraint_violations(mixed, spec) == {'length': 1}
+    assert validator._validate_constraints(strings.where(strings != 'cde'), spec) == []
+
+
+def _chunks(n_chunks, rows=10_000, bad_every=100):
+    for i in range(n_chunks):
+        values = np.arange(i * rows, (i + 1) * rows) % 1_000
+        values[::bad_every] = -1
+        yield pd.DataFrame({'v': values})
+
+
+def test_streaming_validation_counts_and_samples_violations():
+    schema = {'v': {'type': 'integer', 'constraints': {'min': 0}}}
+    exact = DataValidator().validate_chunks(_chunks(5), schema)
+    assert not exact.is_valid
+    assert exact.statistics['rows_checked'] == 50_000
+    assert exact.statistics['violations']['v']['below_min'] == 500
+
+    sampled = DataValidator().validate_chunks(_chunks(5), schema, sample_fraction=0.2, seed=1)
+    rate = sampled.statistics['violation_rates']['v']['below_min']
+    assert sampled.statistics['rows_seen'] == 50_000 and sampled.statistics['rows_checked'] < 12_000
+    assert rate['rate_lower'] <= 0.01 <= rate['rate_upper']
+
+
+def test_streaming_validation_stops_at_the_first_hard_failure():
+    schema = {'v': {'type': 'string'}, 'w': {'type': 'integer'}}
+    seen = []
+
+    def chunks():
+        for i in range(10):
+            seen.append(i)
+            yield pd.DataFrame({'v': [1, 2], 'w': [1, 2]})
+
+    result = DataValidator().validate_chunks(chunks(), schema)
+    assert seen == [0] and not result.is_valid
+    assert result.errors == ["Column v contains non-string values"]
+
+    result = DataValidator().validate_chunks(chunks(), schema, fail_fast=False)
+    assert seen[-1] == 9 and result.statistics['rows_seen'] == 20
+
+
+def test_fidelity_report_separates_similar_from_different_data():
+    from src.validators.fidelity import compute_fidelity
+
+    rng = np.random.default_rng(7)
+    n = 20_000
+    x = rng.normal(0, 1, n)
+    real = pd.DataFrame({'x': x, 'y': 2 * x + rng.normal(0, 0.1, n), 'city': rng.choice(['a', 'b'], n, p=[0.8, 0.2])})
+    x2 = rng.normal(0, 1, n)
+    similar = pd.DataFrame({'x': x2, 'y': 2 * x2 + rng.normal(0, 0.1, n), 'city': rng.choice(['a', 'b'], n, p=[0.8, 0.2])})
+    different = pd.DataFrame({'x': rng.normal(3, 1, n), 'y': rng.normal(0, 1, n), 'city': rng.choice(['a', 'b', 'c'], n)})
+
+    good = compute_fidelity(real, similar, sample_size=5_000)
+    bad = compute_fidelity(real, different, sample_size=5_000)
+    assert good.sample_size == 5_000
+    assert good.columns['x']['ks'] < 0.05 and bad.columns['x']['ks'] > 0.5
+    assert good.columns['city']['tv_distance'] < 0.03 and bad.columns['city']['chi2_pvalue'] < 1e-6
+    assert good.correlation['mean_abs_delta'] < 0.05 and bad.correlation['mean_abs_delta'] > 0.9
+    assert good.score > 0.9 > 0.6 > bad.score
+    assert set(good.to_dict()) == {'score', 'sample_size', 'columns', 'correlation'}
+
+
+def test_privacy_check_flags_copies_and_near_copies():
+    from src.validators.privacy import check_privacy
+
+    rng = np.random.default_rng(8)
+    real = pd.DataFrame({'age': rng.integers(18, 90, 2_000), 'income': rng.normal(50_000, 15_000, 2_000),
+                         'city': rng.choice(['a', 'b', 'c'], 2_000)})
+    fresh = pd.DataFrame({'age': rng.integers(18, 90, 1_000), 'income': rng.normal(50_000, 15_000, 1_000) + 0.5,
+                          'city': rng.choice(['a', 'b', 'c'], 1_000)})
+    copies = real.iloc[:50].reset_index(drop=True)
+    near = real.iloc[50:100].assign(income=real['income'].iloc[50:100] + 1).reset_index(drop=True)
+    synthetic = pd.concat([fresh, copies, near], ignore_index=True)
+
+    report = check_privacy(real, synthetic)
+    assert report.exact_match_rate == 50 / 1_100
+    assert report.offending[1_000:1_050].all() and report.offending_count == 50
+    assert report.dcr['median'] > 0 and 0 < report.dcr['threshold']
+
+    strict = check_privacy(real, synthetic, dcr_threshold=0.001)
+    assert strict.offending[1_000:].all() and strict.offending_count < 200
@@ -0,0 +1,84 @@
+import io
+import time
+
+import pandas as pd
+
+
+def test_eda_reports_are_profiled_once_per_file(tmp_path, monkeypatch):
+    from src.core.content_store import ContentStore
+    from src.core.jobs import FAILED, SUCCEEDED, JobManager
+    from webapp import app as webapp
+
+    store = ContentStore(tmp_path / "store", ttl_seconds=None)
+    jobs = JobManager(tmp_path / "jobs", webapp.JOBS.handlers)
+    monkeypatch.setattr(webapp, 'STORE', store)
+    monkeypatch.setattr(webapp, 'JOBS', jobs)
+    # A minimal profile keeps the test fast
+    monkeypatch.setattr(webapp.ENGINE.config, 'eda_minimal_cells', 0)
+    client = webapp.app.test_client()
+    csv = pd.DataFrame({'amount': range(50), 'city': ['a', 'b'] * 25}).to_csv(index=False).encode()
+
+    def post():
+        return client.post('/api/eda/report?format=json', data={'file': (io.BytesIO(csv), 'sales.csv')},
+                           content_type='multipart/form-data')
+
+    try:
+        queued = post()
+        assert queued.status_code == 202
+        job_id = queued.get_json()['id']
+        deadline = time.time() + 120
+        while jobs.get(job_id)['status'] not in (SUCCEEDED, FAILED) and time.time() < deadline:
+            time.sleep(0.05)
+        assert jobs.get(job_id)['status'] == SUCCEEDED
+
+        ready = client.get(queued.get_json()['report_url'])
+        assert ready.status_code == 200 and 'minimal profile' in ready.get_data(as_text=True)
+        # The same content again is served from the store without a new job
+        cached = post()
+        assert cached.status_code == 200 and cached.headers['X-Report-Key'] in queued.get_json()['report_url']
+        assert client.get('/api/eda/report/unknown').status_code == 404
+    finally:
+        jobs.shutdown()
+
+
+def test_file_routes_stream_chunks_and_results_are_stored_after_streaming(tmp_path, monkeypatch):
+    from src.core.content_store import ContentStore
+    from src.core.engine import SyntheticDataEngine
+    from webapp import app as webapp
+
+    store = ContentStore(tmp_path / "store", ttl_seconds=None)
+    monkeypatch.setattr(webapp, 'STORE', store)
+    monkeypatch.setattr(webapp.ENGINE.config, 'stream_chunk_size', 1_000)
+    monkeypatch.setitem(webapp.app.config, 'MAX_ROWS', 100)
+
+    def whole_frame(*args, **kwargs):
+        raise AssertionError("the whole output was built in memory")
+
+    monkeypatch.setattr(SyntheticDataEngine, 'generate_from_file', whole_frame)
+    client = webapp.app.test_client()
+    csv = pd.DataFrame({'order_id': range(100, 300), 'city': ['a', 'b'] * 100}).to_csv(index=False).encode()
+
+    for route in ('/api/generate/file', '/api/generate/timeseries'):
+        response = client.post(route, data={'file': (io.BytesIO(csv), 'orders.csv'), 'rows': '5000'},
+                               content_type='multipart/form-data')
+        assert response.status_code == 200
+        output = pd.read_csv(io.BytesIO(response.get_data()))
+        assert len(output) == 5_000 and output['order_id'].is_unique
+    bad = client.post('/api/generate/file', data={'file': (io.BytesIO(b'\xff\xfe\x00'), 'bad.parquet'),
+                                                  'rows': '10'}, content_type='multipart/form-data')
+    assert bad.status_code == 500 and 'error' in bad.get_json()
+
+    request = {'schema': {'n': {'type': 'integer', 'constraints': {'min': 0, 'max': 9}}}, 'rows': 3_000, 'seed': 1}
+    key = webapp.result_cache_key({'schema': request['schema']}, 3_000, 1, 'csv')
+    # An abandoned stream stores nothing
+    partial = client.post('/api/generate/schema', json=request)
+    next(iter(partial.response))
+    partial.close()
+    assert store.resolve(key) is None and not list(store.tmp.iterdir())
+
+    first = client.post('/api/generate/schema', json=request)
+    assert first.headers['X-Cache'] == 'MISS' and store.resolve(key) is None
+    body = first.get_data()
+    assert store.resolve(key) is not None
+    again = client.post('/api/generate/schema', json=request)
+    assert again.headers['X-Cache'] == 'HIT' and again.get_data() == body
@@ -246,12 +246,15 @@
 Flask Web Application for Synthetic Data Generator
 Provides a modern web interface for generating synthetic data via prompt, file, schema, time series, and EDA reports.
 """
+import hashlib
 import os
+import time
+import shutil
 import sys
+import threading
 from pathlib import Path
-from flask import Flask, render_template, request, jsonify, send_file
+from flask import Flask, Response, render_template, request, jsonify, send_file, stream_with_context
 from flask_cors import CORS
-from werkzeug.utils import secure_filename
 import tempfile
 import json
 
@@ -267,11 +270,20 @@ sys.path.insert(0, str(PROJECT_ROOT))
 # ---------------------------------------------------------
 # IMPORT MODULES
 # ---------------------------------------------------------
-from src.core.engine import SyntheticDataEngine
+from src.core.shared_engine import SharedEngine
+from src.core.file_loader import file_suffix, load_file
+from src.utils.config import Config
+from src.validators.fidelity import compute_fidelity
 from src.generators.mimesis_generator import MimesisGenerator
 from src.exporters.csv_exporter import CSVExporter
 from src.exporters.json_exporter import JSONExporter
 from src.exporters.excel_exporter import ExcelExporter
+from src.exporters.parquet_exporter import ParquetExporter
+from src.core.pipeline import Pipeline
+from src.core.cross_constraints import CrossColumnPlan
+from src.core.content_store import ContentStore
+from src.core.jobs import JobManager, JobQueueFull, QUEUED, RUNNING, SUCCEEDED, track_progress
+from src.exporters.streaming import gzip_chunks
 
 # ---------------------------------------------------------
 # FLASK APP CONFIG
@@ -280,42 +292,398 @@ app = Flask(__name__)
 CORS(app)
 
 BASE_DIR = Path(__file__).parent
-UPLOAD_FOLDER = BASE_DIR / 'uploads'
-REPORTS_FOLDER = BASE_DIR / 'reports'
+STORE_FOLDER = BASE_DIR / 'store'
+CACHE_FOLDER = BASE_DIR / 'cache'
+JOBS_FOLDER = BASE_DIR / 'jobs'
 
-UPLOAD_FOLDER.mkdir(exist_ok=True)
-REPORTS_FOLDER.mkdir(exist_ok=True)
-
-app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
 app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB max file size
+# Row limits: CSV/JSON responses are streamed in constant memory, Excel/Parquet are built in a file first
+app.config['MAX_ROWS'] = int(os.getenv('SDG_MAX_ROWS', 100_000))
+app.config['MAX_STREAM_ROWS'] = int(os.getenv('SDG_MAX_STREAM_ROWS', 50_000_000))
+app.config['MAX_PREVIEW_ROWS'] = 100
+
+# Convert uploaded CSV/JSON/Excel once into a cached Feather copy (set to 0 to disable);
+# least recently used copies are evicted above the size limit
+app.config['COLUMNAR_CACHE'] = os.getenv('SDG_COLUMNAR_CACHE', '1') == '1'
+app.config['COLUMNAR_CACHE_MAX_BYTES'] = int(os.getenv('SDG_COLUMNAR_CACHE_MAX_BYTES', 1 << 30))
+
+# Formats streamed chunk by chunk: format -> (mimetype, file extension)
+STREAMING_FORMATS = {
+    'csv': ('text/csv', 'csv'),
+    'json': ('application/json', 'json'),
+    'ndjson': ('application/x-ndjson', 'jsonl'),
+}
+# File extension of job artifacts per output format
+ARTIFACT_EXTENSIONS = {'csv': 'csv', 'json': 'json', 'ndjson': 'jsonl', 'excel': 'xlsx', 'parquet': 'parquet'}
 
-ALLOWED_EXTENSIONS = {'csv', 'xlsx', 'xls', 'json'}
+ALLOWED_EXTENSIONS = {'csv', 'csv.gz', 'csv.zst', 'xlsx', 'xls', 'json', 'parquet', 'feather', 'arrow'}
 
 
 def allowed_file(filename):
-    return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
+    return '.' in filename and file_suffix(filename).lstrip('.') in ALLOWED_EXTENSIONS
+
+
+def columnar_cache_dir():
+    return CACHE_FOLDER if app.config['COLUMNAR_CACHE'] else None
+
+
+def engine_config() -> Config:
+    config = Config()
+    config.columnar_cache_dir = columnar_cache_dir()
+    config.columnar_cache_max_bytes = app.config['COLUMNAR_CACHE_MAX_BYTES']
+    return config
+
+
+def parse_schema(schema) -> dict:
+    """Decode a request's schema and check its cross-column rules up front (ValueError -> 400)."""
+    if isinstance(schema, str):
+        schema = json.loads(schema)
+    if not isinstance(schema, dict):
+        raise ValueError("Schema must be a JSON object")
+    CrossColumnPlan(schema)
+    return schema
+
+
+def load_input(path: Path) -> pd.DataFrame:
+    """Load an input file, through the columnar cache when enabled."""
+    return load_file(path, cache_dir=columnar_cache_dir(), cache_max_bytes=app.config['COLUMNAR_CACHE_MAX_BYTES'])
+
+
+# One engine for the whole app: prompt parser, generators and caches are built once;
+# each request gets a cheap fork with its own per-run reports
+ENGINE = SharedEngine(
+    engine_config(),
+    setup=lambda engine: engine.register_generator("mimesis", MimesisGenerator())
+)
 
 
 def get_exporter(output_format):
+    # Exporters write on the calling thread; the pipeline overlaps generation and export
     exporters = {
-        'csv': CSVExporter(),
-        'json': JSONExporter(),
-        'excel': ExcelExporter()
+        'csv': CSVExporter,
+        'json': JSONExporter,
+        'ndjson': JSONExporter,
+        'excel': ExcelExporter,
+        'parquet': ParquetExporter
+    }
+    return exporters.get(output_format, CSVExporter)(background=False)
+
+
+def export_chunks(engine, chunks, output_format, path):
+    """Export generated chunks through a producer/consumer pipeline; returns its stats."""
+    exporter = get_exporter(output_format)
+    pipeline = Pipeline(engine.config.pipeline_queue_size)
+    pipeline.run(chunks, lambda stream: exporter.export(stream, path))
+    return pipeline.stats
+
+
+def max_rows(output_format, streamed=True):
+    """Row limit for a request; output that is built in memory first (``streamed=False``) gets ``MAX_ROWS``."""
+    if streamed and output_format in STREAMING_FORMATS:
+        return app.config['MAX_STREAM_ROWS']
+    return app.config['MAX_ROWS']
+
+
+def rows_error(rows, output_format, streamed=True):
+    """Error response if ``rows`` is out of range for the format, else None."""
+    limit = max_rows(output_format, streamed)
+    if rows < 1 or rows > limit:
+        return jsonify({'error': f'Rows must be between 1 and {limit:,} for {output_format}'}), 400
+    return None
+
+
+def encode_stream(data, output_format):
+    """Bytes of ``data`` (DataFrame or chunks) in a streaming format, produced lazily."""
+    exporter = get_exporter(output_format)
+    if output_format == 'csv':
+        return exporter.encode(data)
+    return exporter.encode(data, lines=output_format == 'ndjson')
+
+
+def stream_response(body, output_format, name='synthetic_data'):
+    """
+    Chunked response sent while it is generated; gzip-encoded when the client accepts it.
+    Nothing is written to disk and server memory stays at a few chunks.
+    """
+    mimetype, extension = STREAMING_FORMATS[output_format]
+    headers = {
+        'Content-Disposition': f'attachment; filename={name}.{extension}',
+        'Cache-Control': 'no-store',
+        'X-Accel-Buffering': 'no',  # keep reverse proxies from buffering the whole body
     }
-    return exporters.get(output_format, CSVExporter())
+    if 'gzip' in request.accept_encodings:
+        body = gzip_chunks(body)
+        headers['Content-Encoding'] = 'gzip'
+        headers['Vary'] = 'Accept-Encoding'
+    return Response(stream_with_context(body), mimetype=mimetype, headers=headers)
+
+
+def stream_chunks(engine, chunks, output_format, cache_key=None, name='synthetic_data'):
+    """
+    Stream generated chunks; generation runs ahead of the client on a producer thread.
+    With a ``cache_key`` the bytes are also written to the content store as they are sent.
+    """
+    pipeline = Pipeline(engine.config.pipeline_queue_size)
+    body = encode_stream(pipeline.iterate(chunks), output_format)
+    if cache_key is None:
+        return stream_response(body, output_format, name=name)
+    response = stream_response(store_while_streaming(body, cache_key, ARTIFACT_EXTENSIONS[output_format]),
+                               output_format, name=name)
+    response.headers['X-Cache'] = 'MISS'
+    response.headers['Access-Control-Expose-Headers'] = 'X-Cache'
+    return response
+
+
+def store_while_streaming(body, cache_key, extension):
+    """
+    Pass ``body`` through while copying it to a temporary file in the store.
+    The copy is committed under ``cache_key`` only once the whole body was sent;
+    a failed or abandoned stream leaves nothing behind.
+    """
+    fd, tmp_path = tempfile.mkstemp(dir=STORE.tmp, suffix=f".{extension}")
+    try:
+        with os.fdopen(fd, 'wb') as out:
+            for piece in body:
+                out.write(piece)
+                yield piece
+        STORE.set_alias(cache_key, STORE.put_file(tmp_path, kind='result'))
+    finally:
+        Path(tmp_path).unlink(missing_ok=True)
+
+
+def started(chunks):
+    """
+    The ``chunks`` generator with its first chunk already generated, on the request
+    thread: scan, inference and fitting errors then become an error response
+    instead of a broken stream. Closing the result closes ``chunks``.
+    """
+    first = next(chunks)
+
+    def resume():
+        try:
+            yield first
+            yield from chunks
+        finally:
+            chunks.close()
+    return resume()
+
+
+def file_response(write, output_format, download_name, mimetype='application/octet-stream'):
+    """
+    Build a non-streamable output in a temporary file, send it, and delete it afterwards.
+
+    Returns:
+        (response, whatever ``write(path)`` returned)
+    """
+    fd, tmp_path = tempfile.mkstemp(suffix=f'.{output_format}')
+    os.close(fd)
+    try:
+        result = write(tmp_path)
+        response = send_file(tmp_path, as_attachment=True, download_name=download_name, mimetype=mimetype)
+    except BaseException:
+        Path(tmp_path).unlink(missing_ok=True)
+        raise
+    response.call_on_close(lambda: Path(tmp_path).unlink(missing_ok=True))
+    return response, result
+
+
+def parse_seed(data):
+    seed = data.get('seed')
+    return None if seed in (None, '') else int(seed)
+
+
+def generation_chunk_size(config, output_format):
+    """Rows per generated chunk: small for streamed responses (early first bytes), else Config.chunk_size."""
+    return config.stream_chunk_size if output_format in STREAMING_FORMATS else config.chunk_size
+
+
+def result_cache_key(request_fields, rows, seed, output_format):
+    """
+    Fingerprint of a normalized generation request, or None if it is not cacheable.
+    Only seeded requests are cached: without a seed every request asks for fresh data.
+    """
+    if seed is None or rows > ENGINE.config.result_cache_max_rows:
+        return None
+    # Chunking changes the draws of a seeded run, so it is part of the fingerprint
+    fields = dict(request_fields, rows=rows, seed=seed, format=output_format,
+                  chunk_size=generation_chunk_size(ENGINE.config, output_format))
+    text = json.dumps(fields, sort_keys=True, separators=(',', ':'), default=str)
+    return 'result:' + hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def stored_result_response(object_key, output_format, cache_status):
+    """Send a stored result with its content hash as ETag (If-None-Match gives 304, Range works)."""
+    mimetype = STREAMING_FORMATS.get(output_format, ('application/octet-stream',))[0]
+    with STORE.pinned(object_key) as path:
+        if path is None:
+            return None
+        response = send_file(path, as_attachment=True, mimetype=mimetype,
+                             download_name=f"synthetic_data.{ARTIFACT_EXTENSIONS[output_format]}",
+                             etag=object_key.split('.', 1)[0], conditional=True)
+    response.headers['X-Cache'] = cache_status
+    response.headers['Access-Control-Expose-Headers'] = 'ETag, X-Cache'
+    return response
+
+
+def cached_response(cache_key, output_format):
+    """Response served from the result cache without generating anything, or None on a miss."""
+    if cache_key is None:
+        return None
+    object_key = STORE.resolve(cache_key)
+    return stored_result_response(object_key, output_format, 'HIT') if object_key else None
+
+
+def generation_response(engine, schema, rows, output_format, seed=None, cache_key=None):
+    """
+    Response for schema-driven generation: streamed for CSV/JSON, via a temporary file otherwise.
+    With a ``cache_key`` the result is also written to the content store: while it is
+    streamed, or, for formats that must be complete before sending, first.
+    """
+    chunks = engine.generate_chunks(schema, rows, chunk_size=generation_chunk_size(engine.config, output_format),
+                                    validate=engine.config.post_validate, seed=seed)
+    if output_format in STREAMING_FORMATS:
+        return stream_chunks(engine, chunks, output_format, cache_key)
+    if cache_key is not None:
+        fd, tmp_path = tempfile.mkstemp(dir=STORE.tmp, suffix=f".{ARTIFACT_EXTENSIONS[output_format]}")
+        os.close(fd)
+        try:
+            export_chunks(engine, chunks, output_format, tmp_path)
+        except BaseException:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
+        object_key = STORE.put_file(tmp_path, kind='result')
+        STORE.set_alias(cache_key, object_key)
+        return stored_result_response(object_key, output_format, 'MISS')
+
+    response, stats = file_response(lambda path: export_chunks(engine, chunks, output_format, path),
+                                    output_format, f'synthetic_data.{output_format}')
+    return with_pipeline_header(response, stats)
+
+
+def upload_chunks(engine, key, rows, preserve_stats, chunk_size=None):
+    """File-based generation from a stored upload, chunk by chunk; the upload stays pinned until the last chunk."""
+    with STORE.pinned(key) as filepath:
+        if filepath is None:
+            raise FileNotFoundError(f"Upload {key} is no longer stored")
+        yield from engine.generate_chunks_from_file(str(filepath), rows, preserve_stats, chunk_size=chunk_size)
+
+
+def store_upload(file):
+    """Save an uploaded file in the content store (a re-upload reuses the stored copy); returns its key."""
+    return STORE.put_stream(file.stream, file_suffix(file.filename), kind='upload')
+
+
+def with_pipeline_header(response, stats):
+    """Expose generation/export timings and queue metrics to the client."""
+    response.headers['X-Pipeline-Stats'] = json.dumps(stats.to_dict())
+    exposed = response.headers.get('Access-Control-Expose-Headers')
+    response.headers['Access-Control-Expose-Headers'] = (
+        f"{exposed}, X-Pipeline-Stats" if exposed else 'X-Pipeline-Stats')
+    return response
+
+
+def with_fidelity_header(response, engine):
+    """Expose the fidelity score of a file-based job to the client."""
+    if engine.last_fidelity is not None:
+        response.headers['X-Fidelity-Score'] = f"{engine.last_fidelity.score:.4f}"
+        response.headers['Access-Control-Expose-Headers'] = 'X-Fidelity-Score'
+    return response
 
 
 def read_input_for_eda(path: Path) -> pd.DataFrame:
     """
-    Read CSV or Excel (first sheet) into a DataFrame for EDA.
-    Same logic as generate_report.py.
+    Read any supported input (first sheet for Excel) into a DataFrame for EDA.
+    Text and Excel inputs go through the columnar cache when enabled.
     """
-    ext = path.suffix.lower()
-    if ext == ".csv":
-        return pd.read_csv(path)
-    if ext in (".xls", ".xlsx"):
-        return pd.read_excel(path, sheet_name=0)
-    raise ValueError(f"Unsupported input file extension: {ext}")
+    if not allowed_file(path.name):
+        raise ValueError(f"Unsupported input file extension: {file_suffix(path)}")
+    return load_input(path)
+
+
+# ---------------------------------------------------------
+# JOB HANDLERS (run on the job worker pool)
+# ---------------------------------------------------------
+def artifact_name(output_format):
+    return f"synthetic_data.{ARTIFACT_EXTENSIONS[output_format]}"
+
+
+def run_schema_job(engine, schema, params, job_dir, progress):
+    chunks = engine.generate_chunks(schema, params['rows'], validate=engine.config.post_validate,
+                                    seed=params.get('seed'))
+    path = job_dir / artifact_name(params['format'])
+    export_chunks(engine, track_progress(chunks, progress), params['format'], path)
+    return path
+
+
+def prompt_job(params, job_dir, progress):
+    engine = ENGINE.engine()
+    schema = engine.schema_inference.infer_from_field_list(params['prompt'])
+    return run_schema_job(engine, schema, params, job_dir, progress)
+
+
+def schema_job(params, job_dir, progress):
+    return run_schema_job(ENGINE.engine(), params['schema'], params, job_dir, progress)
+
+
+def file_job(params, job_dir, progress):
+    engine = ENGINE.engine()
+    # Streamed like schema jobs, so file jobs can use the streaming row limit
+    chunks = engine.generate_chunks_from_file(str(job_dir / params['input']), params['rows'],
+                                              params['preserve_stats'], seed=params.get('seed'))
+    path = job_dir / artifact_name(params['format'])
+    export_chunks(engine, track_progress(chunks, progress), params['format'], path)
+    return path
+
+
+# Uploads, job outputs and EDA reports: deduplicated by content hash, bounded by quota and TTL
+STORE = ContentStore(STORE_FOLDER, ENGINE.config.store_max_bytes, ENGINE.config.store_ttl_seconds)
+
+def eda_alias(key, extension):
+    """Store alias of an upload's EDA report; the tier thresholds are part of it."""
+    config = ENGINE.config
+    return f"eda:{key}:{config.eda_minimal_cells}:{config.eda_sample_rows}.{extension}"
+
+
+def eda_profile(df, title):
+    """
+    One ProfileReport for ``df``: full below Config.eda_minimal_cells (rows x columns),
+    otherwise minimal and computed on a Config.eda_sample_rows sample.
+    """
+    config = ENGINE.config
+    if df.size <= config.eda_minimal_cells:
+        return ProfileReport(df, title=title)
+    if len(df) > config.eda_sample_rows:
+        df = df.sample(n=config.eda_sample_rows, random_state=0)
+        title = f"{title} (minimal profile, {len(df):,}-row sample)"
+    else:
+        title = f"{title} (minimal profile)"
+    return ProfileReport(df, title=title, minimal=True)
+
+
+def eda_job(params, job_dir, progress):
+    df = read_input_for_eda(job_dir / params['input'])
+    profile = eda_profile(df, params['title'])
+    # Both renderings reuse the profile's computed description: one profiling pass
+    html_path, json_path = job_dir / 'report.html', job_dir / 'profile.json'
+    profile.to_file(html_path)
+    profile.to_file(json_path)
+    html_key = STORE.put_file(html_path, kind='report')
+    STORE.set_alias(eda_alias(params['key'], 'html'), html_key)
+    STORE.set_alias(eda_alias(params['key'], 'json'), STORE.put_file(json_path, kind='report'))
+    progress(len(df))
+    return STORE.link(html_key, job_dir / 'report.html')
+
+
+# Persistent, in-process job queue; unfinished jobs resume when the app restarts
+JOBS = JobManager(
+    JOBS_FOLDER,
+    {'prompt': prompt_job, 'schema': schema_job, 'file': file_job, 'eda': eda_job},
+    max_workers=ENGINE.config.job_workers,
+    max_queued=ENGINE.config.job_max_queued,
+    # Under the debug reloader only the serving child process resumes jobs
+    recover=__name__ != '__main__' or os.environ.get('WERKZEUG_RUN_MAIN') == 'true',
+    store=STORE
+)
 
 
 # ---------------------------------------------------------
@@ -329,7 +697,8 @@ def index():
 
 @app.route('/api/health')
 def health():
-    return jsonify({'status': 'healthy', 'message': 'Synthetic Data Generator API is running'})
+    return jsonify({'status': 'healthy', 'message': 'Synthetic Data Generator API is running',
+                    'caches': ENGINE.cache_stats(), 'store': STORE.stats()})
 
 
 # ---------------------------------------------------------
@@ -346,23 +715,20 @@ def generate_from_prompt():
         if not prompt:
             return jsonify({'error': 'Prompt is required'}), 400
 
-        if rows < 1 or rows > 100000:
-            return jsonify({'error': 'Rows must be between 1 and 100,000'}), 400
-
-        engine = SyntheticDataEngine()
-        engine.register_generator("mimesis", MimesisGenerator())
-
-        df = engine.generate_from_prompt(prompt, rows, output_format)
+        error = rows_error(rows, output_format)
+        if error:
+            return error
 
-        with tempfile.NamedTemporaryFile(mode='w', delete=False, suffix=f'.{output_format}') as tmp:
-            tmp_path = tmp.name
+        seed = parse_seed(data)
+        cache_key = result_cache_key({'prompt': " ".join(prompt.split())}, rows, seed, output_format)
+        cached = cached_response(cache_key, output_format)
+        if cached is not None:
+            return cached
 
-        exporter = get_exporter(output_format)
-        exporter.export(df, tmp_path)
+        engine = ENGINE.engine()
 
-        return send_file(tmp_path, as_attachment=True,
-                         download_name=f'synthetic_data.{output_format}',
-                         mimetype='application/octet-stream')
+        schema = engine.schema_inference.infer_from_field_list(prompt)
+        return generation_response(engine, schema, rows, output_format, seed, cache_key)
 
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -383,32 +749,42 @@ def generate_from_file():
             return jsonify({'error': 'No file selected'}), 400
 
         if not allowed_file(file.filename):
-            return jsonify({'error': 'Invalid file type. Allowed: CSV, Excel, JSON'}), 400
+            return jsonify({'error': 'Invalid file type. Allowed: CSV (optionally .gz/.zst), Excel, JSON, Parquet, Feather'}), 400
 
         rows = int(request.form.get('rows', 1000))
         output_format = request.form.get('format', 'csv').lower()
         preserve_stats = request.form.get('preserve_stats', 'true').lower() == 'true'
-
-        filename = secure_filename(file.filename)
-        filepath = app.config['UPLOAD_FOLDER'] / filename
-        file.save(filepath)
-
-        engine = SyntheticDataEngine()
-        engine.register_generator("mimesis", MimesisGenerator())
-
-        df = engine.generate_from_file(str(filepath), rows, preserve_stats, output_format)
-
-        with tempfile.NamedTemporaryFile(mode='w', delete=False, suffix=f'.{output_format}') as tmp:
-            tmp_path = tmp.name
-
-        exporter = get_exporter(output_format)
-        exporter.export(df, tmp_path)
-
-        filepath.unlink()
-
-        return send_file(tmp_path, as_attachment=True,
-                         download_name=f'synthetic_data.{output_format}',
-                         mimetype='application/octet-stream')
+        # Opt-in extra passes: fidelity score (X-Fidelity-Score header) and privacy check/rejection
+        checks = {name: request.form.get(name, 'false').lower() == 'true'
+                  for name in ('fidelity', 'privacy_check', 'privacy_reject')}
+
+        # Fidelity and privacy passes need the whole output, so that frame is built in memory first
+        config = ENGINE.config
+        whole = any(checks.values()) or config.compute_fidelity or config.privacy_check
+        error = rows_error(rows, output_format, streamed=not whole)
+        if error:
+            return error
+
+        key = store_upload(file)
+
+        engine = ENGINE.engine()
+
+        if whole:
+            with STORE.pinned(key) as filepath:
+                df = engine.generate_from_file(str(filepath), rows, preserve_stats, output_format, **checks)
+            if output_format in STREAMING_FORMATS:
+                response = stream_response(encode_stream(df, output_format), output_format)
+            else:
+                response, _ = file_response(lambda path: get_exporter(output_format).export(df, path),
+                                            output_format, f'synthetic_data.{output_format}')
+            return with_fidelity_header(response, engine)
+
+        chunks = upload_chunks(engine, key, rows, preserve_stats, generation_chunk_size(engine.config, output_format))
+        if output_format in STREAMING_FORMATS:
+            return stream_chunks(engine, started(chunks), output_format)
+        response, stats = file_response(lambda path: export_chunks(engine, chunks, output_format, path),
+                                        output_format, f'synthetic_data.{output_format}')
+        return with_pipeline_header(response, stats)
 
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -428,27 +804,23 @@ def generate_from_schema():
         if not schema:
             return jsonify({'error': 'Schema is required'}), 400
 
-        if rows < 1 or rows > 100000:
-            return jsonify({'error': 'Rows must be between 1 and 100,000'}), 400
-
-        if isinstance(schema, str):
-            schema = json.loads(schema)
-
-        engine = SyntheticDataEngine()
-        engine.register_generator("mimesis", MimesisGenerator())
+        error = rows_error(rows, output_format)
+        if error:
+            return error
 
-        df = engine._generate_from_schema(schema, rows)
+        schema = parse_schema(schema)
 
-        with tempfile.NamedTemporaryFile(mode='w', delete=False, suffix=f'.{output_format}') as tmp:
-            tmp_path = tmp.name
+        seed = parse_seed(data)
+        cache_key = result_cache_key({'schema': schema}, rows, seed, output_format)
+        cached = cached_response(cache_key, output_format)
+        if cached is not None:
+            return cached
 
-        exporter = get_exporter(output_format)
-        exporter.export(df, tmp_path)
-
-        return send_file(tmp_path, as_attachment=True,
-                         download_name=f'synthetic_data.{output_format}',
-                         mimetype='application/octet-stream')
+        engine = ENGINE.engine()
+        return generation_response(engine, schema, rows, output_format, seed, cache_key)
 
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -473,38 +845,80 @@ def generate_timeseries():
         rows = int(request.form.get('rows', 1000))
         output_format = 'csv'
 
-        filename = secure_filename(file.filename)
-        filepath = app.config['UPLOAD_FOLDER'] / filename
-        file.save(filepath)
+        error = rows_error(rows, output_format)
+        if error:
+            return error
 
-        engine = SyntheticDataEngine()
-        engine.register_generator("mimesis", MimesisGenerator())
+        key = store_upload(file)
 
-        df = engine.generate_from_file(str(filepath), rows, True, output_format)
+        engine = ENGINE.engine()
 
-        with tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.csv') as tmp:
-            tmp_path = tmp.name
+        chunks = upload_chunks(engine, key, rows, True, engine.config.stream_chunk_size)
+        return stream_chunks(engine, started(chunks), output_format, name='synthetic_timeseries_data')
 
-        CSVExporter().export(df, tmp_path)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
 
-        filepath.unlink()
 
-        return send_file(tmp_path, as_attachment=True,
-                         download_name='synthetic_timeseries_data.csv',
-                         mimetype='text/csv')
+# ---------------------------------------------------------
+# 5. FIDELITY REPORT (real vs synthetic)
+# ---------------------------------------------------------
+@app.route('/api/fidelity', methods=['POST'])
+def fidelity_report():
+    """
+    Compare an uploaded real dataset ('real') with a synthetic one ('synthetic').
+    Returns per-column KS/Wasserstein or TV/chi-square metrics and the correlation delta as JSON.
+    """
+    try:
+        frames = {}
+        for field in ('real', 'synthetic'):
+            file = request.files.get(field)
+            if file is None or file.filename == '':
+                return jsonify({'error': "Both 'real' and 'synthetic' files are required"}), 400
+            if not allowed_file(file.filename):
+                return jsonify({'error': f'Unsupported file type for {field}'}), 400
+            with STORE.pinned(store_upload(file)) as path:
+                frames[field] = load_input(path)
+
+        report = compute_fidelity(frames['real'], frames['synthetic'])
+        return jsonify(report.to_dict())
 
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
+        return jsonify({'error': f'Fidelity report failed: {e}'}), 500
 
 
 # ---------------------------------------------------------
-# 5. EDA REPORT GENERATION (ydata-profiling)
+# 6. EDA REPORT GENERATION (ydata-profiling)
 # ---------------------------------------------------------
+# Upload key -> EDA job in flight, so concurrent requests for one file share a job.
+# Finished jobs are dropped whenever a new one is tracked, so this never outgrows the job queue.
+EDA_JOBS = {}
+EDA_JOBS_LOCK = threading.Lock()
+
+
+def send_eda_report(key, output_format, download_stem):
+    """Send a stored EDA report ('html' or 'json'), or None if there is none yet."""
+    object_key = STORE.resolve(eda_alias(key, output_format))
+    if object_key is None:
+        return None
+    with STORE.pinned(object_key) as path:
+        if path is None:
+            return None
+        mimetype = 'text/html' if output_format == 'html' else 'application/json'
+        response = send_file(path, as_attachment=True, download_name=f"{download_stem}.{output_format}",
+                             mimetype=mimetype)
+    response.headers['X-Report-Key'] = key
+    response.headers['Access-Control-Expose-Headers'] = 'X-Report-Key'
+    return response
+
+
 @app.route('/api/eda/report', methods=['POST'])
 def generate_eda_report():
     """
-    Generate an EDA HTML report using ydata-profiling.
-    Accepts CSV/XLS/XLSX, returns the HTML report as a download.
+    EDA report (ydata-profiling) of an uploaded file.
+    Reports are cached by file content: a known file gets its report at once (200);
+    otherwise profiling runs as a background job and 202 points at it.
+    ``?format=json`` returns the JSON profile instead of the HTML report.
     """
     try:
         if 'file' not in request.files:
@@ -514,54 +928,234 @@ def generate_eda_report():
         if file.filename == '':
             return jsonify({'error': 'No file selected'}), 400
 
-        # Only allow CSV / Excel for EDA
-        ext = Path(file.filename).suffix.lower()
-        if ext not in ('.csv', '.xls', '.xlsx'):
-            return jsonify({'error': 'Only CSV and Excel files are supported for EDA reports'}), 400
+        if not allowed_file(file.filename):
+            return jsonify({'error': 'Unsupported file type for EDA reports'}), 400
+
+        output_format = request.args.get('format', 'html').lower()
+        if output_format not in ('html', 'json'):
+            return jsonify({'error': 'format must be html or json'}), 400
+
+        key = store_upload(file)
+        dataset_name = Path(file.filename).name.split('.')[0]
+
+        cached = send_eda_report(key, output_format, f"eda_{dataset_name}")
+        if cached is not None:
+            return cached
+
+        with EDA_JOBS_LOCK:
+            job = JOBS.get(EDA_JOBS[key]) if JOBS.active(EDA_JOBS.get(key)) else None
+            if job is None or job['status'] not in (QUEUED, RUNNING):
+                for finished in [name for name, tracked in EDA_JOBS.items() if not JOBS.active(tracked)]:
+                    del EDA_JOBS[finished]
+                job_id = JOBS.new_job_id()
+                params = {'key': key, 'title': f"EDA: {dataset_name}", 'input': f"input{file_suffix(file.filename)}"}
+                STORE.link(key, JOBS.job_dir(job_id) / params['input'])
+                job = JOBS.submit('eda', params, job_id=job_id)
+                EDA_JOBS[key] = job_id
+
+        body = job_response(job)
+        body['report_url'] = f"/api/eda/report/{key}?format={output_format}"
+        response = jsonify(body)
+        response.status_code = 202
+        response.headers['Location'] = f"/api/jobs/{job['id']}"
+        return response
+
+    except JobQueueFull as e:
+        shutil.rmtree(JOBS.job_dir(job_id), ignore_errors=True)
+        return jsonify({'error': str(e)}), 429
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': f'EDA report generation failed: {e}'}), 500
 
-        # Save uploaded file temporarily
-        filename = secure_filename(file.filename)
-        input_path = app.config['UPLOAD_FOLDER'] / filename
-        file.save(input_path)
 
-        # Read data
-        df = read_input_for_eda(input_path)
+@app.route('/api/eda/report/<key>', methods=['GET'])
+def get_eda_report(key):
+    """A finished EDA report by upload key (from the 202 response); 404 until it is ready."""
+    output_format = request.args.get('format', 'html').lower()
+    if output_format not in ('html', 'json'):
+        return jsonify({'error': 'format must be html or json'}), 400
+    try:
+        response = send_eda_report(key, output_format, "eda_report")
+    except ValueError:
+        response = None
+    if response is None:
+        return jsonify({'error': 'Report not available'}), 404
+    return response
 
-        # Prepare report paths
-        dataset_name = input_path.stem
-        report_html = REPORTS_FOLDER / f"eda_{dataset_name}.html"
 
-        # Title
-        title = f"EDA: {dataset_name}"
+# ---------------------------------------------------------
+# 7. ASYNCHRONOUS JOBS (large generations)
+# ---------------------------------------------------------
+def job_response(job):
+    if job['status'] == SUCCEEDED:
+        job['download_url'] = f"/api/jobs/{job['id']}/artifact"
+    return job
 
-        # Generate HTML report
-        profile = ProfileReport(df, title=title)
-        profile.to_file(report_html.as_posix())
 
-        # (Optional) JSON profile like CLI version – generated but not returned
-        try:
-            expl_profile = ProfileReport(df, title=title, explorative=True)
-            json_str = expl_profile.to_json()
-            json_path = REPORTS_FOLDER / f".profile_{dataset_name}.json"
-            with json_path.open("w", encoding="utf-8") as jf:
-                jf.write(json_str)
-        except Exception:
-            # If JSON fails, ignore; HTML report is still useful
-            pass
-
-        # Clean up uploaded input file
-        input_path.unlink(missing_ok=True)
-
-        # Send HTML report as a downloadable file
-        return send_file(
-            report_html,
-            as_attachment=True,
-            download_name=f"eda_{dataset_name}.html",
-            mimetype="text/html"
-        )
+@app.route('/api/jobs', methods=['POST'])
+def submit_job():
+    """
+    Enqueue a generation and return 202 with the job record immediately.
+    JSON body: {"mode": "prompt"|"schema", "prompt"/"schema", "rows", "format"};
+    file mode is a multipart form with "file", "rows", "format", "preserve_stats".
+    """
+    try:
+        if request.files:
+            mode = 'file'
+            data = request.form
+        else:
+            data = request.get_json() or {}
+            mode = data.get('mode', 'schema')
+        rows = int(data.get('rows', 1000))
+        output_format = data.get('format', 'csv').lower()
 
+        if output_format not in ARTIFACT_EXTENSIONS:
+            return jsonify({'error': f'Unsupported format: {output_format}'}), 400
+        # Artifacts are written to disk chunk by chunk, so every format gets the streaming limit
+        if rows < 1 or rows > app.config['MAX_STREAM_ROWS']:
+            return jsonify({'error': f"Rows must be between 1 and {app.config['MAX_STREAM_ROWS']:,}"}), 400
+
+        params = {'rows': rows, 'format': output_format, 'seed': parse_seed(data)}
+        job_id = JOBS.new_job_id()
+        if mode == 'prompt':
+            params['prompt'] = (data.get('prompt') or '').strip()
+            if not params['prompt']:
+                return jsonify({'error': 'Prompt is required'}), 400
+        elif mode == 'schema':
+            schema = data.get('schema')
+            if not schema:
+                return jsonify({'error': 'Schema is required'}), 400
+            params['schema'] = parse_schema(schema)
+        elif mode == 'file':
+            file = request.files.get('file')
+            if file is None or file.filename == '' or not allowed_file(file.filename):
+                return jsonify({'error': 'A supported input file is required'}), 400
+            # The input lives with the job so it can be re-run after a restart
+            params['input'] = f"input{file_suffix(file.filename)}"
+            params['preserve_stats'] = data.get('preserve_stats', 'true').lower() == 'true'
+            # Linked from the store, so eviction cannot remove a queued job's input
+            STORE.link(store_upload(file), JOBS.job_dir(job_id) / params['input'])
+        else:
+            return jsonify({'error': f'Unknown mode: {mode}'}), 400
+
+        job = JOBS.submit(mode, params, rows_total=rows, job_id=job_id)
+        response = jsonify(job_response(job))
+        response.status_code = 202
+        response.headers['Location'] = f"/api/jobs/{job_id}"
+        return response
+
+    except JobQueueFull as e:
+        shutil.rmtree(JOBS.job_dir(job_id), ignore_errors=True)
+        return jsonify({'error': str(e)}), 429
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
-        return jsonify({'error': f'EDA report generation failed: {e}'}), 500
+        return jsonify({'error': str(e)}), 500
+
+
+@app.route('/api/jobs/<job_id>', methods=['GET'])
+def job_status(job_id):
+    """Status, rows done, rate (rows/s) and ETA of a job."""
+    job = JOBS.get(job_id)
+    if job is None:
+        return jsonify({'error': 'Job not found'}), 404
+    return jsonify(job_response(job))
+
+
+@app.route('/api/jobs/<job_id>/artifact', methods=['GET'])
+def job_artifact(job_id):
+    """Download a finished job's output; Range requests are supported for resumable downloads."""
+    path = JOBS.artifact_path(job_id)
+    if path is None:
+        return jsonify({'error': 'Artifact not available'}), 404
+    return send_file(path, as_attachment=True, download_name=f"synthetic_data{file_suffix(path)}",
+                     conditional=True)
+
+
+@app.route('/api/jobs/<job_id>', methods=['DELETE'])
+def delete_job(job_id):
+    if JOBS.get(job_id) is None:
+        return jsonify({'error': 'Job not found'}), 404
+    if not JOBS.delete(job_id):
+        return jsonify({'error': 'Job is still running'}), 409
+    return '', 204
+
+
+# ---------------------------------------------------------
+# 8. PREVIEW (first rows as JSON, low latency)
+# ---------------------------------------------------------
+def preview_rows(data):
+    rows = int(data.get('rows', 10))
+    if rows < 1 or rows > app.config['MAX_PREVIEW_ROWS']:
+        raise ValueError(f"Preview rows must be between 1 and {app.config['MAX_PREVIEW_ROWS']}")
+    return rows
+
+
+def preview_response(df, started, **extra):
+    """Rows as JSON records (ISO dates) plus the server-side latency."""
+    body = {
+        'columns': [str(name) for name in df.columns],
+        'rows': json.loads(df.to_json(orient='records', date_format='iso', force_ascii=False)),
+        **extra,
+        'elapsed_ms': round((time.perf_counter() - started) * 1000, 1),
+    }
+    return jsonify(body)
+
+
+@app.route('/api/preview/schema', methods=['POST'])
+def preview_schema():
+    """First N (<= 100) rows of a schema, without chunking, validation or export."""
+    started = time.perf_counter()
+    try:
+        data = request.get_json() or {}
+        schema = data.get('schema')
+        if not schema:
+            return jsonify({'error': 'Schema is required'}), 400
+        df = ENGINE.engine().preview(parse_schema(schema), preview_rows(data), seed=parse_seed(data))
+        return preview_response(df, started)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@app.route('/api/preview/prompt', methods=['POST'])
+def preview_prompt():
+    """First N rows for a prompt, plus the inferred schema (prompt -> schema is cached)."""
+    started = time.perf_counter()
+    try:
+        data = request.get_json() or {}
+        prompt = (data.get('prompt') or '').strip()
+        if not prompt:
+            return jsonify({'error': 'Prompt is required'}), 400
+        engine = ENGINE.engine()
+        schema = engine.schema_inference.infer_from_field_list(prompt)
+        df = engine.preview(schema, preview_rows(data), seed=parse_seed(data))
+        return preview_response(df, started, schema=schema)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@app.route('/api/preview/file', methods=['POST'])
+def preview_file():
+    """First N rows fitted on the head of the uploaded file (no fidelity/privacy passes)."""
+    started = time.perf_counter()
+    try:
+        file = request.files.get('file')
+        if file is None or file.filename == '' or not allowed_file(file.filename):
+            return jsonify({'error': 'A supported input file is required'}), 400
+        engine = ENGINE.engine()
+        with STORE.pinned(store_upload(file)) as path:
+            df = engine.preview_from_file(str(path), preview_rows(request.form),
+                                          seed=parse_seed(request.form))
+        return preview_response(df, started)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
 
 
 # ---------------------------------------------------------
@@ -16,6 +16,13 @@ tabButtons.forEach(button => {
     });
 });
 
+// CSV/JSON are streamed by the server, so they allow far larger row counts
+const STREAMING_FORMATS = ['csv', 'json', 'ndjson'];
+
+function maxRowsFor(format) {
+    return STREAMING_FORMATS.includes(format) ? 50000000 : 100000;
+}
+
 // Alert Functions
 function showAlert(elementId, message, type) {
     const alert = document.getElementById(elementId);
@@ -75,8 +82,9 @@ promptForm.addEventListener('submit', async (e) => {
         return;
     }
 
-    if (rows < 1 || rows > 100000) {
-        showAlert('prompt-alert', 'Number of rows must be between 1 and 100,000', 'error');
+    const maxRows = maxRowsFor(format);
+    if (rows < 1 || rows > maxRows) {
+        showAlert('prompt-alert', `Number of rows must be between 1 and ${maxRows.toLocaleString()}`, 'error');
         return;
     }
 
@@ -237,8 +245,9 @@ schemaForm.addEventListener('submit', async (e) => {
         return;
     }
 
-    if (rows < 1 || rows > 100000) {
-        showAlert('schema-alert', 'Number of rows must be between 1 and 100,000', 'error');
+    const maxRows = maxRowsFor(format);
+    if (rows < 1 || rows > maxRows) {
+        showAlert('schema-alert', `Number of rows must be between 1 and ${maxRows.toLocaleString()}`, 'error');
         return;
     }
 
@@ -381,6 +390,24 @@ if (tsUploadArea && tsInput && tsForm && tsFileName) {
 // ============================================
 // EDA REPORT GENERATION (ydata-profiling)
 // ============================================
+async function waitForEdaReport(job) {
+    while (true) {
+        await new Promise(resolve => setTimeout(resolve, 1000));
+        const statusRes = await fetch(`/api/jobs/${job.id}`);
+        const status = await statusRes.json();
+        if (status.status === 'failed') {
+            throw new Error(status.error || 'EDA report generation failed');
+        }
+        if (status.status === 'succeeded') {
+            const reportRes = await fetch(job.report_url);
+            if (!reportRes.ok) {
+                throw new Error('EDA report is no longer available');
+            }
+            return reportRes;
+        }
+    }
+}
+
 const edaButton = document.getElementById('eda-button');
 const edaFileInput = document.getElementById('eda-file-input');
 const edaAlert = document.getElementById('eda-alert');
@@ -421,7 +448,15 @@ if (edaButton && edaFileInput && edaAlert) {
                 return;
             }
 
-            const blob = await res.blob();
+            // Unknown file: the report is profiled in the background, poll the job
+            let reportRes = res;
+            if (res.status === 202) {
+                edaButton.textContent = 'Profiling in background...';
+                const job = await res.json();
+                reportRes = await waitForEdaReport(job);
+            }
+
+            const blob = await reportRes.blob();
             const url = window.URL.createObjectURL(blob);
 
             // Open report in a new tab